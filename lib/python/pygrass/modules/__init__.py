@@ -1,3 +1,4 @@
 # -*- coding: utf-8 -*-
-from grass.pygrass.modules.interface import Module, MultiModule, ParallelModuleQueue
+from grass.pygrass.modules.interface import (Module, MultiModule,
+                                            ParallelModuleQueue, ModuleGraph)
 from grass.pygrass.modules import shortcuts
@@ -9,5 +9,7 @@ from grass.pygrass.modules.interface import parameter
 from grass.pygrass.modules.interface import module
 from grass.pygrass.modules.interface import typedict
 from grass.pygrass.modules.interface import read
+from grass.pygrass.modules.interface import dag
 
 from grass.pygrass.modules.interface.module import Module, MultiModule, ParallelModuleQueue
+from grass.pygrass.modules.interface.dag import ModuleGraph
@@ -0,0 +1,306 @@
+# -*- coding: utf-8 -*-
+"""
+Run a graph of Module and MultiModule objects, the dependencies between
+the modules are inferred from the names of the maps that they read and
+write, the independent modules are run in parallel.
+"""
+from __future__ import (nested_scopes, generators, division, absolute_import,
+                        with_statement, print_function, unicode_literals)
+import os
+
+from grass.exceptions import GrassError
+from grass.script.core import find_file
+from .module import Module, MultiModule, ParallelModuleQueue
+
+
+#: map the type of the maps to the element used to look for the maps
+#: and the file, inside the element directory, used as modification time
+ELEMENTS = {'raster': ('cell', None),
+            'vector': ('vector', 'coor'),
+            'raster_3d': ('grid3', 'cell'),
+            'stds': (None, None)}
+
+#: map the prompt of the parameters to the type of the maps
+MAPTYPES = {'raster': 'raster', 'vector': 'vector', 'raster_3d': 'raster_3d',
+            'strds': 'stds', 'str3ds': 'stds', 'stvds': 'stds',
+            'stds': 'stds'}
+
+
+def get_maps(module):
+    """Return two sets with the maps read and written by a Module or a
+    MultiModule, each map is a tuple with the type of the map and its name
+    without the mapset
+
+    >>> mapcalc = Module("r.mapcalc", expression="a = 1", run_=False)
+    >>> get_maps(mapcalc) == (set(), set())
+    True
+    >>> slope = Module("r.slope.aspect", elevation="elevation@PERMANENT",
+    ...                slope="slope", run_=False)
+    >>> inputs, outputs = get_maps(slope)
+    >>> sorted(inputs)
+    [('raster', 'elevation')]
+    >>> sorted(outputs)
+    [('raster', 'slope')]
+
+    :param module: the Module or MultiModule object
+    :returns: a tuple with the set of the input maps and the set of the
+              output maps
+    """
+    inputs, outputs = set(), set()
+    modules = (module.module_list if isinstance(module, MultiModule)
+               else [module, ])
+    for mod in modules:
+        for maps, params in ((inputs, mod.inputs), (outputs, mod.outputs)):
+            for param in params.values():
+                maptype = MAPTYPES.get(param.typedesc)
+                if maptype is None or not param.value:
+                    continue
+                values = (param.value if isinstance(param.value, list)
+                          else [param.value, ])
+                for value in values:
+                    for name in str(value).split(','):
+                        if name:
+                            maps.add((maptype, name.split('@')[0]))
+    return inputs, outputs
+
+
+def get_mtime(maptype, name):
+    """Return the modification time of a map or None if the map does not
+    exist or its modification time can not be checked
+
+    :param maptype: the type of the map, one of the keys of ELEMENTS
+    :type maptype: str
+    :param name: the name of the map
+    :type name: str
+    """
+    element, fname = ELEMENTS.get(maptype, (None, None))
+    if element is None:
+        return None
+    path = find_file(name, element=element).get('file')
+    if not path:
+        return None
+    if fname:
+        path = os.path.join(path, fname)
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return None
+
+
+class ModuleNode(object):
+    """A node of the ModuleGraph, it stores the Module or MultiModule object,
+    the maps that it reads and writes and the nodes that it depends on
+
+    The attribute status is one of: 'waiting', 'running', 'finished',
+    'skipped'.
+    """
+    def __init__(self, module, set_temp_region=False):
+        self.module = module
+        self.set_temp_region = set_temp_region
+        self.inputs, self.outputs = get_maps(module)
+        self.parents = set()
+        self.children = set()
+        self.status = 'waiting'
+        self.result = None
+
+    def __str__(self):
+        return str(self.module)
+
+    def __repr__(self):
+        return "ModuleNode(%s)" % self
+
+    def get_runnable(self):
+        """Return the object that must be put in the ParallelModuleQueue,
+        a Module is wrapped in a MultiModule to run it in a temporary region
+        """
+        if isinstance(self.module, MultiModule):
+            self.module.set_temp_region = (self.set_temp_region or
+                                           self.module.set_temp_region)
+            return self.module
+        if self.set_temp_region:
+            return MultiModule([self.module, ], sync=False,
+                               set_temp_region=True)
+        return self.module
+
+    def is_up_to_date(self):
+        """Return True if all the output maps exist and are newer than all
+        the input maps, a node without output maps is never up to date
+        """
+        if not self.outputs:
+            return False
+        out_times = [get_mtime(*omap) for omap in self.outputs]
+        if None in out_times:
+            return False
+        in_times = [get_mtime(*imap) for imap in self.inputs]
+        if None in in_times:
+            return False
+        return not in_times or max(in_times) <= min(out_times)
+
+
+class ModuleGraph(object):
+    """Run a directed acyclic graph of Module and MultiModule objects.
+
+    The dependencies between the modules are inferred from the values of
+    the raster, 3D raster, vector and space time dataset parameters: a
+    module depends on the modules added before it that write a map that
+    it reads or writes, or that read a map that it writes. Maps hidden
+    in other parameters (like the expression of r.mapcalc) are not
+    recognized, in this case the dependencies must be given explicitly.
+    The modules without pending dependencies are run in parallel
+    using a ParallelModuleQueue.
+
+    Each node can be run in a temporary region, hence g.region calls in
+    a MultiModule do not alter the region of the other modules, and the
+    nodes whose output maps are newer than their input maps can be
+    skipped.
+
+    >>> from grass.pygrass.modules import Module
+    >>> graph = ModuleGraph(nprocs=2)
+    >>> slope = Module("r.slope.aspect", elevation="elevation",
+    ...                slope="test_graph_slope", overwrite=True, run_=False)
+    >>> a = graph.add(slope)
+    >>> smooth = Module("r.neighbors", input="test_graph_slope",
+    ...                 output="test_graph_smooth", overwrite=True,
+    ...                 run_=False)
+    >>> b = graph.add(smooth)
+    >>> b.parents == set([a, ])
+    True
+    >>> aspect = Module("r.slope.aspect", elevation="elevation",
+    ...                 aspect="test_graph_aspect", overwrite=True,
+    ...                 run_=False)
+    >>> c = graph.add(aspect)
+    >>> c.parents == set()
+    True
+
+    The maps modified in place or written by r.mapcalc are not recognized,
+    the dependencies can be given explicitly
+
+    >>> mapcalc = Module("r.mapcalc", overwrite=True, run_=False,
+    ...                  expression="test_graph_sum = test_graph_smooth + 1")
+    >>> d = graph.add(mapcalc, depends=[b, ])
+    >>> d.parents == set([b, ])
+    True
+    >>> graph.run()
+    >>> [node.status for node in graph.get_nodes()]
+    ['finished', 'finished', 'finished', 'finished']
+    >>> len(graph.get_finished_modules())
+    4
+    >>> remove = Module("g.remove", flags="f", type="raster", quiet=True,
+    ...                 name=["test_graph_slope", "test_graph_smooth",
+    ...                       "test_graph_aspect", "test_graph_sum"])
+
+    """
+    def __init__(self, nprocs=1, set_temp_region=False,
+                 skip_up_to_date=False):
+        """Constructor
+
+        :param nprocs: The maximum number of Module processes that
+                       can be run in parallel, if None use all the CPUs
+        :type nprocs: int
+        :param set_temp_region: Run each node in a temporary region
+        :type set_temp_region: bool
+        :param skip_up_to_date: Do not run the nodes whose output maps are
+                                newer than their input maps, if all the
+                                nodes they depend on were skipped too
+        :type skip_up_to_date: bool
+        """
+        self.nprocs = nprocs
+        self.set_temp_region = set_temp_region
+        self.skip_up_to_date = skip_up_to_date
+        self._nodes = []
+        self._finished_modules = []
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def add(self, module, depends=None, set_temp_region=None):
+        """Add a Module or MultiModule object to the graph
+
+        :param module: a Module or MultiModule object configured with
+                       run\\_ set to False
+        :param depends: a list of nodes, already in the graph, that must be
+                        finished before this module is run
+        :param set_temp_region: run the module in a temporary region,
+                                default is the value of the graph
+        :returns: the ModuleNode object of the module
+        """
+        if not isinstance(module, (Module, MultiModule)):
+            raise GrassError("Only Module and MultiModule objects can be "
+                             "added to a ModuleGraph, not %r" % module)
+        if set_temp_region is None:
+            set_temp_region = self.set_temp_region
+        node = ModuleNode(module, set_temp_region)
+        for dep in depends or []:
+            if dep not in self._nodes:
+                raise GrassError("The node %r is not in the graph" % dep)
+            node.parents.add(dep)
+        for other in self._nodes:
+            if ((node.inputs & other.outputs) or
+                    (node.outputs & other.inputs) or
+                    (node.outputs & other.outputs)):
+                node.parents.add(other)
+        for parent in node.parents:
+            parent.children.add(node)
+        self._nodes.append(node)
+        return node
+
+    def get_nodes(self):
+        """Return the list of the nodes in the order they were added"""
+        return self._nodes
+
+    def get_finished_modules(self):
+        """Return the Module objects that were run by the graph, in the
+        order in which they have finished"""
+        return self._finished_modules
+
+    def run(self):
+        """Run all the nodes of the graph, a node is started as soon as all
+        the nodes it depends on are finished or skipped.
+
+        This method will raise a CalledModuleError in case a Module
+        process exits with a return code other than 0, the nodes that are
+        already running are waited for before.
+        """
+        ready = []
+        pending = {}
+        forced = set()
+        for node in self._nodes:
+            node.status, node.result = 'waiting', None
+            pending[node] = len(node.parents)
+            if not node.parents:
+                ready.append(node)
+
+        def finished(node, result, status='finished'):
+            node.status = status
+            if status == 'finished':
+                node.result = result
+                modules = result if isinstance(result, list) else [result, ]
+                self._finished_modules.extend(modules)
+            for child in node.children:
+                if status == 'finished':
+                    forced.add(child)
+                pending[child] -= 1
+                if not pending[child]:
+                    ready.append(child)
+
+        queue = ParallelModuleQueue(nprocs=self.nprocs)
+        try:
+            while ready or queue.get_num_run_procs():
+                if not ready:
+                    queue.wait_any()
+                    continue
+                node = ready.pop(0)
+                if (self.skip_up_to_date and node not in forced and
+                        node.is_up_to_date()):
+                    finished(node, None, 'skipped')
+                    continue
+                node.status = 'running'
+                queue.put(node.get_runnable(),
+                          callback=lambda result, node=node:
+                          finished(node, result))
+        except Exception:
+            try:
+                queue.wait()
+            except Exception:
+                pass
+            raise
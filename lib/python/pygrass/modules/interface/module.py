@@ -2,18 +2,25 @@
 from __future__ import (nested_scopes, generators, division, absolute_import,
                         with_statement, print_function, unicode_literals)
 import sys
+from bisect import bisect_right
+from collections import deque, OrderedDict
 from multiprocessing import cpu_count, Process, Queue
+import threading
 import time
 from xml.etree.ElementTree import fromstring
 
-from grass.exceptions import CalledModuleError, GrassError, ParameterError
-from grass.script.core import Popen, PIPE, use_temp_region, del_temp_region
+from grass.exceptions import (CalledModuleError, GrassError, ParameterError,
+                              ScriptError)
+from grass.script.core import (Popen, PIPE, use_temp_region, del_temp_region,
+                               warning)
+from grass.script.task import (get_interface_description,
+                               INTERFACE_CACHE_SIZE)
 from grass.script.utils import encode, decode
 from .docstring import docstring_property
 from .parameter import Parameter
 from .flag import Flag
 from .typedict import TypeDict
-from .read import GETFROMTAG, DOC
+from .read import GETFROMTAG, DOC, element2dict
 from .env import G_debug
 
 if sys.version_info[0] == 2:
@@ -27,22 +34,59 @@ def _get_bash(self, *args, **kargs):
     return self.get_bash()
 
 
+# parsed interface descriptions, keyed on the XML of the module
+_description_cache = OrderedDict()
+
+
+def _parse_description(xml):
+    """Return the attributes and the dictionaries of the parameters and of
+    the flags read from the XML interface description of a module.
+
+    The parsed descriptions are kept in an in-memory LRU, the Parameter and
+    Flag objects are built from the dictionaries by each Module instance.
+    """
+    if xml in _description_cache:
+        desc = _description_cache.pop(xml)
+        _description_cache[xml] = desc
+        return desc
+    tree = fromstring(xml)
+    attrs = [(e.tag, GETFROMTAG[e.tag](e)) for e in tree
+             if e.tag not in ('parameter', 'flag')]
+    params = [element2dict(p) for p in tree.findall("parameter")]
+    flags = [element2dict(f) for f in tree.findall("flag")]
+    desc = (attrs, params, flags)
+    _description_cache[xml] = desc
+    while len(_description_cache) > INTERFACE_CACHE_SIZE:
+        _description_cache.popitem(last=False)
+    return desc
+
+
 class ParallelModuleQueue(object):
     """This class is designed to run an arbitrary number of pygrass Module or MultiModule
     processes in parallel.
 
     Objects of type grass.pygrass.modules.Module or
     grass.pygrass.modules.MultiModule can be put into the
-    queue using put() method. When the queue is full with the maximum
-    number of parallel processes it will wait for all processes to finish,
-    sets the stdout and stderr of the Module object and removes it
-    from the queue when its finished.
-
-    To finish the queue before the maximum number of parallel
-    processes was reached call wait() .
-
-    This class will raise a GrassError in case a Module process exits
-    with a return code other than 0.
+    queue using put() method. The queue works as a pool: a new process
+    is started as soon as any of the running processes has finished,
+    so a slow process does not stall the others. When all the processes
+    are running and the waiting list is full, put() blocks until a
+    process finishes. Each started process is watched by a thread that
+    sets the stdout and stderr of the Module object when it is finished,
+    finished modules are collected (and their callback is called) by put()
+    and wait(), get_finished_modules() returns them in the order in which
+    they were put in the queue.
+
+    To finish all the processes in the queue call wait() .
+
+    Processes can be killed if they run longer than a timeout and a
+    callback can be called with each finished Module (or with the list of
+    modules of a MultiModule).
+
+    This class will raise a CalledModuleError in case a Module process exits
+    with a return code other than 0, a GrassError if a process
+    exceeds its timeout and the error raised by run() if a process can not
+    be started.
 
     Processes that were run asynchronously with the MultiModule class
     will not raise a GrassError in case of failure. This must be manually checked
@@ -190,15 +234,15 @@ class ParallelModuleQueue(object):
     >>> new_mapcalc = copy.deepcopy(mapcalc)
     >>> mapcalc_list.append(new_mapcalc)
     >>> m = new_mapcalc(expression="test_pygrass_3 =3")
-    >>> queue.put(m) # Now it will wait until all procs finish and set the counter back to 0
+    >>> queue.put(m)
     >>> queue.get_num_run_procs()
-    0
+    3
     >>> new_mapcalc = copy.deepcopy(mapcalc)
     >>> mapcalc_list.append(new_mapcalc)
     >>> m = new_mapcalc(expression="test_pygrass_%i = %i"%(i, i))
-    >>> queue.put(m)
-    >>> queue.get_num_run_procs()
-    1
+    >>> queue.put(m) # Now it will wait until a process finishes
+    >>> queue.get_num_run_procs() <= 3
+    True
     >>> queue.wait()
     >>> mapcalc_list = queue.get_finished_modules()
     >>> queue.get_num_run_procs()
@@ -212,40 +256,174 @@ class ParallelModuleQueue(object):
     0
     0
 
+    Check the callback and the timeout
+
+    >>> finished = []
+    >>> queue = ParallelModuleQueue(nprocs=2, callback=finished.append)
+    >>> mapcalc = Module("r.mapcalc", expression="test_pygrass_cb = 1",
+    ...                overwrite=True, run_=False)
+    >>> queue.put(mapcalc, timeout=60)
+    >>> queue.wait()
+    >>> finished == queue.get_finished_modules()
+    True
+
     """
-    def __init__(self, nprocs=1):
+    def __init__(self, nprocs=1, queue_size=0, timeout=None, callback=None):
         """Constructor
 
         :param nprocs: The maximum number of Module processes that
                        can be run in parallel, default is 1, if None
                        then use all the available CPUs.
         :type nprocs: int
+        :param queue_size: The maximum number of modules that can wait for
+                           a free process, put() blocks when the waiting
+                           list is full, default is 0.
+        :type queue_size: int
+        :param timeout: The default number of seconds after which a
+                        process is killed, None to never kill processes.
+        :type timeout: float
+        :param callback: The default function called with each finished
+                         Module or list of modules of a MultiModule.
+        :type callback: callable
         """
         nprocs = int(nprocs) if nprocs else cpu_count()
         self._num_procs = nprocs
         self._list = nprocs * [None]
+        self._queue_size = int(queue_size)
+        self._timeout = timeout
+        self._callback = callback
+        self._running = 0
         self._proc_count = 0
+        self._put_count = 0
+        self._pending = deque()
+        self._done = deque()
+        self._cond = threading.Condition()
         self._finished_modules = []  # Store all processed modules in a list
+        self._finished_index = []  # The put() order of the finished modules
 
-    def put(self, module):
+    def put(self, module, timeout=None, callback=None):
         """Put the next Module or MultiModule object in the queue
 
+        The module is started as soon as one of the parallel processes is
+        free, if all the processes are busy the module is appended to the
+        waiting list, if the waiting list is full this method waits
+        until a process finishes.
+
         To run the Module objects in parallel the run\_ and finish\_ options
         of the Module must be set to False.
 
         :param module: a preconfigured Module or MultiModule object that were configured
                        with run\_ and finish\_ set to False,
         :type module: Module or MultiModule object
+        :param timeout: the number of seconds after which the process is
+                        killed, default is the timeout of the queue
+        :type timeout: float
+        :param callback: the function called with the finished module,
+                         default is the callback of the queue
+        :type callback: callable
         """
-        self._list[self._proc_count] = module
         # Force that finish is False, otherwise the execution
         # will not be parallel
-        self._list[self._proc_count].finish_ = False
-        self._list[self._proc_count].run()
-        self._proc_count += 1
+        module.finish_ = False
+        timeout = self._timeout if timeout is None else timeout
+        callback = self._callback if callback is None else callback
+        with self._cond:
+            while (self._running >= self._num_procs and
+                   len(self._pending) >= self._queue_size):
+                if not self._done:
+                    self._cond.wait()
+                self._collect()
+            self._proc_count += 1
+            index = self._put_count
+            self._put_count += 1
+            if self._running < self._num_procs:
+                self._start(index, module, timeout, callback)
+            else:
+                self._pending.append((index, module, timeout, callback))
 
-        if self._proc_count == self._num_procs:
-            self.wait()
+    def _start(self, index, module, timeout, callback):
+        """Start a module in a free slot and a thread that waits for it,
+        must be called with the lock acquired.
+
+        If the module can not be started the error is stored with the
+        finished modules and raised when they are collected.
+        """
+        num = self._list.index(None) if None in self._list else \
+            self._running % self._num_procs
+        timer = None
+        try:
+            module.run()
+            if timeout is not None:
+                timer = threading.Timer(timeout, _kill_module, [module])
+                timer.daemon = True
+                timer.start()
+            watcher = threading.Thread(target=self._watch,
+                                       args=(index, num, module, timer,
+                                             callback))
+            watcher.daemon = True
+            watcher.start()
+        except Exception as e:
+            if timer is not None:
+                timer.cancel()
+            self._done.append((index, module, callback, e))
+            self._cond.notify_all()
+            return
+        self._list[num] = module
+        self._running += 1
+
+    def _watch(self, index, num, module, timer, callback):
+        """Wait for a module in a background thread and start the next
+        waiting module"""
+        error = None
+        try:
+            result = module.wait()
+        except Exception as e:
+            result, error = module, e
+        if timer is not None:
+            timer.cancel()
+            if getattr(module, '_killed', False):
+                error = GrassError("Module %s killed after %g seconds" %
+                                   (module, timer.interval))
+        if isinstance(module, MultiModule) and result is None:
+            result = module.module_list
+        with self._cond:
+            try:
+                self._running -= 1
+                if self._list[num] is module:
+                    self._list[num] = None
+                self._done.append((index, result, callback, error))
+                if self._pending:
+                    pending = self._pending.popleft()
+                    try:
+                        self._start(*pending)
+                    except Exception as e:
+                        self._done.append((pending[0], pending[1],
+                                           pending[3], e))
+            finally:
+                # always wake up the waiters, even if something went wrong
+                self._cond.notify_all()
+
+    def _collect(self):
+        """Move the finished modules in the list of finished modules,
+        call their callbacks and raise the first error, the other errors
+        are printed as warnings, must be called with the lock acquired"""
+        errors = []
+        while self._done:
+            index, result, callback, error = self._done.popleft()
+            self._proc_count -= 1
+            modules = result if isinstance(result, list) else [result, ]
+            # keep the finished modules in the order of put()
+            pos = bisect_right(self._finished_index, index)
+            self._finished_modules[pos:pos] = modules
+            self._finished_index[pos:pos] = len(modules) * [index]
+            if callback is not None:
+                callback(result)
+            if error is not None:
+                errors.append(error)
+        for error in errors[1:]:
+            warning(str(error))
+        if errors:
+            raise errors[0]
 
     def get(self, num):
         """Get a Module object or list of Module objects from the queue
@@ -259,8 +437,8 @@ class ParallelModuleQueue(object):
         return None
 
     def get_num_run_procs(self):
-        """Get the number of Module processes that are in the queue running
-        or finished
+        """Get the number of Module processes that are in the queue running,
+        waiting or finished and not yet collected
 
         :returns: the number fo Module processes running/finished in the queue
         """
@@ -281,32 +459,66 @@ class ParallelModuleQueue(object):
                        run in parallel
         :type nprocs: int
         """
-        self._num_procs = int(nprocs)
         self.wait()
+        self._num_procs = int(nprocs)
+        self._list = self._num_procs * [None]
 
     def get_finished_modules(self):
-        """Return all finished processes that were run by this queue
+        """Return all finished processes that were run by this queue,
+        in the order in which they were put in the queue
 
         :return: A list of Module objects
         """
         return self._finished_modules
 
-    def wait(self):
-        """Wait for all Module processes that are in the list to finish
-        and set the modules stdout and stderr output options
+    def wait_any(self):
+        """Wait until at least one of the Module processes in the queue has
+        finished and collect all the finished ones
 
-        :return: A list of modules that were run
+        :returns: the number of collected processes, 0 if the queue is empty
         """
-        for proc in self._list:
-            if proc:
-                if isinstance(proc, Module):
-                    self._finished_modules.extend([proc.wait(),])
-                else:
-                    self._finished_modules.extend(proc.wait())
-
-        self._list = self._num_procs * [None]
-        self._proc_count = 0
+        with self._cond:
+            count = self._proc_count
+            while count and not self._done:
+                self._cond.wait()
+            self._collect()
+            return count - self._proc_count
 
+    def wait(self):
+        """Wait for all Module processes that are in the queue to finish
+        and collect them in the list of finished modules, the first error
+        is raised when all the processes have finished
+        """
+        first_error = None
+        with self._cond:
+            while self._proc_count:
+                if not self._done:
+                    self._cond.wait()
+                try:
+                    self._collect()
+                except Exception as e:
+                    if first_error is None:
+                        first_error = e
+                    else:
+                        warning(str(e))
+            self._list = self._num_procs * [None]
+        if first_error is not None:
+            raise first_error
+
+
+def _kill_module(module):
+    """Kill the process of a Module or MultiModule that exceeded its
+    timeout"""
+    module._killed = True
+    try:
+        if isinstance(module, MultiModule):
+            module.p.terminate()
+            # unblock MultiModule.wait, the process can not answer anymore
+            module.q.put(module.module_list)
+        else:
+            module.popen.kill()
+    except (OSError, AttributeError):
+        pass
 
 
 class Module(object):
@@ -523,26 +735,24 @@ class Module(object):
         else:
             raise GrassError("Problem initializing the module {s}".format(s=cmd))
         try:
-            # call the command with --interface-description
-            get_cmd_xml = Popen([cmd, "--interface-description"], stdout=PIPE)
-        except OSError as e:
-            print("OSError error({0}): {1}".format(e.errno, e.strerror))
+            # get the xml of the module, the command is called with
+            # --interface-description only if it is not in the cache
+            self.xml = get_interface_description(self.name)
+        except ScriptError as e:
+            print("ScriptError: {0}".format(e.value))
             str_err = "Error running: `%s --interface-description`."
             raise GrassError(str_err % self.name)
-        # get the xml of the module
-        self.xml = get_cmd_xml.communicate()[0]
-        # transform and parse the xml into an Element class:
-        # http://docs.python.org/library/xml.etree.elementtree.html
-        tree = fromstring(self.xml)
+        # parse the xml, the parsed description is cached and the
+        # parameters and flags are built from it
+        attrs, params, flags = _parse_description(self.xml)
 
-        for e in tree:
-            if e.tag not in ('parameter', 'flag'):
-                self.__setattr__(e.tag, GETFROMTAG[e.tag](e))
+        for tag, value in attrs:
+            self.__setattr__(tag, value)
 
         #
         # extract parameters from the xml
         #
-        self.params_list = [Parameter(p) for p in tree.findall("parameter")]
+        self.params_list = [Parameter(diz=diz) for diz in params]
         self.inputs = TypeDict(Parameter)
         self.outputs = TypeDict(Parameter)
         self.required = []
@@ -559,7 +769,7 @@ class Module(object):
         #
         # extract flags from the xml
         #
-        flags_list = [Flag(f) for f in tree.findall("flag")]
+        flags_list = [Flag(diz=diz) for diz in flags]
         self.flags = TypeDict(Flag)
         for flag in flags_list:
             self.flags[flag.name] = flag
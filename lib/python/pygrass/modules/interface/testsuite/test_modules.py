@@ -5,13 +5,14 @@ Created on Tue Jun 24 09:43:53 2014
 @author: pietro
 """
 import sys
+import time
 from fnmatch import fnmatch
 from grass.gunittest.case import TestCase
 from grass.gunittest.main import test
 
 from grass.script.core import get_commands
 from grass.exceptions import ParameterError
-from grass.pygrass.modules.interface import Module
+from grass.pygrass.modules.interface import Module, ParallelModuleQueue
 
 PY2 = sys.version_info[0] == 2
 if PY2:
@@ -79,5 +80,71 @@ class TestModulesCheck(TestCase):
         self.assertIsNone(gextension.check())
 
 
+class TestModulesCache(TestCase):
+    def test_independent_instances(self):
+        """Test that modules built from the cached description do not
+        share parameters and flags"""
+        first = Module('r.mapcalc')
+        second = Module('r.mapcalc')
+        first.inputs.expression = 'a = 1'
+        first.flags.s = True
+        self.assertIsNone(second.inputs.expression)
+        self.assertFalse(second.flags.s)
+        self.assertEqual(first.description, second.description)
+        self.assertEqual([p.name for p in first.params_list],
+                         [p.name for p in second.params_list])
+
+
+class SleepModule(object):
+    """Object that behaves as a Module that runs for some seconds or that
+    can not be started"""
+    def __init__(self, seconds, error=None):
+        self.seconds = seconds
+        self.error = error
+        self.finish_ = True
+
+    def run(self):
+        if self.error is not None:
+            raise self.error
+        return self
+
+    def wait(self):
+        time.sleep(self.seconds)
+        return self
+
+
+class TestParallelModuleQueue(TestCase):
+    def test_submission_order(self):
+        """Test that finished modules are returned in the put() order"""
+        modules = [SleepModule(s) for s in (0.3, 0.1, 0.2, 0, 0.1)]
+        finished = []
+        queue = ParallelModuleQueue(nprocs=3, queue_size=2,
+                                    callback=finished.append)
+        for module in modules:
+            queue.put(module)
+        queue.wait()
+        self.assertEqual(queue.get_num_run_procs(), 0)
+        self.assertListEqual(queue.get_finished_modules(), modules)
+        self.assertEqual(sorted(map(id, finished)), sorted(map(id, modules)))
+
+    def test_run_error(self):
+        """Test that wait() returns and raises the error of a module that
+        can not be started"""
+        for nprocs in (1, 2):
+            queue = ParallelModuleQueue(nprocs=nprocs, queue_size=2)
+            # with one process the failing module is started by the
+            # thread that waits for the first module
+            queue.put(SleepModule(0.2))
+            queue.put(SleepModule(0, OSError("cannot run")))
+            with self.assertRaises(OSError):
+                queue.wait()
+            self.assertEqual(queue.get_num_run_procs(), 0)
+            self.assertEqual(len(queue.get_finished_modules()), 2)
+            # the queue is still usable
+            queue.put(SleepModule(0))
+            queue.wait()
+            self.assertEqual(len(queue.get_finished_modules()), 3)
+
+
 if __name__ == '__main__':
     test()
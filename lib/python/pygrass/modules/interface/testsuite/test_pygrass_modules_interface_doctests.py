@@ -32,6 +32,7 @@ def load_tests(loader, tests, ignore):
     grass.gunittest.utils.do_doctest_gettext_workaround()
     # this should be called at some top level
     tests.addTests(doctest.DocTestSuite(gmodules.interface.flag))
+    tests.addTests(doctest.DocTestSuite(gmodules.interface.dag))
     tests.addTests(doctest.DocTestSuite(gmodules.interface.module))
     tests.addTests(doctest.DocTestSuite(gmodules.interface.parameter))
 
@@ -171,6 +171,94 @@ class RasterRow(RasterAbstractBase):
         """
         libraster.Rast_put_row(self._fd, row.p, self._gtype)
 
+    @must_be_open
+    def read_block(self, row_start=0, row_end=None, out=None):
+        """Read the rows from `row_start` to `row_end` (excluded) into a
+        2-D numpy array, calling the `Rast_get_row` C function for each row.
+
+        If the `out` array has the numpy type of the map and is C-contiguous
+        the rows are read directly in its memory, otherwise a single row
+        buffer is used to convert the values, no memory is allocated per row.
+
+        :param row_start: the first row to read
+        :type row_start: int
+        :param row_end: the row after the last row to read, if None the
+                        rows are read until the end of the map
+        :type row_end: int
+        :param out: an array with shape (row_end - row_start, cols) that
+                    will be used for value storage
+        :type out: numpy.ndarray
+
+            >>> elev = RasterRow(test_raster_name)
+            >>> elev.open()
+            >>> elev.read_block(1, 3)
+            array([[12, 22, 32, 42],
+                   [13, 23, 33, 43]], dtype=int32)
+            >>> out = np.zeros((4, 4), dtype=np.float64)
+            >>> elev.read_block(out=out)[3]
+            array([14., 24., 34., 44.])
+            >>> elev.close()
+
+        """
+        if row_end is None:
+            row_end = self._rows
+        if not 0 <= row_start <= row_end <= self._rows:
+            str_err = _("Invalid row range: [{0}, {1}), rows are [0, {2})")
+            raise IndexError(str_err.format(row_start, row_end, self._rows))
+        shape = (row_end - row_start, self._cols)
+        dtype = RTYPE[self.mtype]['numpy']
+        if out is None:
+            out = np.empty(shape, dtype=dtype)
+        elif out.shape != shape:
+            str_err = _("Array and block have different shape: {0} != {1}")
+            raise ValueError(str_err.format(out.shape, shape))
+
+        if out.dtype == dtype and out.flags['C_CONTIGUOUS']:
+            address, stride = out.ctypes.data, out.strides[0]
+            for i, row in enumerate(range(row_start, row_end)):
+                libraster.Rast_get_row(self._fd,
+                                       ctypes.c_void_p(address + i * stride),
+                                       row, self._gtype)
+        else:
+            row_buffer = Buffer((self._cols,), self.mtype)
+            for i, row in enumerate(range(row_start, row_end)):
+                libraster.Rast_get_row(self._fd, row_buffer.p, row,
+                                       self._gtype)
+                out[i] = row_buffer
+        return out
+
+    @must_be_open
+    def write_block(self, array):
+        """Write all the rows of a 2-D numpy array sequentially, calling the
+        `Rast_put_row` C function for each row.
+
+        If the array has the numpy type of the map and is C-contiguous the
+        rows are written directly from its memory, otherwise a single row
+        buffer is used to convert the values.
+
+        :param array: an array with the same number of columns of the map
+        :type array: numpy.ndarray
+        """
+        if array.ndim != 2 or array.shape[1] != self._cols:
+            str_err = _("Array must have shape (rows, {0}), got {1}")
+            raise ValueError(str_err.format(self._cols, array.shape))
+        dtype = RTYPE[self.mtype]['numpy']
+        if array.dtype == dtype and array.flags['C_CONTIGUOUS']:
+            address, stride = array.ctypes.data, array.strides[0]
+            for i in range(array.shape[0]):
+                libraster.Rast_put_row(self._fd,
+                                       ctypes.c_void_p(address + i * stride),
+                                       self._gtype)
+        else:
+            row_buffer = Buffer((self._cols,), self.mtype)
+            for row in array:
+                row_buffer[:] = row
+                libraster.Rast_put_row(self._fd, row_buffer.p, self._gtype)
+
+    def _write_rows(self, row_start, array):
+        """Write the rows sequentially, `row_start` must be the next row"""
+        self.write_block(array)
+
     def open(self, mode=None, mtype=None, overwrite=None):
         """Open the raster if exist or created a new one.
 
@@ -427,6 +515,42 @@ class RasterSegment(RasterAbstractBase):
         """
         self.segment.put_row(row, row_buffer)
 
+    def _write_rows(self, row_start, array):
+        """Write the rows using the `segment.put_row` method"""
+        row_buffer = Buffer((self._cols,), self.mtype)
+        for i, row in enumerate(array):
+            row_buffer[:] = row
+            self.segment.put_row(row_start + i, row_buffer)
+
+    @must_be_open
+    def iter_chunks(self, rows=None, cols=None, overlap=0):
+        """Return a generator of the chunks of the map as 2-D numpy arrays,
+        see `RasterAbstractBase.iter_chunks`.
+
+        By default the chunks have the size of the segments, so each chunk
+        is read from the segments kept in memory.
+
+            >>> with RasterSegment(test_raster_name, srows=2, scols=2) as elev:
+            ...     for chunk, offset in elev.iter_chunks(overlap=1):
+            ...         offset, chunk.shape
+            ((0, 0), (3, 3))
+            ((0, 1), (3, 3))
+            ((1, 0), (3, 3))
+            ((1, 1), (3, 3))
+
+        """
+        rows = self.segment.srows if rows is None else rows
+        cols = self.segment.scols if cols is None else cols
+        return super(RasterSegment, self).iter_chunks(rows, cols, overlap)
+
+    @must_be_open
+    def write_chunks(self, chunks, rows=None, cols=None, overlap=0):
+        """Write the map from the chunks generated by `iter_chunks`,
+        see `RasterAbstractBase.write_chunks`."""
+        rows = self.segment.srows if rows is None else rows
+        cols = self.segment.scols if cols is None else cols
+        super(RasterSegment, self).write_chunks(chunks, rows, cols, overlap)
+
     @must_be_open
     def get(self, row, col):
         """Return the map value using the `segment.get` method
@@ -497,6 +621,55 @@ class RasterSegment(RasterAbstractBase):
         self.segment.val.value = val
         self.segment.put(row, col)
 
+    def _check_indexes(self, rows, cols):
+        """Return the row and column indexes as integer numpy arrays"""
+        rows = np.asarray(rows, dtype=np.intp).ravel()
+        cols = np.asarray(cols, dtype=np.intp).ravel()
+        if rows.shape != cols.shape:
+            raise ValueError(_("Rows and columns must have the same length"))
+        if rows.size and (rows.min() < 0 or rows.max() >= self._rows or
+                          cols.min() < 0 or cols.max() >= self._cols):
+            raise IndexError(_("Index out of range"))
+        return rows, cols
+
+    @must_be_open
+    def get_many(self, rows, cols):
+        """Return the map values of many cells as a numpy array, using
+        the `segment.get_many` method
+
+        :param rows: the row indexes
+        :type rows: numpy.ndarray or sequence of int
+        :param cols: the column indexes
+        :type cols: numpy.ndarray or sequence of int
+
+            >>> with RasterSegment(test_raster_name) as elev:
+            ...     elev.get_many([3, 0, 2], [3, 0, 1])
+            array([44, 11, 23], dtype=int32)
+
+        """
+        rows, cols = self._check_indexes(rows, cols)
+        out = np.empty(rows.shape, dtype=RTYPE[self.mtype]['numpy'])
+        return self.segment.get_many(rows, cols, out)
+
+    @must_be_open
+    def put_many(self, rows, cols, values):
+        """Write the values of many cells to the map using the
+        `segment.put_many` method
+
+        :param rows: the row indexes
+        :type rows: numpy.ndarray or sequence of int
+        :param cols: the column indexes
+        :type cols: numpy.ndarray or sequence of int
+        :param values: the values to write, a scalar is written in all the
+                       cells
+        :type values: numpy.ndarray or sequence
+        """
+        rows, cols = self._check_indexes(rows, cols)
+        values = np.broadcast_to(np.asarray(values,
+                                            dtype=RTYPE[self.mtype]['numpy']),
+                                 rows.shape)
+        self.segment.put_many(rows, cols, values)
+
     def open(self, mode=None, mtype=None, overwrite=None):
         """Open the map, if the map already exist: determine the map type
         and copy the map to the segment files;
@@ -617,7 +790,7 @@ def raster2numpy(rastname, mapset=''):
     :parar str mapset: the name of mapset containig raster map
     """
     with RasterRow(rastname, mapset=mapset, mode='r') as rast:
-        return np.array(rast)
+        return rast.read_block()
 
 
 def raster2numpy_img(rastname, region, color="ARGB", array=None):
@@ -700,10 +873,7 @@ def numpy2raster(array, mtype, rastname, overwrite=False):
         msg = "Region and array are different: %r != %r"
         raise TypeError(msg % ((reg.rows, reg.cols), array.shape))
     with RasterRow(rastname, mode='w', mtype=mtype, overwrite=overwrite) as new:
-        newrow = Buffer((array.shape[1],), mtype=mtype)
-        for row in array:
-            newrow[:] = row[:]
-            new.put_row(newrow)
+        new.write_block(array)
 
 if __name__ == "__main__":
 
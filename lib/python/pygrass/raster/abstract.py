@@ -7,6 +7,9 @@ Created on Fri Aug 17 16:05:25 2012
 from __future__ import (nested_scopes, generators, division, absolute_import,
                         with_statement, print_function, unicode_literals)
 import ctypes
+from math import ceil, floor
+
+import numpy as np
 
 #
 # import GRASS modules
@@ -28,6 +31,7 @@ from grass.pygrass.shell.show import raw_figure
 # import raster classes
 #
 from grass.pygrass.raster.raster_type import TYPE as RTYPE, RTYPE_STR
+from grass.pygrass.raster.buffer import Buffer
 from grass.pygrass.raster.category import Category
 from grass.pygrass.raster.history import History
 
@@ -485,6 +489,168 @@ class RasterAbstractBase(object):
         line = self.get_row(int(row))
         return line[int(col)]
 
+    @must_be_open
+    def get_window_bounds(self, bbox):
+        """Return the rows and the columns of the active window that
+        intersect a bounding box as a tuple
+        (row_start, row_end, col_start, col_end), the ends are excluded.
+
+        The window used to open the map is read with
+        `Rast_get_input_window` and it is not modified.
+
+        :param bbox: the bounding box of the window to read
+        :type bbox: Bbox object
+        """
+        window = libraster.struct_Cell_head()
+        libraster.Rast_get_input_window(ctypes.byref(window))
+        rows, cols = window.rows, window.cols
+        pwindow = ctypes.byref(window)
+        north = libraster.Rast_northing_to_row(bbox.north, pwindow)
+        south = libraster.Rast_northing_to_row(bbox.south, pwindow)
+        west = libraster.Rast_easting_to_col(bbox.west, pwindow)
+        east = libraster.Rast_easting_to_col(bbox.east, pwindow)
+        row_start = min(max(int(floor(north)), 0), rows)
+        row_end = min(max(int(ceil(south)), row_start), rows)
+        col_start = min(max(int(floor(west)), 0), cols)
+        col_end = min(max(int(ceil(east)), col_start), cols)
+        return row_start, row_end, col_start, col_end
+
+    @must_be_open
+    def read_window(self, bbox, out=None):
+        """Return a 2-D numpy array with the cells of the active window that
+        intersect a bounding box.
+
+        Only the rows intersecting the bounding box are read and the
+        computational region of the process is not changed, so different
+        windows of the same map can be read without resetting the region.
+        Use `get_window_bounds` to obtain the offset of the array in the
+        active window.
+
+        :param bbox: the bounding box of the window to read
+        :type bbox: Bbox object
+        :param out: an array with the shape of the window that will be used
+                    for value storage
+        :type out: numpy.ndarray
+        """
+        row_start, row_end, col_start, col_end = self.get_window_bounds(bbox)
+        shape = (row_end - row_start, col_end - col_start)
+        if out is None:
+            out = np.empty(shape, dtype=RTYPE[self.mtype]['numpy'])
+        elif out.shape != shape:
+            str_err = _("Array and window have different shape: {0} != {1}")
+            raise ValueError(str_err.format(out.shape, shape))
+        row_buffer = Buffer((self._cols,), self.mtype)
+        for i, row in enumerate(range(row_start, row_end)):
+            row_buffer = self.get_row(row, row_buffer)
+            out[i] = row_buffer[col_start:col_end]
+        return out
+
+    def _chunk_grid(self, rows, cols, overlap):
+        """Return a generator with the limits of the chunks of the active
+        window as (row_start, row_end, col_start, col_end) tuples"""
+        if cols is None:
+            cols = self._cols
+        if rows <= 0 or cols <= 0 or overlap < 0:
+            str_err = _("Invalid chunk size: rows={0}, cols={1}, overlap={2}")
+            raise ValueError(str_err.format(rows, cols, overlap))
+        for row_start in range(0, self._rows, rows):
+            for col_start in range(0, self._cols, cols):
+                yield (row_start, min(row_start + rows, self._rows),
+                       col_start, min(col_start + cols, self._cols))
+
+    @must_be_open
+    def iter_chunks(self, rows=512, cols=None, overlap=0):
+        """Return a generator of the chunks of the map as 2-D numpy arrays
+        together with the offset (row, col) of their first cell.
+
+        The chunks cover the active window in row major order, each chunk
+        is extended by `overlap` cells (clipped to the window) on every
+        side, so moving window filters can be applied to maps larger than
+        the available memory, only `rows + 2 * overlap` rows are kept in
+        memory and the rows shared by two bands are read once.
+
+        The arrays are views of an internal buffer that is reused, copy them
+        to keep their values after the next iteration.
+
+        :param rows: the number of rows of the chunks
+        :type rows: int
+        :param cols: the number of columns of the chunks, if None the
+                     chunks have the width of the window
+        :type cols: int
+        :param overlap: the number of cells added on each side of the chunks
+        :type overlap: int
+        """
+        dtype = RTYPE[self.mtype]['numpy']
+        band = np.empty((min(rows + 2 * overlap, self._rows), self._cols),
+                        dtype=dtype)
+        band_start, band_end = 0, 0
+        row_buffer = Buffer((self._cols,), self.mtype)
+        for row_start, row_end, col_start, col_end in self._chunk_grid(
+                rows, cols, overlap):
+            brow_start = max(row_start - overlap, 0)
+            brow_end = min(row_end + overlap, self._rows)
+            if brow_start != band_start or brow_end != band_end:
+                # reuse the rows already read by the previous band
+                kept = max(band_end - brow_start, 0)
+                if kept:
+                    band[:kept] = band[brow_start - band_start:
+                                       band_end - band_start]
+                for i, row in enumerate(range(brow_start + kept, brow_end)):
+                    row_buffer = self.get_row(row, row_buffer)
+                    band[kept + i] = row_buffer
+                band_start, band_end = brow_start, brow_end
+            bcol_start = max(col_start - overlap, 0)
+            bcol_end = min(col_end + overlap, self._cols)
+            yield (band[:brow_end - brow_start, bcol_start:bcol_end],
+                   (brow_start, bcol_start))
+
+    @must_be_open
+    def write_chunks(self, chunks, rows=512, cols=None, overlap=0):
+        """Write the map from the chunks generated by `iter_chunks` with
+        the same `rows`, `cols` and `overlap` parameters.
+
+        The overlapping cells are discarded and the map is written one band
+        of `rows` rows at a time.
+
+        :param chunks: an iterable of (array, (row, col)) tuples, the arrays
+                       must have the shape of the chunks of `iter_chunks`
+        :type chunks: iterable
+        :param rows: the number of rows of the chunks
+        :type rows: int
+        :param cols: the number of columns of the chunks
+        :type cols: int
+        :param overlap: the number of overlapping cells of the chunks
+        :type overlap: int
+        """
+        dtype = RTYPE[self.mtype]['numpy']
+        band = np.empty((min(rows, self._rows), self._cols), dtype=dtype)
+        chunks = iter(chunks)
+        for row_start, row_end, col_start, col_end in self._chunk_grid(
+                rows, cols, overlap):
+            brow_start = max(row_start - overlap, 0)
+            bcol_start = max(col_start - overlap, 0)
+            try:
+                block, offset = next(chunks)
+            except StopIteration:
+                raise ValueError(_("Not enough chunks to write the map"))
+            if tuple(offset) != (brow_start, bcol_start):
+                str_err = _("Chunk offset {0} does not match {1}")
+                raise ValueError(str_err.format(tuple(offset),
+                                                (brow_start, bcol_start)))
+            band[:row_end - row_start, col_start:col_end] = \
+                block[row_start - brow_start:row_end - brow_start,
+                      col_start - bcol_start:col_end - bcol_start]
+            if col_end == self._cols:
+                self._write_rows(row_start, band[:row_end - row_start])
+
+    def _write_rows(self, row_start, array):
+        """Write the rows of a 2-D array sequentially with `put_row`,
+        `row_start` must be the next row of the map"""
+        row_buffer = Buffer((self._cols,), self.mtype)
+        for row in array:
+            row_buffer[:] = row
+            self.put_row(row_buffer)
+
     @must_be_open
     def has_cats(self):
         """Return True if the raster map has categories"""
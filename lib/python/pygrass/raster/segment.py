@@ -5,6 +5,7 @@ Created on Mon Jun 11 18:02:27 2012
 @author: pietro
 """
 import ctypes
+import numpy as np
 import grass.lib.gis as libgis
 import grass.lib.raster as libraster
 import grass.lib.segment as libseg
@@ -102,11 +103,76 @@ class Segment(object):
         libseg.Segment_put(self.c_seg,
                            ctypes.byref(self.val), row_index, col_index)
 
+    def _split_rows(self, rows, index):
+        """Return a generator of the row numbers and of the indexes of
+        the cells in each row, `index` must be sorted by row"""
+        if not index.size:
+            return
+        bounds = np.flatnonzero(np.diff(rows[index])) + 1
+        for idx in np.split(index, bounds):
+            yield int(rows[idx[0]]), idx
+
+    def get_many(self, rows, cols, out):
+        """Store in `out` the values of the cells with the given row and
+        column indexes.
+
+        The cells are grouped by row, each row is read once with
+        `Segment_get_row` and its cells are copied with numpy.
+
+        :param rows: the row indexes
+        :type rows: numpy.ndarray
+        :param cols: the column indexes
+        :type cols: numpy.ndarray
+        :param out: the array used to store the values, with the numpy
+                    type of the map
+        :type out: numpy.ndarray
+        """
+        # write the pending updates before reading whole rows
+        self.flush()
+        buf = np.empty(self.cols(), dtype=out.dtype)
+        pbuf = buf.ctypes.data_as(ctypes.c_void_p)
+        get_row, c_seg = libseg.Segment_get_row, self.c_seg
+        order = np.argsort(rows, kind='mergesort')
+        for row, idx in self._split_rows(rows, order):
+            get_row(c_seg, pbuf, row)
+            out[idx] = buf[cols[idx]]
+        return out
+
+    def put_many(self, rows, cols, values):
+        """Write the values of the cells with the given row and column
+        indexes.
+
+        The cells are grouped by row, each row is read once, its cells are
+        changed with numpy and it is written back with `Segment_put_row`,
+        for duplicated cells the last value is written.
+
+        :param rows: the row indexes
+        :type rows: numpy.ndarray
+        :param cols: the column indexes
+        :type cols: numpy.ndarray
+        :param values: the values to write, with the numpy type of the map
+        :type values: numpy.ndarray
+        """
+        self.flush()
+        ncols = self.cols()
+        buf = np.empty(ncols, dtype=values.dtype)
+        pbuf = buf.ctypes.data_as(ctypes.c_void_p)
+        get_row, put_row = libseg.Segment_get_row, libseg.Segment_put_row
+        c_seg = self.c_seg
+        # keep the last occurrence of each cell, sorted by row and column
+        cells = rows * ncols + cols
+        _, last = np.unique(cells[::-1], return_index=True)
+        order = cells.size - 1 - last
+        for row, idx in self._split_rows(rows, order):
+            get_row(c_seg, pbuf, row)
+            buf[cols[idx]] = values[idx]
+            put_row(c_seg, pbuf, row)
+
     def get_seg_number(self, row_index, col_index):
-        """Return the segment number
+        """Return the segment number, the indexes can be numpy arrays
         """
-        return row_index / self.srows * self.cols / self.scols + \
-            col_index / self.scols
+        ncols = (self.cols() + self.scols - 1) // self.scols
+        return row_index // self.srows * ncols + col_index // self.scols
 
     def flush(self):
         """Flush pending updates to disk.
@@ -6,6 +6,7 @@ Created on Thu Jul 30 18:27:22 2015
 """
 from grass.gunittest.case import TestCase
 from grass.gunittest.main import test
+from numpy import allclose, float32, zeros
 from numpy.random import random
 from grass.pygrass.raster import raster2numpy, numpy2raster, RasterRow
 
@@ -53,5 +54,39 @@ class NumpyTestCase(TestCase):
         numpy2raster(ran, 'FCELL', self.name, True)
         self.assertTrue(check_raster(self.name))
 
+    def test_block(self):
+        ran = random([40, 60])
+        with RasterRow(self.name + '_block', mode='w', mtype='DCELL',
+                       overwrite=True) as new:
+            new.write_block(ran)
+        with RasterRow(self.name + '_block', mode='r') as rast:
+            self.assertTrue(allclose(rast.read_block(), ran))
+            out = zeros((10, 60), dtype=float32)
+            self.assertIs(rast.read_block(5, 15, out=out), out)
+            self.assertTrue(allclose(out, ran[5:15]))
+            with self.assertRaises(ValueError):
+                rast.read_block(0, 5, out=out)
+        self.runModule("g.remove", flags='f', type='raster',
+                       name=self.name + '_block')
+
+    def test_chunks(self):
+        ran = random([40, 60])
+        numpy2raster(ran, 'DCELL', self.name + '_chunks', True)
+        with RasterRow(self.name + '_chunks', mode='r') as rast:
+            chunks = [(chunk.copy(), offset) for chunk, offset in
+                      rast.iter_chunks(rows=16, cols=25, overlap=2)]
+        self.assertEqual(len(chunks), 9)
+        for chunk, (row, col) in chunks:
+            self.assertTrue(allclose(chunk, ran[row:row + chunk.shape[0],
+                                                col:col + chunk.shape[1]]))
+        self.assertEqual(chunks[4][0].shape, (20, 29))
+        with RasterRow(self.name + '_chunks', mode='w', mtype='DCELL',
+                       overwrite=True) as new:
+            new.write_chunks(((chunk * 2, offset) for chunk, offset in chunks),
+                             rows=16, cols=25, overlap=2)
+        self.assertTrue(allclose(raster2numpy(self.name + '_chunks'), ran * 2))
+        self.runModule("g.remove", flags='f', type='raster',
+                       name=self.name + '_chunks')
+
 if __name__ == '__main__':
     test()
@@ -6,6 +6,7 @@ from grass.gunittest.main import test
 from grass.pygrass.raster import RasterRow
 from grass.pygrass.raster import raster2numpy
 from grass.pygrass.gis.region import Region
+from grass.pygrass.vector.basic import Bbox
 
 
 class RasterRowRegionTestCase(TestCase):
@@ -110,5 +111,24 @@ class RasterRowRegionTestCase(TestCase):
         
         self.assertEqual(len(a), 8)
 
+    def test_read_window(self):
+
+        rast = RasterRow(self.name)
+        rast.set_region(Region())
+        rast.open(mode='r')
+
+        bbox = Bbox(north=35, south=15, east=25, west=-5)
+        self.assertEqual(rast.get_window_bounds(bbox), (0, 3, 0, 3))
+        window = rast.read_window(bbox)
+        self.assertEqual(window.tolist(), [[11., 21., 31.],
+                                           [12., 22., 32.],
+                                           [13., 23., 33.]])
+        # the window is not changed by the read
+        self.assertEqual(len(rast[0]), 4)
+        empty = rast.read_window(Bbox(north=100, south=80, east=100, west=80))
+        self.assertEqual(empty.shape, (0, 0))
+
+        rast.close()
+
 if __name__ == '__main__':
     test()
@@ -8,7 +8,7 @@ from __future__ import (nested_scopes, generators, division, absolute_import,
                         with_statement, print_function, unicode_literals)
 
 import optparse
-#import numpy as np
+import numpy as np
 import time
 import collections
 import copy
@@ -65,6 +65,41 @@ def test__RasterSegment_value_access__add():
     test_b.close()
     test_c.close()
 
+def test__RasterSegment_many_access__if():
+    test_a = pygrass.RasterSegment(name="test_a")
+    test_a.open(mode="r")
+
+    test_c = pygrass.RasterSegment(name="test_c")
+    test_c.open(mode="w", mtype="CELL", overwrite=True)
+
+    rows, cols = np.indices((test_a.rows, test_a.cols))
+    order = np.random.permutation(rows.size)
+    rows, cols = rows.ravel()[order], cols.ravel()[order]
+    test_c.put_many(rows, cols, test_a.get_many(rows, cols) > 50)
+
+    test_a.close()
+    test_c.close()
+
+def test__RasterSegment_many_access__add():
+    test_a = pygrass.RasterSegment(name="test_a")
+    test_a.open(mode="r")
+
+    test_b = pygrass.RasterSegment(name="test_b")
+    test_b.open(mode="r")
+
+    test_c = pygrass.RasterSegment(name="test_c")
+    test_c.open(mode="w", mtype="DCELL", overwrite=True)
+
+    rows, cols = np.indices((test_a.rows, test_a.cols))
+    order = np.random.permutation(rows.size)
+    rows, cols = rows.ravel()[order], cols.ravel()[order]
+    test_c.put_many(rows, cols,
+                    test_a.get_many(rows, cols) + test_b.get_many(rows, cols))
+
+    test_a.close()
+    test_b.close()
+    test_c.close()
+
 def test__RasterSegment_row_access__if():
     test_a = pygrass.RasterSegment(name="test_a")
     test_a.open(mode="r")
@@ -227,6 +262,34 @@ def test__RasterRow_row_access__if():
     test_a.close()
     test_c.close()
 
+def test__RasterRow_block_access__add():
+    test_a = pygrass.RasterRow(name="test_a")
+    test_a.open(mode="r")
+
+    test_b = pygrass.RasterRow(name="test_b")
+    test_b.open(mode="r")
+
+    test_c = pygrass.RasterRow(name="test_c")
+    test_c.open(mode="w", mtype="FCELL", overwrite=True)
+
+    test_c.write_block(test_a.read_block() + test_b.read_block())
+
+    test_a.close()
+    test_b.close()
+    test_c.close()
+
+def test__RasterRow_block_access__if():
+    test_a = pygrass.RasterRow(name="test_a")
+    test_a.open(mode="r")
+
+    test_c = pygrass.RasterRow(name="test_c")
+    test_c.open(mode="w", mtype="CELL", overwrite=True)
+
+    test_c.write_block(test_a.read_block() > 50)
+
+    test_a.close()
+    test_c.close()
+
 def test__mapcalc__add():
     core.mapcalc("test_c = test_a + test_b", quite=True, overwrite=True)
 
@@ -2,6 +2,7 @@
 from __future__ import print_function
 
 from os.path import join, exists
+from itertools import repeat
 import grass.lib.gis as libgis
 libgis.G_gisinit('')
 import grass.lib.vector as libvect
@@ -16,6 +17,9 @@ from grass.pygrass.gis import Location
 
 from grass.pygrass.vector.geometry import GEOOBJ as _GEOOBJ
 from grass.pygrass.vector.geometry import read_line, read_next_line
+from grass.pygrass.vector.geometry import AttrsCache
+from grass.pygrass.vector.geometry import Geo as _Geo
+from grass.pygrass.vector.geometry import copy_xyz_to_pnts
 from grass.pygrass.vector.geometry import Area as _Area
 from grass.pygrass.vector.abstract import Info
 from grass.pygrass.vector.basic import Bbox, Cats, Ilist
@@ -64,7 +68,8 @@ class Vector(Info):
         self._topo_level = 1
         self._class_name = 'Vector'
         self.overwrite = False
-        self._cats = []
+        self._cats = set()
+        self._last_cat = None
 
     def __repr__(self):
         if self.exist():
@@ -195,12 +200,9 @@ class Vector(Info):
             attrs = cat
             cat = None
         if attrs and cat is None:
-            # TODO: this does not work as expected when there are
-            # already features in the map when we opened it
-            cat = (self._cats[-1] if self._cats else 0) + 1
+            cat = self._next_cat()
 
-        if cat is not None and cat not in self._cats:
-            self._cats.append(cat)
+        if self._add_cat(cat):
             if self.table is not None and attrs is not None:
                 attr = [cat, ]
                 attr.extend(attrs)
@@ -208,6 +210,108 @@ class Vector(Info):
                 cur.execute(self.table.columns.insert_str, attr)
                 cur.close()
 
+        self._write_geo(geo_obj, cat)
+
+    @must_be_open
+    def write_many(self, geo_objs, cats=None, attrs=None, gtype='point',
+                   chunk=10000):
+        """Write several geometry features and their attributes, the
+        attributes are inserted with ``executemany`` and committed once at
+        the end.
+
+        :param geo_objs: the features to write, geometry GRASS objects or
+                         arrays of coordinates with shape (n, 2) or (n, 3)
+        :type geo_objs: iterable
+        :param cats: the categories of the features, if not given the
+                     categories are generated when attributes are provided
+        :type cats: iterable of integers
+        :param attrs: the values that will be insert in the attribute table,
+                      one tuple for each feature
+        :type attrs: iterable of tuples
+        :param gtype: the feature type of the coordinates arrays, see VTYPE
+        :type gtype: str
+        :param chunk: the number of attribute rows inserted with a single
+                      ``executemany`` call
+        :type chunk: int
+
+            >>> import numpy as np
+            >>> cols = [(u'cat',       'INTEGER PRIMARY KEY'),
+            ...         (u'name',      'TEXT')]
+            >>> new = VectorTopo('newvect_many')
+            >>> new.open('w', tab_name='newvect_many', tab_cols=cols,
+            ...          overwrite=True)
+            >>> coords = np.array([(0, 0), (1, 1), (2, 2)])
+            >>> new.write_many(coords, attrs=[('pub',), ('bar',), ('inn',)])
+            >>> new.table.execute().fetchall()
+            [(1, 'pub'), (2, 'bar'), (3, 'inn')]
+            >>> new.close()
+            >>> new.open(mode='r')
+            >>> new.read(3)
+            Point(2.000000, 2.000000)
+            >>> new.read(3).attrs['name']
+            'inn'
+            >>> new.close()
+            >>> new.remove()
+
+        ..
+        """
+        gtype = VTYPE[gtype] if isinstance(gtype, str) else gtype
+        cats = iter(cats) if cats is not None else repeat(None)
+        attrs = iter(attrs) if attrs is not None else repeat(None)
+        table = self.table
+        cur = table.conn.cursor() if table is not None else None
+        c_points = libvect.Vect_new_line_struct()
+        c_cats = libvect.Vect_new_cats_struct()
+        rows = []
+        try:
+            for geo_obj in geo_objs:
+                cat, attr = next(cats), next(attrs)
+                self.n_lines += 1
+                if attr is not None and cat is None:
+                    cat = self._next_cat()
+                if self._add_cat(cat) and cur is not None and attr is not None:
+                    row = [cat, ]
+                    row.extend(attr)
+                    rows.append(row)
+                    if len(rows) >= chunk:
+                        cur.executemany(table.columns.insert_str, rows)
+                        rows = []
+                if isinstance(geo_obj, _Geo):
+                    self._write_geo(geo_obj, cat)
+                    continue
+                copy_xyz_to_pnts(c_points, geo_obj)
+                libvect.Vect_reset_cats(c_cats)
+                if cat is not None:
+                    libvect.Vect_cat_set(c_cats, self.layer, cat)
+                if libvect.Vect_write_line(self.c_mapinfo, gtype,
+                                           c_points, c_cats) == -1:
+                    raise GrassError("Not able to write the vector feature.")
+            if rows:
+                cur.executemany(table.columns.insert_str, rows)
+            if cur is not None:
+                table.conn.commit()
+        finally:
+            if cur is not None:
+                cur.close()
+            libvect.Vect_destroy_line_struct(c_points)
+            libvect.Vect_destroy_cats_struct(c_cats)
+
+    def _next_cat(self):
+        """Return the category following the last written one."""
+        # TODO: this does not work as expected when there are
+        # already features in the map when we opened it
+        return (self._last_cat if self._last_cat is not None else 0) + 1
+
+    def _add_cat(self, cat):
+        """Record a written category, return True if it is a new one."""
+        if cat is None or cat in self._cats:
+            return False
+        self._cats.add(cat)
+        self._last_cat = cat
+        return True
+
+    def _write_geo(self, geo_obj, cat=None):
+        """Write a geometry object with the given category."""
         if cat is not None:
             cats = Cats(geo_obj.c_cats)
             cats.reset()
@@ -396,7 +500,7 @@ class VectorTopo(Vector):
         return output
 
     @must_be_open
-    def viter(self, vtype, idonly=False):
+    def viter(self, vtype, idonly=False, attrs=None, chunk=10000):
         """Return an iterator of vector features
 
         :param vtype: the name of type to query; the supported values are:
@@ -407,6 +511,16 @@ class VectorTopo(Vector):
         :param idonly: variable to return only the id of features instead of
                        full features
         :type idonly: bool
+        :param attrs: the names of the attribute columns to prefetch, the
+                      attributes of the features are selected with one query
+                      for each chunk of features and the updates of the
+                      attributes are buffered and written with executemany
+                      when the next chunk is loaded, when the iteration ends
+                      or when the ``commit`` method of the attributes is
+                      called
+        :type attrs: list of str
+        :param chunk: the number of features of a chunk
+        :type chunk: int
 
             >>> test_vect = VectorTopo(test_vector_name, mode='r')
             >>> test_vect.open(mode='r')
@@ -433,6 +547,12 @@ class VectorTopo(Vector):
             3
             3
 
+        to read the attributes of many features, prefetch them: ::
+
+            >>> lines = test_vect.viter('lines', attrs=['name', 'value'])
+            >>> [line.attrs['name', 'value'] for line in lines]
+            [('line', 2.0), ('line', 2.0), ('line', 2.0)]
+
             >>> test_vect.close()
         """
         if vtype in _GEOOBJ.keys():
@@ -440,6 +560,9 @@ class VectorTopo(Vector):
                 ids = (indx for indx in range(1, self.number_of(vtype) + 1))
                 if idonly:
                     return ids
+                if attrs is not None and self.table is not None:
+                    return self._viter_attrs(_GEOOBJ[vtype], ids, attrs,
+                                             chunk)
                 return (_GEOOBJ[vtype](v_id=indx, c_mapinfo=self.c_mapinfo,
                                        table=self.table,
                                        writeable=self.writeable)
@@ -448,6 +571,31 @@ class VectorTopo(Vector):
             keys = "', '".join(sorted(_GEOOBJ.keys()))
             raise ValueError("vtype not supported, use one of: '%s'" % keys)
 
+    def _viter_attrs(self, geo, ids, attrs, chunk):
+        """Return an iterator of vector features that share a cache of
+        their attributes, the cache is loaded for each chunk of features"""
+        cache = AttrsCache(self.table, attrs)
+        features = []
+        try:
+            for indx in ids:
+                feature = geo(v_id=indx, c_mapinfo=self.c_mapinfo,
+                              table=self.table, writeable=self.writeable)
+                if feature.attrs is not None:
+                    feature.attrs.cache = cache
+                features.append(feature)
+                if len(features) == chunk:
+                    cache.load([feat.attrs.cat for feat in features
+                                if feat.attrs is not None])
+                    for feat in features:
+                        yield feat
+                    features = []
+            cache.load([feat.attrs.cat for feat in features
+                        if feat.attrs is not None])
+            for feat in features:
+                yield feat
+        finally:
+            cache.flush()
+
     @must_be_open
     def rewind(self):
         """Rewind vector map to cause reads to start at beginning. ::
@@ -135,13 +135,183 @@ def get_xyz(pnt):
     return x, y, z
 
 
+def copy_xyz_to_pnts(c_points, coords):
+    """Copy an array of coordinates into a line_pnts structure, using the
+    ``Vect_copy_xyz_to_pnts`` C function.
+
+    :param c_points: a pointer to a libvect.line_pnts structure
+    :param coords: the coordinates, a sequence or a NumPy array with shape
+                   (n, 2) or (n, 3); a single point with shape (2,) or (3,)
+                   is accepted too
+
+    >>> line = Line()
+    >>> copy_xyz_to_pnts(line.c_points, np.array([(0, 0), (1, 1), (2, 0)]))
+    >>> line
+    Line([Point(0.000000, 0.000000), Point(1.000000, 1.000000), Point(2.000000, 0.000000)])
+
+    """
+    coords = np.asarray(coords, dtype=np.double)
+    if coords.ndim == 1:
+        coords = coords.reshape(1, -1)
+    if coords.ndim != 2 or coords.shape[1] not in (2, 3):
+        str_error = "The the format of the coordinates is not supported: {0!r}"
+        raise ValueError(str_error.format(coords.shape))
+    npnts = coords.shape[0]
+    if npnts == 0:
+        libvect.Vect_reset_line(c_points)
+        return
+    c_double_p = ctypes.POINTER(ctypes.c_double)
+    x = np.ascontiguousarray(coords[:, 0])
+    y = np.ascontiguousarray(coords[:, 1])
+    z = np.ascontiguousarray(coords[:, 2]) if coords.shape[1] == 3 else None
+    if libvect.Vect_copy_xyz_to_pnts(c_points,
+                                     x.ctypes.data_as(c_double_p),
+                                     y.ctypes.data_as(c_double_p),
+                                     (z.ctypes.data_as(c_double_p)
+                                      if z is not None else None),
+                                     npnts) < 0:
+        raise GrassError("Not able to allocate the line points.")
+
+
+def pnts_as_array(c_array, npnts):
+    """Return a NumPy view of a coordinate array of a line_pnts structure,
+    the view shares the memory with the structure, so it is valid only
+    until the structure is modified or free'd.
+
+    :param c_array: the x, y or z pointer of a libvect.line_pnts structure
+    :param npnts: the number of points of the structure
+    :type npnts: int
+
+    >>> line = Line([(0, 0), (1, 1), (2, 0)])
+    >>> pnts_as_array(line.c_points.contents.x, len(line)).tolist()
+    [0.0, 1.0, 2.0]
+
+    """
+    if not npnts:
+        return np.empty(0, dtype=np.double)
+    return np.ctypeslib.as_array(c_array, shape=(npnts, ))
+
+
+class AttrsCache(object):
+    """Cache the attribute table rows of a window of categories and buffer
+    the updates of the attributes, the Attrs objects that share a cache read
+    and write the attribute table with bulk statements.
+
+    >>> from grass.pygrass.vector import VectorTopo
+    >>> test_vect = VectorTopo(test_vector_name)
+    >>> test_vect.open('r')
+    >>> cache = AttrsCache(test_vect.table, ['name', 'value'])
+    >>> cache.load([1, 2])
+    >>> cache.lookup(2, ('name', 'value'))
+    ('line', 2.0)
+    >>> test_vect.close()
+
+    """
+    def __init__(self, table, columns=None):
+        """Constructor
+
+        :param table: the attribute table
+        :type table: a Table object
+        :param columns: the names of the columns to cache, if None all
+                        columns are cached
+        :type columns: list of str
+        """
+        self.table = table
+        key = table.key
+        columns = list(columns) if columns else table.columns.names()
+        self.columns = [key] + [col for col in columns if col != key]
+        self.rows = {}
+        self.updates = {}
+
+    def load(self, cats):
+        """Replace the cached rows with the rows of the given categories,
+        the rows are selected with a single range or IN query. The buffered
+        updates are flushed before.
+
+        :param cats: the categories to load
+        :type cats: list of int
+        """
+        self.flush()
+        cats = sorted(set(cat for cat in cats if cat is not None))
+        self.rows = dict((cat, None) for cat in cats)
+        if not cats:
+            return
+        key = self.table.key
+        # use a range query if the categories are dense
+        if cats[-1] - cats[0] < 2 * len(cats):
+            condition = "%s BETWEEN %d AND %d" % (key, cats[0], cats[-1])
+        else:
+            condition = "%s IN (%s)" % (key,
+                                        ','.join(['%d' % cat for cat in cats]))
+        sqlcode = sql.SELECT_WHERE.format(cols=', '.join(self.columns),
+                                          tname=self.table.name,
+                                          condition=condition)
+        cur = self.table.execute(sqlcode)
+        for row in cur.fetchall():
+            self.rows[row[0]] = tuple(row)
+
+    def lookup(self, cat, keys):
+        """Return the cached values of the columns of a category, None if
+        the table has no row for the category.
+
+        :param cat: the category
+        :type cat: int
+        :param keys: the names of the columns
+        :type keys: tuple of str
+        :raises KeyError: if the category or a column is not cached
+        """
+        row = self.rows[cat]
+        indexes = [self.columns.index(key) for key in keys
+                   if key in self.columns]
+        if len(indexes) != len(keys):
+            raise KeyError(keys)
+        if row is not None:
+            return tuple(row[i] for i in indexes)
+
+    def update(self, cat, keys, values):
+        """Buffer the update of columns of a category, the cached row is
+        updated as well.
+
+        :param cat: the category
+        :type cat: int
+        :param keys: the names of the columns
+        :type keys: tuple of str
+        :param values: the new values of the columns
+        :type values: tuple
+        """
+        keys, values = tuple(keys), tuple(values)
+        self.updates.setdefault(keys, []).append(values + (cat, ))
+        row = self.rows.get(cat)
+        if row is not None:
+            row = list(row)
+            for key, value in zip(keys, values):
+                if key in self.columns:
+                    row[self.columns.index(key)] = value
+            self.rows[cat] = tuple(row)
+
+    def flush(self):
+        """Write the buffered updates to the attribute table, the updates
+        of the same columns are executed with executemany; the changes
+        are not committed."""
+        for keys, values in self.updates.items():
+            # prepare the string using as paramstyle: qmark
+            vals = ','.join(['%s=?' % k for k in keys])
+            sqlcode = sql.UPDATE_WHERE.format(tname=self.table.name,
+                                              values=vals,
+                                              condition="%s=?" %
+                                                        self.table.key)
+            self.table.execute(sqlcode, many=True, values=values)
+        self.updates = {}
+
+
 class Attrs(object):
-    def __init__(self, cat, table, writeable=False):
+    def __init__(self, cat, table, writeable=False, cache=None):
         self._cat = None
         self.cond = ''
         self.table = table
         self.cat = cat
         self.writeable = writeable
+        self.cache = cache
 
     def _get_cat(self):
         return self._cat
@@ -169,6 +339,17 @@ class Attrs(object):
         >>> test_vect.close()
 
         """
+        if self.cache is not None:
+            try:
+                results = self.cache.lookup(self.cat, (keys, ) if
+                                            np.isscalar(keys) else keys)
+            except KeyError:
+                # the table must contain the buffered updates
+                self.cache.flush()
+            else:
+                if results is not None:
+                    return results[0] if len(results) == 1 else results
+                return
         sqlcode = sql.SELECT_WHERE.format(cols=(keys if np.isscalar(keys)
                                                 else ', '.join(keys)),
                                           tname=self.table.name,
@@ -207,6 +388,9 @@ class Attrs(object):
             for key in keys:
                 if key not in self.table.columns:
                     raise KeyError('Column: %s not in table' % key)
+            if self.cache is not None:
+                self.cache.update(self.cat, keys, values)
+                return
             # prepare the string using as paramstyle: qmark
             vals = ','.join(['%s=?' % k for k in keys])
             # "UPDATE {tname} SET {values} WHERE {condition};"
@@ -260,6 +444,8 @@ class Attrs(object):
 
     def commit(self):
         """Save the changes"""
+        if self.cache is not None:
+            self.cache.flush()
         self.table.conn.commit()
 
 
@@ -627,7 +813,20 @@ class Line(Geo):
 
     def __init__(self, points=None, **kargs):
         super(Line, self).__init__(**kargs)
-        if points is not None:
+        if isinstance(points, np.ndarray):
+            copy_xyz_to_pnts(self.c_points, points)
+        elif points is not None:
+            points = list(points)
+            if points and not any(isinstance(pnt, Point) for pnt in points):
+                # copy the coordinate tuples with a single C call
+                try:
+                    coords = np.asarray(points, dtype=np.double)
+                except ValueError:
+                    # tuples with a different number of coordinates
+                    coords = None
+                if coords is not None and coords.ndim == 2:
+                    copy_xyz_to_pnts(self.c_points, coords)
+                    return
             for pnt in points:
                 self.append(pnt)
 
@@ -690,6 +889,45 @@ class Line(Geo):
         """Return the number of points of the line."""
         return self.c_points.contents.n_points
 
+    @property
+    def x(self):
+        """Return a NumPy view of the x coordinates of the line. ::
+
+            >>> line = Line(np.array([(0, 0), (1, 1), (2, 0)]))
+            >>> line.x.tolist()
+            [0.0, 1.0, 2.0]
+            >>> line.x[0] = 10
+            >>> line[0]
+            Point(10.000000, 0.000000)
+
+        The view shares the memory with the line, it is not valid anymore
+        after points are added or removed.
+        """
+        return pnts_as_array(self.c_points.contents.x, self.__len__())
+
+    @property
+    def y(self):
+        """Return a NumPy view of the y coordinates of the line."""
+        return pnts_as_array(self.c_points.contents.y, self.__len__())
+
+    @property
+    def z(self):
+        """Return a NumPy view of the z coordinates of the line."""
+        return pnts_as_array(self.c_points.contents.z, self.__len__())
+
+    @classmethod
+    def from_array(cls, coords, **kargs):
+        """Return a new line filled from an array of coordinates, using a
+        single ``Vect_copy_xyz_to_pnts`` C call. ::
+
+            >>> line = Line.from_array([(0, 0, 1), (1, 1, 2)], is2D=False)
+            >>> line
+            Line([Point(0.000000, 0.000000, 1.000000), Point(1.000000, 1.000000, 2.000000)])
+
+        ..
+        """
+        return cls(points=np.asarray(coords, dtype=np.double), **kargs)
+
     def __str__(self):
         return self.to_wkt()
 
@@ -800,10 +1038,7 @@ class Line(Geo):
             c_points = line.c_points
         else:
             # instantiate a Line object
-            lin = Line()
-            for pnt in line:
-                # add the points to the line
-                lin.append(pnt)
+            lin = Line(line)
             c_points = lin.c_points
 
         libvect.Vect_append_points(self.c_points, c_points, direction)
@@ -1057,7 +1292,7 @@ class Line(Geo):
 
         ..
         """
-        return [pnt.coords() for pnt in self.__iter__()]
+        return [tuple(pnt) for pnt in self.to_array().tolist()]
 
     def to_array(self):
         """Return an array of coordinates. ::
@@ -1071,7 +1306,9 @@ class Line(Geo):
 
         ..
         """
-        return np.array(self.to_list())
+        if self.is2D:
+            return np.column_stack((self.x, self.y))
+        return np.column_stack((self.x, self.y, self.z))
 
     def to_wkt_p(self):
         """Return a Well Known Text string of the line. ::
@@ -1083,8 +1320,8 @@ class Line(Geo):
         ..
         """
         return "LINESTRING(%s)" % ', '.join([
-               ' '.join(['%f' % coord for coord in pnt.coords()])
-               for pnt in self.__iter__()])
+               ' '.join(['%f' % coord for coord in pnt])
+               for pnt in self.to_array().tolist()])
 
     def from_wkt(self, wkt):
         """Create a line reading a WKT string.
@@ -1454,12 +1691,24 @@ class Isle(Geo):
         return bbox
 
     @mapinfo_must_be_set
-    def points(self):
-        """Return a Line object with the outer ring points"""
-        line = Line()
+    def points(self, line=None):
+        """Return a Line object with the outer ring points
+
+        :param line: a Line object to fill with info from points of isle
+        :type line: a Line object
+        """
+        line = Line() if line is None else line
         libvect.Vect_get_isle_points(self.c_mapinfo, self.id, line.c_points)
         return line
 
+    def to_array(self, line=None):
+        """Return an array with the coordinates of the isle ring
+
+        :param line: a Line object used as buffer to read the points
+        :type line: a Line object
+        """
+        return self.points(line).to_array()
+
     def to_wkt(self):
         """Return a Well Known Text string of the isle. ::
 
@@ -1471,7 +1720,7 @@ class Isle(Geo):
 
         return "Polygon((%s))" % ', '.join([
                ' '.join(['%f' % coord for coord in pnt])
-               for pnt in line.to_list()])
+               for pnt in line.to_array().tolist()])
 
     def to_wkb(self):
         """Return a "well know text" (WKB) geometry array. ::
@@ -1605,6 +1854,25 @@ class Area(Geo):
         libvect.Vect_get_area_points(self.c_mapinfo, self.id, line.c_points)
         return line
 
+    @mapinfo_must_be_set
+    def to_array(self, line=None):
+        """Return a tuple with the array of coordinates of the outer ring and
+        a list with the arrays of coordinates of the isles
+
+        :param line: a Line object used as buffer to read the points
+        :type line: a Line object
+        """
+        line = Line() if line is None else line
+        outer = self.points(line).to_array()
+        isles = []
+        for i in range(libvect.Vect_get_area_num_isles(self.c_mapinfo,
+                                                       self.id)):
+            isle_id = libvect.Vect_get_area_isle(self.c_mapinfo, self.id, i)
+            libvect.Vect_get_isle_points(self.c_mapinfo, isle_id,
+                                         line.c_points)
+            isles.append(line.to_array())
+        return outer, isles
+
     @mapinfo_must_be_set
     def centroid(self):
         """Return the centroid
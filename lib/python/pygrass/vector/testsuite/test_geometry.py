@@ -160,6 +160,34 @@ class LineTestCase(TestCase):
         vals = (0.7071067811865475, 0.7071067811865475)
         self.assertTupleEqual(line.point_on_line(1).coords(), vals)
 
+    def test_array(self):
+        """Test the NumPy constructor and accessors"""
+        coords = np.array([(0, 0), (1, 1), (2, 0)], dtype=float)
+        line = Line(coords)
+        self.assertEqual(len(line), 3)
+        self.assertTupleEqual(line[1].coords(), (1, 1))
+        np.testing.assert_array_equal(line.to_array(), coords)
+        np.testing.assert_array_equal(line.x, coords[:, 0])
+        np.testing.assert_array_equal(line.y, coords[:, 1])
+        line.y[2] = 5
+        self.assertTupleEqual(line[2].coords(), (2, 5))
+        line = Line.from_array([(0, 0, 1), (1, 1, 2)], is2D=False)
+        self.assertTupleEqual(line[1].coords(), (1, 1, 2))
+        self.assertListEqual(line.to_list(), [(0, 0, 1), (1, 1, 2)])
+
+    def test_sequence(self):
+        """Test the constructor and extend with sequences of points"""
+        line = Line([(0, 0), (1, 1)])
+        self.assertListEqual(line.to_list(), [(0, 0), (1, 1)])
+        line.extend([(2, 2), (3, 3)])
+        self.assertListEqual(line.to_list(),
+                             [(0, 0), (1, 1), (2, 2), (3, 3)])
+        line = Line([Point(0, 0), (1, 1)])
+        self.assertListEqual(line.to_list(), [(0, 0), (1, 1)])
+        line = Line([(0, 0), (1, 1, 1)])
+        self.assertEqual(len(line), 2)
+        self.assertEqual(len(Line([])), 0)
+
     def test_to_wkt(self):
         """Test to_wkt method"""
         string = 'LINESTRING (0.0000000000000000 0.0000000000000000, 1.0000000000000000 1.0000000000000000)'
@@ -296,6 +324,15 @@ class AreaTestCase(TestCase):
                            "1.0000000000000000 1.0000000000000000))"
         self.assertEqual(area.to_wkt(), string)
 
+    def test_to_array(self):
+        """Test to_array method"""
+        area = Area(v_id=1, c_mapinfo=self.c_mapinfo)
+        outer, isles = area.to_array()
+        np.testing.assert_array_equal(outer, area.points().to_array())
+        self.assertEqual(len(isles), area.num_isles())
+        self.assertTupleEqual(isles[0].shape, (5, 2))
+        np.testing.assert_array_equal(isles[0][0], isles[0][-1])
+
     def test_to_wkb(self):
         """Test to_wkt method"""
         area = Area(v_id=1, c_mapinfo=self.c_mapinfo)
@@ -70,6 +70,26 @@ class GeometryAttrsTestCase(TestCase):
         self.attrs.__setitem__(('name', 'value'), newpairs)
         self.assertEqual(self.attrs['name', 'value'], newpairs)
 
+    def test_viter_attrs(self):
+        """Test the prefetch of the attributes of viter"""
+        lines = list(self.vect.viter('lines', attrs=['name', 'value'],
+                                     chunk=2))
+        self.assertEqual(len(lines), 3)
+        for line in lines:
+            self.assertIsNotNone(line.attrs.cache)
+            self.assertEqual(line.attrs['name'], u'line')
+            self.assertTupleEqual(line.attrs['name', 'value'],
+                                  (u'line', 2.0))
+
+    def test_viter_attrs_setitem(self):
+        """Test the buffered updates of the attributes of viter"""
+        for line in self.vect.viter('lines', attrs=['value'], chunk=2):
+            line.attrs['value'] = 20.
+            self.assertEqual(line.attrs['value'], 20.)
+        line = self.vect.cat(2, 'lines')[0]
+        self.assertEqual(line.attrs['value'], 20.)
+        line.attrs['value'] = 2.
+
 
 if __name__ == '__main__':
     test()
@@ -66,5 +66,28 @@ class VectorTopoTestCase(TestCase):
 
             self.vect.close()
 
+    def test_write_many(self):
+        """Test that write_many write features from coordinates arrays
+        and insert their attributes"""
+        import numpy as np
+        from grass.pygrass.vector.geometry import Point
+        name = "VectorTopoTestCase_write_many"
+        cols = [(u'cat', 'INTEGER PRIMARY KEY'), (u'name', 'TEXT')]
+        coords = np.array([(0, 0), (1, 1), (2, 2)])
+        with VectorTopo(name, mode='w', tab_name=name, tab_cols=cols,
+                        overwrite=True) as vect:
+            vect.write_many(coords, cats=[1, 2, 3],
+                            attrs=[('a',), ('b',), ('c',)])
+            vect.write_many([Point(3, 3)], attrs=[('d',)])
+        try:
+            with VectorTopo(name, mode='r') as vect:
+                self.assertEqual(vect.number_of("points"), 4)
+                self.assertEqual(vect[4], Point(3, 3))
+                self.assertEqual(vect[4].attrs['name'], 'd')
+                self.assertEqual(vect.table.execute().fetchall(),
+                                 [(1, 'a'), (2, 'b'), (3, 'c'), (4, 'd')])
+        finally:
+            self.runModule("g.remove", flags='f', type='vector', name=name)
+
 if __name__ == '__main__':
     test()
@@ -1,6 +1,10 @@
 """
 Functions to use GRASS 2D and 3D rasters with NumPy.
 
+The arrays are read and written in-process through the raster libraries
+when the ctypes bindings are available, otherwise the data are exchanged
+with the r.out.bin/r.in.bin (r3.out.bin/r3.in.bin) modules.
+
 Usage:
 
 >>> from __future__ import print_function
@@ -113,10 +117,11 @@ for details.
 
 from __future__ import absolute_import
 import sys
+import ctypes
 
 import numpy
 
-from .utils import try_remove
+from .utils import try_remove, decode
 from . import core as gcore
 from grass.exceptions import CalledModuleError
 
@@ -132,6 +137,220 @@ class _tempfile(object):
 
 ###############################################################################
 
+# Rows are read and written in-process through libraster when the ctypes
+# bindings are available, r.out.bin/r.in.bin are only used as a fallback.
+_CELL_NULL = -2147483648
+_libs = None
+
+
+def _get_libs():
+    """Return the initialized (libgis, libraster, libraster3d) ctypes
+    modules or None if the in-process backend is not available"""
+    global _libs
+    if _libs is None:
+        try:
+            import grass.lib.gis as libgis
+            import grass.lib.raster as libraster
+            import grass.lib.raster3d as libraster3d
+            libgis.G_gisinit('')
+            _libs = (libgis, libraster, libraster3d)
+        except (ImportError, OSError, AttributeError):
+            _libs = False
+    return _libs if _libs else None
+
+
+def _null_value(null):
+    """Return the value used to replace the null cells (r.out.bin default)"""
+    if null is None:
+        return 0.0
+    return float(null)
+
+
+def _row_type(libraster, dtype):
+    """Return the GRASS type used to read/write the rows of an array of
+    dtype and True if the rows can be exchanged without a copy"""
+    dtype = numpy.dtype(dtype)
+    direct = {numpy.dtype(numpy.int32): libraster.CELL_TYPE,
+              numpy.dtype(numpy.float32): libraster.FCELL_TYPE,
+              numpy.dtype(numpy.float64): libraster.DCELL_TYPE}
+    if dtype in direct and dtype.isnative:
+        return direct[dtype], True
+    if dtype.kind == 'f':
+        return libraster.DCELL_TYPE, False
+    return libraster.CELL_TYPE, False
+
+
+def _set_window(libgis, libraster):
+    """Set the window of the process to the current region"""
+    window = libgis.Cell_head()
+    libgis.G_unset_window()
+    libgis.G_get_window(ctypes.byref(window))
+    libraster.Rast_set_window(ctypes.byref(window))
+
+
+def _read_raster(arr, mapname, null=None):
+    """Read a raster map into the buffer of arr row by row with Rast_get_row
+
+    :return: True on success, False if the map must be read with r.out.bin
+    """
+    libs = _get_libs()
+    if libs is None:
+        return False
+    libgis, libraster, libraster3d = libs
+    mapset = libgis.G_find_raster2(mapname, '')
+    if not mapset:
+        return False
+    mapset = decode(mapset)
+    _set_window(libgis, libraster)
+    rows, cols = libraster.Rast_window_rows(), libraster.Rast_window_cols()
+    if arr.shape != (rows, cols):
+        return False
+
+    null_value = _null_value(null)
+    replace_null = not numpy.isnan(null_value)
+    if arr.dtype.kind not in 'fbiu' or (arr.dtype.kind != 'f' and
+                                        not replace_null):
+        return False
+    gtype, direct = _row_type(libraster, arr.dtype)
+    if direct:
+        rowbuf = None
+    else:
+        rowbuf = numpy.empty((cols,), dtype=numpy.int32
+                             if gtype == libraster.CELL_TYPE
+                             else numpy.float64)
+
+    fd = libraster.Rast_open_old(mapname, mapset)
+    try:
+        for row in range(rows):
+            out = arr[row] if direct else rowbuf
+            libraster.Rast_get_row(fd, ctypes.c_void_p(out.ctypes.data),
+                                   row, gtype)
+            if replace_null:
+                if gtype == libraster.CELL_TYPE:
+                    out[out == _CELL_NULL] = null_value
+                else:
+                    out[numpy.isnan(out)] = null_value
+            if not direct:
+                arr[row] = out
+    finally:
+        libraster.Rast_close(fd)
+    return True
+
+
+def _write_raster(arr, mapname, title=None, null=None, overwrite=None):
+    """Write the buffer of arr row by row into a raster map with
+    Rast_put_row
+
+    :return: True on success, False if the map must be written with r.in.bin
+    """
+    libs = _get_libs()
+    if libs is None:
+        return False
+    libgis, libraster, libraster3d = libs
+    if overwrite is None:
+        overwrite = gcore.overwrite()
+    if libgis.G_legal_filename(mapname) != 1:
+        return False
+    if not overwrite and libgis.G_find_raster2(mapname, gcore.gisenv()['MAPSET']):
+        return False
+    _set_window(libgis, libraster)
+    rows, cols = libraster.Rast_window_rows(), libraster.Rast_window_cols()
+    if arr.shape != (rows, cols):
+        return False
+
+    kind = arr.dtype.kind
+    if kind == 'f':
+        gtype = (libraster.FCELL_TYPE if arr.dtype.itemsize == 4
+                 else libraster.DCELL_TYPE)
+        buftype = numpy.float32 if arr.dtype.itemsize == 4 else numpy.float64
+    else:
+        gtype, buftype = libraster.CELL_TYPE, numpy.int32
+    direct = null is None and arr.dtype == buftype and arr.dtype.isnative
+    rowbuf = None if direct else numpy.empty((cols,), dtype=buftype)
+    null_value = None if null is None else float(null)
+
+    fd = libraster.Rast_open_new(mapname, gtype)
+    try:
+        for row in range(rows):
+            if direct:
+                out = arr[row]
+            else:
+                out = rowbuf
+                out[:] = arr[row]
+                if null_value is not None and not numpy.isnan(null_value):
+                    mask = arr[row] == null_value
+                    out[mask] = (_CELL_NULL if gtype == libraster.CELL_TYPE
+                                 else numpy.nan)
+            libraster.Rast_put_row(fd, ctypes.c_void_p(out.ctypes.data), gtype)
+    finally:
+        libraster.Rast_close(fd)
+
+    if title:
+        libraster.Rast_put_cell_title(mapname, title)
+    hist = libraster.History()
+    libraster.Rast_short_history(mapname, 'raster', ctypes.byref(hist))
+    libraster.Rast_write_history(mapname, ctypes.byref(hist))
+    return True
+
+
+def _read_raster3d(arr, mapname, null=None):
+    """Read a 3D raster map into the buffer of arr one depth at a time
+    with Rast3d_get_block
+
+    :return: True on success, False if the map must be read with r3.out.bin
+    """
+    libs = _get_libs()
+    if libs is None:
+        return False
+    libgis, libraster, libraster3d = libs
+    mapset = libgis.G_find_raster3d(mapname, '')
+    if not mapset:
+        return False
+    mapset = decode(mapset)
+    libraster3d.Rast3d_init_defaults()
+    region = libraster3d.RASTER3D_Region()
+    libgis.G_unset_window()
+    libraster3d.Rast3d_read_window(ctypes.byref(region), None)
+    depths, rows, cols = region.depths, region.rows, region.cols
+    if arr.shape != (depths, rows, cols):
+        return False
+
+    null_value = _null_value(null)
+    replace_null = not numpy.isnan(null_value)
+    if arr.dtype.kind not in 'fbiu' or (arr.dtype.kind != 'f' and
+                                        not replace_null):
+        return False
+    gtype, direct = _row_type(libraster, arr.dtype)
+    if gtype == libraster.CELL_TYPE:
+        # 3D rasters are always floating point
+        gtype, direct = libraster.DCELL_TYPE, False
+    if direct:
+        slab = None
+    else:
+        slab = numpy.empty((rows, cols), dtype=numpy.float64)
+
+    map3d = libraster3d.Rast3d_open_cell_old(
+        mapname, mapset, ctypes.byref(region),
+        libraster3d.RASTER3D_TILE_SAME_AS_FILE,
+        libraster3d.RASTER3D_USE_CACHE_DEFAULT)
+    if not map3d:
+        return False
+    try:
+        for depth in range(depths):
+            out = arr[depth] if direct else slab
+            libraster3d.Rast3d_get_block(map3d, 0, 0, depth, cols, rows, 1,
+                                         ctypes.c_void_p(out.ctypes.data),
+                                         gtype)
+            if replace_null:
+                out[numpy.isnan(out)] = null_value
+            if not direct:
+                arr[depth] = out
+    finally:
+        libraster3d.Rast3d_close(map3d)
+    return True
+
+###############################################################################
+
 class array(numpy.memmap):
     def __new__(cls, mapname=None, null=None, dtype=numpy.double):
         """Define new numpy array
@@ -145,7 +364,14 @@ class array(numpy.memmap):
         shape = (r, c)
 
         tempfile = _tempfile()
-        if mapname:
+        self = numpy.memmap.__new__(
+            cls,
+            filename=tempfile.filename,
+            dtype=dtype,
+            mode='r+',
+            shape=shape)
+
+        if mapname and not _read_raster(self, mapname, null):
             kind = numpy.dtype(dtype).kind
             size = numpy.dtype(dtype).itemsize
 
@@ -159,6 +385,8 @@ class array(numpy.memmap):
             if size not in [1, 2, 4, 8]:
                 raise ValueError(_('Invalid size <%d>') % size)
 
+            # the file is rewritten by r.out.bin, so it is mapped again
+            del self
             gcore.run_command(
                 'r.out.bin',
                 flags=flags,
@@ -169,12 +397,12 @@ class array(numpy.memmap):
                 quiet=True,
                 overwrite=True)
 
-        self = numpy.memmap.__new__(
-            cls,
-            filename=tempfile.filename,
-            dtype=dtype,
-            mode='r+',
-            shape=shape)
+            self = numpy.memmap.__new__(
+                cls,
+                filename=tempfile.filename,
+                dtype=dtype,
+                mode='r+',
+                shape=shape)
 
         self.tempfile = tempfile
         self.filename = tempfile.filename
@@ -193,6 +421,8 @@ class array(numpy.memmap):
         Instead reading the map after creating the array,
         pass the map name in the array constructor.
         """
+        if _read_raster(self, mapname, null):
+            return 0
         if sys.platform == 'win32':
             gcore.warning(_("grass.script.array.read is deprecated and does not"
                             " work on MS Windows, pass raster name in the constructor"))
@@ -253,6 +483,10 @@ class array(numpy.memmap):
         else:
             raise ValueError(_('Invalid kind <%s>') % kind)
 
+        if _write_raster(self, mapname, title=title, null=null,
+                         overwrite=overwrite):
+            return 0
+
         reg = gcore.region()
 
         try:
@@ -294,10 +528,17 @@ class array3d(numpy.memmap):
         shape = (d, r, c)
 
         tempfile = _tempfile()
-        if mapname:
+        self = numpy.memmap.__new__(
+            cls,
+            filename=tempfile.filename,
+            dtype=dtype,
+            mode='r+',
+            shape=shape)
+
+        if mapname and not _read_raster3d(self, mapname, null):
             kind = numpy.dtype(dtype).kind
             size = numpy.dtype(dtype).itemsize
-    
+
             if kind == 'f':
                 flags = None # default is double
             elif kind in 'biu':
@@ -308,6 +549,8 @@ class array3d(numpy.memmap):
             if size not in [1, 2, 4, 8]:
                 raise ValueError(_('Invalid size <%d>') % size)
 
+            # the file is rewritten by r3.out.bin, so it is mapped again
+            del self
             gcore.run_command(
                 'r3.out.bin',
                 flags=flags,
@@ -318,12 +561,12 @@ class array3d(numpy.memmap):
                 quiet=True,
                 overwrite=True)
 
-        self = numpy.memmap.__new__(
-            cls,
-            filename=tempfile.filename,
-            dtype=dtype,
-            mode='r+',
-            shape=shape)
+            self = numpy.memmap.__new__(
+                cls,
+                filename=tempfile.filename,
+                dtype=dtype,
+                mode='r+',
+                shape=shape)
 
         self.tempfile = tempfile
         self.filename = tempfile.filename
@@ -343,6 +586,8 @@ class array3d(numpy.memmap):
         Instead reading the map after creating the array,
         pass the map name in the array constructor.
         """
+        if _read_raster3d(self, mapname, null):
+            return 0
         if sys.platform == 'win32':
             gcore.warning(_("grass.script.array3d.read is deprecated and does not"
                             " work on MS Windows, pass 3D raster name in the constructor"))
@@ -20,6 +20,8 @@ for details.
 import re
 import sys
 import string
+import hashlib
+from collections import OrderedDict
 
 if sys.version_info.major == 3:
     unicode = str
@@ -36,7 +38,7 @@ if hasattr(etree, 'ParseError'):
 else:
     ETREE_EXCEPTIONS = (expat.ExpatError)
 
-from .utils import encode, decode, split
+from .utils import encode, decode, split, try_remove
 from .core import *
 
 
@@ -462,6 +464,112 @@ def convert_xml_to_utf8(xml_text):
     return xml_text_utf8
 
 
+# Version of the format of the interface description cache,
+# increase it when the content of the cached files changes
+INTERFACE_CACHE_VERSION = 1
+# Maximum number of interface descriptions kept in memory
+INTERFACE_CACHE_SIZE = 128
+
+_interface_cache = OrderedDict()
+
+
+def _get_interface_cache_dir():
+    """Return the directory of the on-disk interface description cache
+    or None if the cache is disabled with GRASS_INTERFACE_CACHE=0
+    """
+    cache_dir = os.getenv('GRASS_INTERFACE_CACHE')
+    if cache_dir == '0':
+        return None
+    if cache_dir:
+        return cache_dir
+    if sys.platform == 'win32':
+        if not os.getenv('APPDATA'):
+            return None
+        config_dir = os.path.join(os.getenv('APPDATA'), 'GRASS7')
+    else:
+        if not os.getenv('HOME'):
+            return None
+        config_dir = os.path.join(os.getenv('HOME'), '.grass7')
+    return os.path.join(config_dir, 'cache', 'interface')
+
+
+def _get_interface_cache_key(cmd):
+    """Return the key of the interface description of cmd, built from the
+    path and the modification time of the executable, the GRASS version
+    and the language of the messages, or None if the executable is not found
+    """
+    path = shutil_which(get_real_command(cmd))
+    if path is None:
+        if not os.path.isfile(cmd):
+            return None
+        path = cmd
+    path = os.path.abspath(path)
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    key = [str(INTERFACE_CACHE_VERSION), path, repr(stat.st_mtime),
+           str(stat.st_size), os.getenv('GRASS_VERSION', ''),
+           os.getenv('GISBASE', '')]
+    key.extend(os.getenv(var, '') for var in ('LANGUAGE', 'LC_ALL',
+                                                'LC_MESSAGES', 'LANG'))
+    return hashlib.sha1(encode('\n'.join(key))).hexdigest()
+
+
+def _read_interface_cache(key):
+    """Return the cached interface description or None"""
+    if key in _interface_cache:
+        desc = _interface_cache.pop(key)
+        _interface_cache[key] = desc
+        return desc
+    cache_dir = _get_interface_cache_dir()
+    if cache_dir is None:
+        return None
+    try:
+        with open(os.path.join(cache_dir, key + '.xml'), 'rb') as cache:
+            desc = cache.read()
+    except (IOError, OSError):
+        return None
+    _write_interface_cache(key, desc, disk=False)
+    return desc
+
+
+def _write_interface_cache(key, desc, disk=True):
+    """Store the interface description in the cache, errors writing the
+    on-disk cache are ignored"""
+    _interface_cache[key] = desc
+    while len(_interface_cache) > INTERFACE_CACHE_SIZE:
+        _interface_cache.popitem(last=False)
+    cache_dir = _get_interface_cache_dir()
+    if not disk or cache_dir is None:
+        return
+    filename = os.path.join(cache_dir, key + '.xml')
+    tmpname = '%s.%d.tmp' % (filename, os.getpid())
+    try:
+        if not os.path.isdir(cache_dir):
+            os.makedirs(cache_dir)
+        with open(tmpname, 'wb') as cache:
+            cache.write(desc)
+        # rename is atomic, concurrent processes never read partial files
+        os.rename(tmpname, filename)
+    except (IOError, OSError):
+        try_remove(tmpname)
+
+
+def clear_interface_cache(disk=False):
+    """Empty the in-memory interface description cache and optionally
+    remove the on-disk cache files
+
+    :param bool disk: True to remove also the on-disk cache
+    """
+    _interface_cache.clear()
+    cache_dir = _get_interface_cache_dir()
+    if disk and cache_dir and os.path.isdir(cache_dir):
+        for name in os.listdir(cache_dir):
+            if name.endswith('.xml'):
+                try_remove(os.path.join(cache_dir, name))
+
+
 def get_interface_description(cmd):
     """Returns the XML description for the GRASS cmd (force text encoding to
     "utf-8").
@@ -469,8 +577,28 @@ def get_interface_description(cmd):
     The DTD must be located in $GISBASE/gui/xml/grass-interface.dtd,
     otherwise the parser will not succeed.
 
+    The descriptions are cached in memory and on disk (in the GRASS
+    configuration directory or in the directory set by the
+    GRASS_INTERFACE_CACHE variable, 0 disables it), keyed on the path and
+    modification time of the module, the GRASS version and the language,
+    so the module is run only when the description is not known.
+
     :param cmd: command (name of GRASS module)
     """
+    key = _get_interface_cache_key(cmd)
+    if key is not None:
+        desc = _read_interface_cache(key)
+        if desc is not None:
+            return desc
+    desc = _get_interface_description(cmd)
+    if key is not None:
+        _write_interface_cache(key, desc)
+    return desc
+
+
+def _get_interface_description(cmd):
+    """Run cmd with --interface-description and return the XML description
+    (see get_interface_description)"""
     try:
         p = Popen([encode(cmd), b'--interface-description'], stdout=PIPE,
                   stderr=PIPE)
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the in-process raster access of grass.script.array
+"""
+
+import numpy
+
+from grass.gunittest.case import TestCase
+from grass.gunittest.main import test
+
+from grass.script import array as garray
+
+
+class TestArray(TestCase):
+    """Test reading and writing 2D arrays"""
+
+    raster = 'testarray_input'
+    output = 'testarray_output'
+
+    @classmethod
+    def setUpClass(cls):
+        cls.use_temp_region()
+        cls.runModule("g.region", n=40, s=0, e=60, w=0, res=10)
+        cls.runModule("r.mapcalc", overwrite=True,
+                      expression="%s = if(row() == 2, null(), row() + 10 * col())" % cls.raster)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.runModule("g.remove", type='raster', flags='f',
+                      name=[cls.raster, cls.output])
+        cls.del_temp_region()
+
+    def test_read(self):
+        """Test that the values and the nulls are read row by row"""
+        arr = garray.array(self.raster, null=-1)
+        self.assertEqual(arr.shape, (4, 6))
+        self.assertEqual(arr[0, 0], 11)
+        self.assertEqual(arr[3, 5], 64)
+        self.assertTrue((arr[1] == -1).all())
+
+    def test_read_dtype(self):
+        """Test reading into an array of a non GRASS type"""
+        arr = garray.array(self.raster, dtype=numpy.int16)
+        self.assertEqual(arr.dtype, numpy.int16)
+        self.assertEqual(arr[2, 3], 43)
+        self.assertTrue((arr[1] == 0).all())
+
+    def test_write(self):
+        """Test that the array is written with nulls"""
+        arr = garray.array(self.raster, null=-1)
+        arr *= 2
+        self.assertEqual(arr.write(self.output, null=-2, overwrite=True), 0)
+        self.assertRasterFitsUnivar(self.output, reference=dict(n=18,
+                                                                min=22,
+                                                                max=128))
+        arr2 = garray.array(self.output)
+        self.assertTrue(numpy.allclose(arr2[0], arr[0]))
+
+
+if __name__ == '__main__':
+    test()
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the interface description cache of grass.script.task
+"""
+import os
+import shutil
+import tempfile
+
+from grass.gunittest.case import TestCase
+from grass.gunittest.main import test
+
+from grass.script import task as gtask
+
+
+class TestInterfaceCache(TestCase):
+    """Test the in-memory and on-disk interface description cache"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.cache_dir = tempfile.mkdtemp()
+        cls.old_cache = os.environ.get('GRASS_INTERFACE_CACHE')
+        os.environ['GRASS_INTERFACE_CACHE'] = cls.cache_dir
+
+    @classmethod
+    def tearDownClass(cls):
+        if cls.old_cache is None:
+            del os.environ['GRASS_INTERFACE_CACHE']
+        else:
+            os.environ['GRASS_INTERFACE_CACHE'] = cls.old_cache
+        gtask.clear_interface_cache()
+        shutil.rmtree(cls.cache_dir)
+
+    def setUp(self):
+        gtask.clear_interface_cache(disk=True)
+        self.original = gtask._get_interface_description
+
+    def tearDown(self):
+        gtask._get_interface_description = self.original
+
+    def _forbid_module_run(self):
+        def fail(cmd):
+            raise AssertionError("%s was run" % cmd)
+        gtask._get_interface_description = fail
+
+    def test_memory_cache(self):
+        desc = gtask.get_interface_description('g.region')
+        self._forbid_module_run()
+        self.assertEqual(gtask.get_interface_description('g.region'), desc)
+
+    def test_disk_cache(self):
+        desc = gtask.get_interface_description('g.region')
+        self.assertEqual(len(os.listdir(self.cache_dir)), 1)
+        gtask.clear_interface_cache()
+        self._forbid_module_run()
+        self.assertEqual(gtask.get_interface_description('g.region'), desc)
+        task = gtask.parse_interface('g.region')
+        self.assertEqual(task.name, 'g.region')
+
+
+if __name__ == '__main__':
+    test()
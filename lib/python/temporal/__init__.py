@@ -6,6 +6,7 @@ from .spatial_extent import *
 from .metadata import *
 from .abstract_dataset import *
 from .abstract_map_dataset import *
+from .map_list import *
 from .abstract_space_time_dataset import *
 from .space_time_datasets import *
 from .datetime_math import *
@@ -371,13 +371,67 @@ class AbstractDataset(SpatialTopologyDatasetConnector,
     def delete(self):
         """Delete dataset from database if it exists"""
 
-    def insert(self, dbif=None, execute=True):
+    def get_insert_statement_list(self):
+        """Return the SQL insert statements of the dataset
+
+           :return: A list of tuples with the SQL statement and its
+                    arguments, that can be executed with
+                    dbif.execute_batch()
+        """
+        statements = [self.base.get_insert_statement(),
+                      self.temporal_extent.get_insert_statement(),
+                      self.spatial_extent.get_insert_statement(),
+                      self.metadata.get_insert_statement()]
+        if self.is_stds() is False:
+            statements.append(self.stds_register.get_insert_statement())
+        return statements
+
+    def get_update_statement_list(self, ident=None):
+        """Return the SQL update statements of the dataset excluding
+           None variables
+
+           :param ident: The identifier to be updated, useful for renaming
+           :return: A list of tuples with the SQL statement and its
+                    arguments, that can be executed with
+                    dbif.execute_batch()
+        """
+        statements = [self.base.get_update_statement(ident),
+                      self.temporal_extent.get_update_statement(ident),
+                      self.spatial_extent.get_update_statement(ident),
+                      self.metadata.get_update_statement(ident)]
+        if self.is_stds() is False:
+            statements.append(self.stds_register.get_update_statement(ident))
+        return statements
+
+    def get_update_all_statement_list(self, ident=None):
+        """Return the SQL update statements of the dataset including
+           None variables
+
+           :param ident: The identifier to be updated, useful for renaming
+           :return: A list of tuples with the SQL statement and its
+                    arguments, that can be executed with
+                    dbif.execute_batch()
+        """
+        statements = [self.base.get_update_all_statement(ident),
+                      self.temporal_extent.get_update_all_statement(ident),
+                      self.spatial_extent.get_update_all_statement(ident),
+                      self.metadata.get_update_all_statement(ident)]
+        if self.is_stds() is False:
+            statements.append(
+                self.stds_register.get_update_all_statement(ident))
+        return statements
+
+    def insert(self, dbif=None, execute=True, mogrify=True):
         """Insert dataset into database
 
            :param dbif: The database interface to be used
            :param execute: If True the SQL statements will be executed.
                            If False the prepared SQL statements are returned
                            and must be executed by the caller.
+           :param mogrify: If False and execute is False, the SQL statements
+                           are returned as list of tuples with the SQL
+                           statement and its arguments, that can be
+                           executed with dbif.execute_batch()
            :return: The SQL insert statement in case execute=False, or an
                     empty string otherwise
         """
@@ -391,6 +445,17 @@ class AbstractDataset(SpatialTopologyDatasetConnector,
 
         dbif, connected = init_dbif(dbif)
 
+        if execute:
+            dbif.execute_batch(self.get_insert_statement_list())
+            if connected:
+                dbif.close()
+            return ""
+
+        if not mogrify:
+            if connected:
+                dbif.close()
+            return self.get_insert_statement_list()
+
         # Build the INSERT SQL statement
         statement = self.base.get_insert_statement_mogrified(dbif)
         statement += self.temporal_extent.get_insert_statement_mogrified(dbif)
@@ -399,17 +464,12 @@ class AbstractDataset(SpatialTopologyDatasetConnector,
         if self.is_stds() is False:
             statement += self.stds_register.get_insert_statement_mogrified(dbif)
 
-        if execute:
-            dbif.execute_transaction(statement)
-            if connected:
-                dbif.close()
-            return ""
-
         if connected:
             dbif.close()
         return statement
 
-    def update(self, dbif=None, execute=True, ident=None):
+    def update(self, dbif=None, execute=True, ident=None,
+               mogrify=True):
         """Update the dataset entry in the database from the internal structure
            excluding None variables
 
@@ -417,6 +477,10 @@ class AbstractDataset(SpatialTopologyDatasetConnector,
            :param execute: If True the SQL statements will be executed.
                            If False the prepared SQL statements are returned
                            and must be executed by the caller.
+           :param mogrify: If False and execute is False, the SQL statements
+                           are returned as list of tuples with the SQL
+                           statement and its arguments, that can be
+                           executed with dbif.execute_batch()
            :param ident: The identifier to be updated, useful for renaming
            :return: The SQL update statement in case execute=False, or an
                     empty string otherwise
@@ -431,6 +495,17 @@ class AbstractDataset(SpatialTopologyDatasetConnector,
 
         dbif, connected = init_dbif(dbif)
 
+        if execute:
+            dbif.execute_batch(self.get_update_statement_list(ident))
+            if connected:
+                dbif.close()
+            return ""
+
+        if not mogrify:
+            if connected:
+                dbif.close()
+            return self.get_update_statement_list(ident)
+
         # Build the UPDATE SQL statement
         statement = self.base.get_update_statement_mogrified(dbif, ident)
         statement += self.temporal_extent.get_update_statement_mogrified(dbif,
@@ -442,17 +517,12 @@ class AbstractDataset(SpatialTopologyDatasetConnector,
         if self.is_stds() is False:
             statement += self.stds_register.get_update_statement_mogrified(dbif, ident)
 
-        if execute:
-            dbif.execute_transaction(statement)
-            if connected:
-                dbif.close()
-            return ""
-
         if connected:
             dbif.close()
         return statement
 
-    def update_all(self, dbif=None, execute=True, ident=None):
+    def update_all(self, dbif=None, execute=True, ident=None,
+                   mogrify=True):
         """Update the dataset entry in the database from the internal structure
            and include None variables.
 
@@ -460,6 +530,10 @@ class AbstractDataset(SpatialTopologyDatasetConnector,
            :param execute: If True the SQL statements will be executed.
                            If False the prepared SQL statements are returned
                            and must be executed by the caller.
+           :param mogrify: If False and execute is False, the SQL statements
+                           are returned as list of tuples with the SQL
+                           statement and its arguments, that can be
+                           executed with dbif.execute_batch()
            :param ident: The identifier to be updated, useful for renaming
            :return: The SQL update statement in case execute=False, or an
                     empty string otherwise
@@ -474,6 +548,17 @@ class AbstractDataset(SpatialTopologyDatasetConnector,
 
         dbif, connected = init_dbif(dbif)
 
+        if execute:
+            dbif.execute_batch(self.get_update_all_statement_list(ident))
+            if connected:
+                dbif.close()
+            return ""
+
+        if not mogrify:
+            if connected:
+                dbif.close()
+            return self.get_update_all_statement_list(ident)
+
         # Build the UPDATE SQL statement
         statement = self.base.get_update_all_statement_mogrified(dbif, ident)
         statement += self.temporal_extent.get_update_all_statement_mogrified(dbif,
@@ -486,12 +571,6 @@ class AbstractDataset(SpatialTopologyDatasetConnector,
         if self.is_stds() is False:
             statement += self.stds_register.get_update_all_statement_mogrified(dbif, ident)
 
-        if execute:
-            dbif.execute_transaction(statement)
-            if connected:
-                dbif.close()
-            return ""
-
         if connected:
             dbif.close()
         return statement
@@ -93,11 +93,14 @@ class AbstractMapDataset(AbstractDataset):
         """
 
     @abstractmethod
-    def read_timestamp_from_grass(self):
+    def read_timestamp_from_grass(self, timestamp=None):
         """Read the timestamp of this map from the map metadata
            in the grass file system based spatial database and
            set the internal time stamp that should be insert/updated
            in the temporal database.
+
+           :param timestamp: An already read timestamp tuple (check, dates),
+                             if None the timestamp is read from the map
         """
 
     @abstractmethod
@@ -114,9 +117,13 @@ class AbstractMapDataset(AbstractDataset):
         """
 
     @abstractmethod
-    def load(self):
+    def load(self, kvp=None):
         """Load the content of this object from the grass
-           file system based database"""
+           file system based database
+
+           :param kvp: Already read key value pairs of the map info,
+                       if None the info is read from the map
+        """
 
     def _convert_timestamp(self):
         """Convert the valid time into a grass datetime library
@@ -261,7 +268,7 @@ class AbstractMapDataset(AbstractDataset):
         if self.is_topology_build():
             self.print_topology_shell_info()
 
-    def insert(self, dbif=None, execute=True):
+    def insert(self, dbif=None, execute=True, mogrify=True):
         """Insert the map content into the database from the internal
            structure
 
@@ -275,14 +282,18 @@ class AbstractMapDataset(AbstractDataset):
            :param execute: If True the SQL statements will be executed.
                            If False the prepared SQL statements are
                            returned and must be executed by the caller.
+           :param mogrify: If False and execute is False, the SQL statements
+                           are returned as list of tuples with the SQL
+                           statement and its arguments
            :return: The SQL insert statement in case execute=False, or an
                     empty string otherwise
         """
         if get_enable_timestamp_write():
             self.write_timestamp_to_grass()
-        return AbstractDataset.insert(self, dbif=dbif, execute=execute)
+        return AbstractDataset.insert(self, dbif=dbif, execute=execute,
+                                      mogrify=mogrify)
 
-    def update(self, dbif=None, execute=True):
+    def update(self, dbif=None, execute=True, mogrify=True):
         """Update the map content in the database from the internal structure
            excluding None variables
 
@@ -294,14 +305,17 @@ class AbstractMapDataset(AbstractDataset):
            :param execute: If True the SQL statements will be executed.
                            If False the prepared SQL statements are
                            returned and must be executed by the caller.
+           :param mogrify: If False and execute is False, the SQL statements
+                           are returned as list of tuples with the SQL
+                           statement and its arguments
            :return: The SQL insert statement in case execute=False, or an
                     empty string otherwise
         """
         if get_enable_timestamp_write():
             self.write_timestamp_to_grass()
-        return AbstractDataset.update(self, dbif, execute)
+        return AbstractDataset.update(self, dbif, execute, mogrify=mogrify)
 
-    def update_all(self, dbif=None, execute=True):
+    def update_all(self, dbif=None, execute=True, mogrify=True):
         """Update the map content in the database from the internal structure
            including None variables
 
@@ -313,13 +327,17 @@ class AbstractMapDataset(AbstractDataset):
            :param execute: If True the SQL statements will be executed.
                            If False the prepared SQL statements are
                            returned and must be executed by the caller.
+           :param mogrify: If False and execute is False, the SQL statements
+                           are returned as list of tuples with the SQL
+                           statement and its arguments
            :return: The SQL insert statement in case execute=False, or an
                     empty string otherwise
 
         """
         if get_enable_timestamp_write():
             self.write_timestamp_to_grass()
-        return AbstractDataset.update_all(self, dbif, execute)
+        return AbstractDataset.update_all(self, dbif, execute,
+                                          mogrify=mogrify)
 
     def set_time_to_absolute(self):
         """Set the temporal type to absolute"""
@@ -940,15 +958,25 @@ class AbstractMapDataset(AbstractDataset):
 
         return statement
 
-    def get_registered_stds(self, dbif=None):
+    def get_registered_stds(self, dbif=None, select=True):
         """Return all space time dataset ids in which this map is registered
            as as a list of strings, or None if this map is not
            registered in any space time dataset.
 
            :param dbif: The database interface to be used
+           :param select: If False the stds register content of this
+                          object is used, that must have been selected
+                          beforehand
            :return: A list of ids of all space time datasets in
                         which this map is registered
         """
+        if select is False:
+            datasets = self.stds_register.get_registered_stds()
+            if datasets is not None and datasets != "" and \
+               datasets.find("@") >= 0:
+                return datasets.split(",")
+            return None
+
         dbif, connected = init_dbif(dbif)
 
         self.stds_register.select(dbif)
@@ -21,11 +21,12 @@ from .core import init_dbif, get_sql_template_path, get_tgis_metadata, get_curre
     get_enable_mapset_check
 from .abstract_dataset import AbstractDataset, AbstractDatasetComparisonKeyStartTime
 from .temporal_granularity import check_granularity_string, compute_absolute_time_granularity,\
-    compute_relative_time_granularity
+    compute_relative_time_granularity, gran_singular_unit, gcd
 from .spatio_temporal_relationships import count_temporal_topology_relationships, \
-    print_spatio_temporal_topology_relationships, SpatioTemporalTopologyBuilder, \
+    print_spatio_temporal_topology_relationships, SweepLineTopologyBuilder, \
     create_temporal_relation_sql_where_statement
 from .datetime_math import increment_datetime_by_string, string_to_datetime
+from .map_list import MapList
 
 ###############################################################################
 
@@ -403,13 +404,17 @@ class AbstractSpaceTimeDataset(AbstractDataset):
            - invalid  -> No valid time point or interval found
 
            :param maps: A sorted (start_time) list of AbstractDataset objects
+                        or a MapList
            :param dbif: The database interface to be used
         """
 
         if maps is None:
-            maps = self.get_registered_maps_as_objects(
+            maps = self.get_registered_maps_as_map_list(
                 where=None, order="start_time", dbif=dbif)
 
+        if isinstance(maps, MapList):
+            return maps.count_temporal_types()
+
         time_invalid = 0
         time_point = 0
         time_interval = 0
@@ -439,14 +444,18 @@ class AbstractSpaceTimeDataset(AbstractDataset):
         """Count the number of gaps between temporal neighbors
 
            :param maps: A sorted (start_time) list of AbstractDataset objects
+                        or a MapList
            :param dbif: The database interface to be used
            :return: The numbers of gaps between temporal neighbors
         """
 
         if maps is None:
-            maps = self.get_registered_maps_as_objects(
+            maps = self.get_registered_maps_as_map_list(
                 where=None, order="start_time", dbif=dbif)
 
+        if isinstance(maps, MapList):
+            return maps.count_gaps()
+
         gaps = 0
 
         # Check for gaps
@@ -473,7 +482,7 @@ class AbstractSpaceTimeDataset(AbstractDataset):
         """
 
         if maps is None:
-            maps = self.get_registered_maps_as_objects(
+            maps = self.get_registered_maps_as_map_list(
                 where=None, order="start_time", dbif=dbif)
 
         print_spatio_temporal_topology_relationships(maps1=maps, maps2=maps,
@@ -493,7 +502,7 @@ class AbstractSpaceTimeDataset(AbstractDataset):
         """
 
         if maps is None:
-            maps = self.get_registered_maps_as_objects(
+            maps = self.get_registered_maps_as_map_list(
                 where=None, order="start_time", dbif=dbif)
 
         return count_temporal_topology_relationships(maps1=maps, dbif=dbif)
@@ -532,7 +541,7 @@ class AbstractSpaceTimeDataset(AbstractDataset):
            :return: True if topology is correct
         """
         if maps is None:
-            maps = self.get_registered_maps_as_objects(
+            maps = self.get_registered_maps_as_map_list(
                 where=None, order="start_time", dbif=dbif)
 
         relations = count_temporal_topology_relationships(maps1=maps,
@@ -729,14 +738,15 @@ class AbstractSpaceTimeDataset(AbstractDataset):
 
         #  print(relations)
 
-        tb = SpatioTemporalTopologyBuilder()
+        tb = SweepLineTopologyBuilder()
         if spatial:
             spatial = "2D"
         else:
             spatial = None
 
-        mapsA = self.get_registered_maps_as_objects(dbif=dbif)
-        mapsB = stds.get_registered_maps_as_objects_with_gaps(dbif=dbif)
+        mapsA = self.get_registered_maps_as_map_list(dbif=dbif)
+        mapsB = stds.get_registered_maps_as_map_list(
+            dbif=dbif).insert_gaps()
         tb.build(mapsB, mapsA, spatial)
 
         obj_list = []
@@ -1248,7 +1258,7 @@ class AbstractSpaceTimeDataset(AbstractDataset):
             gap_list.append(copy.copy(map))
             start = next
 
-        tb = SpatioTemporalTopologyBuilder()
+        tb = SweepLineTopologyBuilder()
         tb.build(gap_list, maps)
 
         relations_order = ["EQUAL", "DURING", "OVERLAPS", "OVERLAPPED",
@@ -1308,34 +1318,9 @@ class AbstractSpaceTimeDataset(AbstractDataset):
 
         dbif, connected = init_dbif(dbif)
 
-        obj_list = []
-
-        maps = self.get_registered_maps_as_objects(where, "start_time", dbif)
-
-        if maps is not None and len(maps) > 0:
-            for i in range(len(maps)):
-                obj_list.append(maps[i])
-                # Detect and insert gaps
-                if i < len(maps) - 1:
-                    relation = maps[i + 1].temporal_relation(maps[i])
-                    if relation == "after":
-                        start1, end1 = maps[i].get_temporal_extent_as_tuple()
-                        start2, end2 = maps[i + 1].get_temporal_extent_as_tuple()
-                        end = start2
-                        if end1 is not None:
-                            start = end1
-                        else:
-                            start = start1
-
-                        map = self.get_new_map_instance(None)
-
-                        if self.is_time_absolute():
-                            map.set_absolute_time(start, end)
-                        elif self.is_time_relative():
-                            map.set_relative_time(start, end,
-                                                 self.get_relative_time_unit())
-                        map.set_spatial_extent_from_values(0, 0, 0, 0, 0, 0)
-                        obj_list.append(copy.copy(map))
+        maps = self.get_registered_maps_as_map_list(where, "start_time", dbif)
+        # Detect and insert gaps
+        obj_list = maps.insert_gaps().to_objects()
 
         if connected:
             dbif.close()
@@ -1366,7 +1351,7 @@ class AbstractSpaceTimeDataset(AbstractDataset):
         dbif, connected = init_dbif(dbif)
         obj_list = self.get_registered_maps_as_objects(where, order, dbif)
 
-        tb = SpatioTemporalTopologyBuilder()
+        tb = SweepLineTopologyBuilder()
         tb.build(obj_list)
 
         if connected:
@@ -1399,25 +1384,7 @@ class AbstractSpaceTimeDataset(AbstractDataset):
 
         obj_list = []
 
-        # Older temporal databases have no bottom and top columns
-        # in their views so we need a work around to set the full
-        # spatial extent as well
-
-        rows = get_tgis_metadata(dbif)
-        db_version = 0
-
-        if rows:
-            for row in rows:
-                if row["key"] == "tgis_db_version":
-                    db_version = int(float(row["value"]))
-
-        if db_version >= 1:
-            has_bt_columns = True
-            columns = "id,start_time,end_time, west,east,south,north,bottom,top"
-        else:
-            has_bt_columns = False
-            columns = "id,start_time,end_time, west,east,south,north"
-
+        columns, has_bt_columns = self._get_extent_columns(dbif)
         rows = self.get_registered_maps(columns, where, order, dbif)
 
         if rows is not None:
@@ -1447,6 +1414,74 @@ class AbstractSpaceTimeDataset(AbstractDataset):
 
         return obj_list
 
+    def get_registered_maps_as_map_list(self, where=None,
+                                        order="start_time", dbif=None):
+        """Return all or a subset of the registered maps as ordered
+           MapList for spatio-temporal operations that require the
+           spatio-temporal extent only
+
+           The ids and the spatio-temporal extents are stored in NumPy
+           arrays, the map objects are created on access only. Hence this
+           method is much faster and uses much less memory than
+           get_registered_maps_as_objects() for datasets with many maps.
+
+           :param where: The SQL where statement to select a subset of
+                         the registered maps without "WHERE"
+           :param order: The SQL order statement to be used to order the
+                         maps in the list without "ORDER BY"
+           :param dbif: The database interface to be used
+           :return: The ordered MapList, in case nothing found the MapList
+                    is empty
+        """
+
+        dbif, connected = init_dbif(dbif)
+
+        columns, has_bt_columns = self._get_extent_columns(dbif)
+
+        if has_bt_columns:
+            rows = self.get_registered_maps(columns, where, order, dbif)
+            unit = None
+            if self.is_time_relative():
+                unit = self.get_relative_time_unit()
+            map_list = MapList.from_rows(rows,
+                                         temporal_type=self.get_temporal_type(),
+                                         unit=unit,
+                                         factory=self.get_new_map_instance)
+        # The slow work around
+        else:
+            map_list = MapList.from_objects(
+                self.get_registered_maps_as_objects(where, order, dbif),
+                factory=self.get_new_map_instance)
+
+        if connected:
+            dbif.close()
+
+        return map_list
+
+    def _get_extent_columns(self, dbif):
+        """Return the columns of the registered map views that store the
+           spatio-temporal extent and True if the views have bottom and
+           top columns
+
+           :param dbif: The database interface to be used
+        """
+        # Older temporal databases have no bottom and top columns
+        # in their views so we need a work around to set the full
+        # spatial extent as well
+
+        rows = get_tgis_metadata(dbif)
+        db_version = 0
+
+        if rows:
+            for row in rows:
+                if row["key"] == "tgis_db_version":
+                    db_version = int(float(row["value"]))
+
+        if db_version >= 1:
+            return ("id,start_time,end_time, west,east,south,north,bottom,top",
+                    True)
+        return "id,start_time,end_time, west,east,south,north", False
+
     def get_registered_maps(self, columns=None, where=None, order=None,
                             dbif=None):
         """Return SQL rows of all registered maps.
@@ -2051,13 +2086,6 @@ class AbstractSpaceTimeDataset(AbstractDataset):
            :return: True if success, False otherwise
         """
 
-        if get_enable_mapset_check() is True and \
-           self.get_mapset() != get_current_mapset():
-            self.msgr.fatal(_("Unable to register map in dataset <%(ds)s> of "
-                              "type %(type)s. The mapset of the dataset does "
-                              "not match the current mapset") %
-                            {"ds": self.get_id(), "type": self.get_type()})
-
         dbif, connected = init_dbif(dbif)
 
         if map.is_in_db(dbif) is False:
@@ -2083,110 +2111,177 @@ class AbstractSpaceTimeDataset(AbstractDataset):
         # First select all data from the database
         map.select(dbif)
 
-        if not map.check_for_correct_time():
-            if map.get_layer():
-                self.msgr.fatal(_("Map <%(id)s> with layer %(l)s has invalid "
-                                  "time") % {'id': map.get_map_id(),
-                                             'l': map.get_layer()})
-            else:
-                self.msgr.fatal(_("Map <%s> has invalid time") % (map.get_map_id()))
+        registered_maps = self.register_maps([map], dbif=dbif)
 
-        # Get basic info
-        map_id = map.base.get_id()
-        map_mapset = map.base.get_mapset()
-        map_rel_time_unit = map.get_relative_time_unit()
-        map_ttype = map.get_temporal_type()
+        if connected:
+            dbif.close()
 
-        stds_mapset = self.base.get_mapset()
-        stds_register_table = self.get_map_register()
-        stds_ttype = self.get_temporal_type()
+        return len(registered_maps) > 0
 
-        # The gathered SQL statemets are stroed here
-        statement = ""
+    def register_maps(self, maps, dbif=None):
+        """Register a list of maps in the space time dataset.
 
-        # Check temporal types
-        if stds_ttype != map_ttype:
-            if map.get_layer():
-                self.msgr.fatal(_("Temporal type of space time dataset "
-                                  "<%(id)s> and map <%(map)s> with layer %(l)s"
-                                  " are different") % {'id': self.get_id(),
-                                                       'map': map.get_map_id(),
-                                                       'l': map.get_layer()})
-            else:
-                self.msgr.fatal(_("Temporal type of space time dataset "
-                                  "<%(id)s> and map <%(map)s> are different")
-                                % {'id': self.get_id(),
-                                   'map': map.get_map_id()})
-
-        # In case no map has been registered yet, set the
-        # relative time unit from the first map
-        if (self.metadata.get_number_of_maps() is None or
-            self.metadata.get_number_of_maps() == 0) and \
-           self.map_counter == 0 and self.is_time_relative():
-
-            self.set_relative_time_unit(map_rel_time_unit)
-            statement += self.relative_time.get_update_all_statement_mogrified(
-                dbif)
-
-            self.msgr.debug(1, _("Set temporal unit for space time %s dataset "
-                                 "<%s> to %s") % (map.get_type(),
-                                                  self.get_id(),
-                                                  map_rel_time_unit))
-
-        stds_rel_time_unit = self.get_relative_time_unit()
-
-        # Check the relative time unit
-        if self.is_time_relative() and (stds_rel_time_unit != map_rel_time_unit):
-            if map.get_layer():
-                self.msgr.fatal(_("Relative time units of space time dataset "
-                                  "<%(id)s> and map <%(map)s> with layer %(l)s"
-                                  " are different") % {'id': self.get_id(),
-                                                       'map': map.get_map_id(),
-                                                       'l': map.get_layer()})
-            else:
-                self.msgr.fatal(_("Relative time units of space time dataset "
-                                  "<%(id)s> and map <%(map)s> are different") %
-                                {'id': self.get_id(), 'map': map.get_map_id()})
+            This is the bulk version of register_map(), which calls it
+            to check and register a single map. The maps must be
+            inserted in the temporal database and their content must have
+            been selected or set beforehand, since they are not selected
+            again. All SQL statements are executed in a single transaction.
 
-        if get_enable_mapset_check() is True and stds_mapset != map_mapset:
-            dbif.close()
-            self.msgr.fatal(_("Only maps from the same mapset can be registered"))
+            Maps that are already registered are skipped with a warning.
 
-        # Check if map is already registered
-        if self.is_map_registered(map_id, dbif=dbif):
-            if map.get_layer() is not None:
-                self.msgr.warning(_("Map <%(map)s> with layer %(l)s is already"
-                                    " registered.") % {'map': map.get_map_id(),
-                                                       'l': map.get_layer()})
-            else:
-                self.msgr.warning(_("Map <%s> is already registered.") %
-                                   (map.get_map_id()))
-            return False
+            This method raises a FatalError exception in case of a fatal error
+
+           :param maps: A list of AbstractMapDataset objects that should be
+                        registered
+           :param dbif: The database interface to be used
+           :return: The list of the registered maps
+        """
+
+        if get_enable_mapset_check() is True and \
+           self.get_mapset() != get_current_mapset():
+            self.msgr.fatal(_("Unable to register map in dataset <%(ds)s> of "
+                              "type %(type)s. The mapset of the dataset does "
+                              "not match the current mapset") %
+                            {"ds": self.get_id(), "type": self.get_type()})
+
+        if not maps:
+            return []
 
-        # Register the stds in the map stds register table column
-        statement += map.add_stds_to_register(stds_id=self.base.get_id(),
-                                              dbif=dbif, execute=False)
+        dbif, connected = init_dbif(dbif)
+
+        stds_id = self.base.get_id()
+        stds_mapset = self.base.get_mapset()
+        stds_register_table = self.get_map_register()
+        stds_ttype = self.get_temporal_type()
 
-        # Now put the raster name in the stds map register table
         if dbif.get_dbmi().paramstyle == "qmark":
-            sql = "INSERT INTO " + stds_register_table + \
-                " (id) " + "VALUES (?);\n"
+            placeholder = "?"
         else:
-            sql = "INSERT INTO " + stds_register_table + \
-                " (id) " + "VALUES (%s);\n"
+            placeholder = "%s"
+
+        # Select the ids of the maps that are already registered
+        registered = set()
+        if stds_register_table:
+            ids = [map.get_id() for map in maps]
+            for i in range(0, len(ids), 500):
+                chunk = ids[i:i + 500]
+                sql = "SELECT id FROM " + stds_register_table + \
+                      " WHERE id IN (" + ",".join([placeholder] * len(chunk)) + ")"
+                dbif.execute(sql, tuple(chunk), mapset=stds_mapset)
+                rows = dbif.fetchall(mapset=stds_mapset)
+                for row in rows:
+                    registered.add(row[0])
 
-        statement += dbif.mogrify_sql_statement((sql, (map_id,)))
+        # The gathered SQL statements and their arguments are stored here
+        statements = []
+        registered_maps = []
+
+        sql = "INSERT INTO " + stds_register_table + \
+              " (id) " + "VALUES (" + placeholder + ");\n"
+
+        for map in maps:
+            map_id = map.base.get_id()
+
+            if map_id in registered:
+                if map.get_layer() is not None:
+                    self.msgr.warning(_("Map <%(map)s> with layer %(l)s is "
+                                        "already registered.") %
+                                      {'map': map.get_map_id(),
+                                       'l': map.get_layer()})
+                else:
+                    self.msgr.warning(_("Map <%s> is already registered.") %
+                                      (map.get_map_id()))
+                continue
+
+            if not map.check_for_correct_time():
+                if map.get_layer():
+                    self.msgr.fatal(_("Map <%(id)s> with layer %(l)s has "
+                                      "invalid time") % {'id': map.get_map_id(),
+                                                         'l': map.get_layer()})
+                else:
+                    self.msgr.fatal(_("Map <%s> has invalid time") %
+                                    (map.get_map_id()))
+
+            map_rel_time_unit = map.get_relative_time_unit()
+
+            # Check temporal types
+            if stds_ttype != map.get_temporal_type():
+                if map.get_layer():
+                    self.msgr.fatal(_("Temporal type of space time dataset "
+                                      "<%(id)s> and map <%(map)s> with layer "
+                                      "%(l)s are different") %
+                                    {'id': self.get_id(),
+                                     'map': map.get_map_id(),
+                                     'l': map.get_layer()})
+                else:
+                    self.msgr.fatal(_("Temporal type of space time dataset "
+                                      "<%(id)s> and map <%(map)s> are "
+                                      "different") % {'id': self.get_id(),
+                                                      'map': map.get_map_id()})
+
+            # In case no map has been registered yet, set the
+            # relative time unit from the first map
+            if (self.metadata.get_number_of_maps() is None or
+                self.metadata.get_number_of_maps() == 0) and \
+               self.map_counter == 0 and not registered_maps and \
+               self.is_time_relative():
+
+                self.set_relative_time_unit(map_rel_time_unit)
+                statements.append(self.relative_time.get_update_all_statement())
+
+                self.msgr.debug(1, _("Set temporal unit for space time %s "
+                                     "dataset <%s> to %s") % (map.get_type(),
+                                                              self.get_id(),
+                                                              map_rel_time_unit))
+
+            # Check the relative time unit
+            if self.is_time_relative() and \
+               (self.get_relative_time_unit() != map_rel_time_unit):
+                if map.get_layer():
+                    self.msgr.fatal(_("Relative time units of space time "
+                                      "dataset <%(id)s> and map <%(map)s> "
+                                      "with layer %(l)s are different") %
+                                    {'id': self.get_id(),
+                                     'map': map.get_map_id(),
+                                     'l': map.get_layer()})
+                else:
+                    self.msgr.fatal(_("Relative time units of space time "
+                                      "dataset <%(id)s> and map <%(map)s> "
+                                      "are different") %
+                                    {'id': self.get_id(),
+                                     'map': map.get_map_id()})
+
+            if get_enable_mapset_check() is True and \
+               stds_mapset != map.base.get_mapset():
+                dbif.close()
+                self.msgr.fatal(_("Only maps from the same mapset can be "
+                                  "registered"))
+
+            # Register the stds in the map stds register table column
+            datasets = map.get_registered_stds(select=False)
+            if datasets is None:
+                datasets = []
+            if stds_id not in datasets:
+                datasets.append(stds_id)
+                map.stds_register.set_registered_stds(",".join(datasets))
+                statements.append(map.stds_register.get_update_statement())
+
+            # Now put the map id in the stds map register table
+            statements.append((sql, (map_id,)))
+            registered.add(map_id)
+            registered_maps.append(map)
 
         # Now execute the insert transaction
-        dbif.execute_transaction(statement)
+        if statements:
+            dbif.execute_batch(statements)
 
         if connected:
             dbif.close()
 
         # increase the counter
-        self.map_counter += 1
+        self.map_counter += len(registered_maps)
 
-        return True
+        return registered_maps
 
     def unregister_map(self, map, dbif=None, execute=True):
         """Unregister a map from the space time dataset.
@@ -2263,7 +2358,221 @@ class AbstractSpaceTimeDataset(AbstractDataset):
 
         return statement
 
-    def update_from_registered_maps(self, dbif=None):
+    def _compute_map_time_and_granularity(self, maps):
+        """Compute the map time type and the granularity of a list of maps
+
+           :param maps: A sorted (start_time) list of AbstractDataset objects
+                        or a MapList
+           :return: A tuple (map_time, granularity)
+        """
+        tlist = self.count_temporal_types(maps)
+
+        if tlist["interval"] > 0 and tlist["point"] == 0 and \
+           tlist["invalid"] == 0:
+            map_time = "interval"
+        elif tlist["interval"] == 0 and tlist["point"] > 0 and \
+             tlist["invalid"] == 0:
+            map_time = "point"
+        elif tlist["interval"] > 0 and tlist["point"] > 0 and \
+             tlist["invalid"] == 0:
+            map_time = "mixed"
+        else:
+            map_time = "invalid"
+
+        # Compute the granularity
+
+        if map_time != "invalid":
+            # Smallest supported temporal resolution
+            if self.is_time_absolute():
+                gran = compute_absolute_time_granularity(maps)
+            elif self.is_time_relative():
+                gran = compute_relative_time_granularity(maps)
+        else:
+            gran = None
+
+        return map_time, gran
+
+    def _update_from_map_delta(self, added, removed, dbif):
+        """Update the extents, the metadata, the map time type and the
+           granularity of this dataset from the registered and unregistered
+           maps, starting from the values that are stored in the temporal
+           database
+
+           The minimum and maximum values can not be updated in case a map
+           that provides such a value was removed, in this case nothing is
+           modified and False is returned.
+
+           :param added: A list of the registered maps
+           :param removed: A list of the unregistered maps
+           :param dbif: The database interface to be used
+           :return: True if the dataset was updated, False if all registered
+                    maps must be scanned
+        """
+        self.select(dbif)
+
+        num_maps = self.metadata.get_number_of_maps() or 0
+        new_num_maps = num_maps + len(added) - len(removed)
+        if new_num_maps <= 0 or num_maps == 0 and removed:
+            return False
+
+        if self.is_time_absolute():
+            start_time, end_time = self.get_absolute_time()
+        else:
+            start_time, end_time, unit = self.get_relative_time()
+        old_end_time = end_time
+
+        if num_maps > 0 and (start_time is None or end_time is None):
+            return False
+
+        # The end time of a dataset is the maximum of the start and end
+        # times of its maps
+        for map in removed:
+            start, end = map.get_temporal_extent_as_tuple()
+            if start is None:
+                continue
+            if start <= start_time or _max(start, end) >= end_time:
+                return False
+
+        for map in added:
+            start, end = map.get_temporal_extent_as_tuple()
+            if start is None:
+                return False
+            start_time = _min(start_time, start)
+            end_time = _max(end_time, _max(start, end))
+
+        # Spatial extent and type specific metadata
+        aggregates = [(self.spatial_extent, "spatial_extent", key, key, func)
+                      for key, func in _SPATIAL_EXTENT_AGGREGATES]
+        aggregates += [(self.metadata, "metadata", stds_key, map_key, func)
+                       for stds_key, map_key, func in
+                       _METADATA_AGGREGATES[self.get_type()]]
+
+        values = []
+        for obj, attr, stds_key, map_key, func in aggregates:
+            value = obj.D.get(stds_key)
+            for map in removed:
+                map_value = getattr(map, attr).D.get(map_key)
+                if map_value is None:
+                    continue
+                if func == "sum":
+                    if value is None:
+                        return False
+                    value -= map_value
+                elif map_value == value:
+                    return False
+            for map in added:
+                map_value = getattr(map, attr).D.get(map_key)
+                if func == "sum":
+                    if map_value is not None:
+                        value = (value or 0) + map_value
+                elif func == "min":
+                    value = _min(value, map_value)
+                else:
+                    value = _max(value, map_value)
+            values.append((obj, stds_key, value))
+
+        # Map time type and granularity
+        map_time = self.temporal_extent.get_map_time()
+        gran = self.temporal_extent.get_granularity()
+
+        added_maps = MapList.from_objects(added)
+        added_maps = added_maps.take(added_maps.start.argsort(kind="mergesort"))
+
+        if removed or (num_maps > 0 and added and
+                       added_maps.get_temporal_extent_as_tuple(0)[0] <
+                       old_end_time):
+            # Removed maps and maps that were inserted before the end of
+            # the dataset modify the gaps between the registered maps
+            map_time, gran = self._compute_map_time_and_granularity(
+                self.get_registered_maps_as_map_list(dbif=dbif))
+        elif added:
+            if num_maps == 0:
+                map_time, gran = self._compute_map_time_and_granularity(
+                    added_maps)
+            else:
+                # Compute the granularity of the added maps including the
+                # gap to the end of the dataset
+                types = set()
+                if map_time in ("interval", "mixed"):
+                    types.add("interval")
+                if map_time in ("point", "mixed"):
+                    types.add("point")
+                tlist = added_maps.count_temporal_types()
+                for key in ("interval", "point"):
+                    if tlist[key] > 0:
+                        types.add(key)
+
+                if map_time == "invalid" or tlist["invalid"] > 0:
+                    map_time = "invalid"
+                elif len(types) == 2:
+                    map_time = "mixed"
+                else:
+                    map_time = types.pop()
+
+                if map_time == "invalid":
+                    gran = None
+                else:
+                    # The end of the dataset is represented by a time point
+                    extents = added_maps.get_temporal_extents()
+                    maps = MapList([None] + added_maps.get_id_list(),
+                                   [old_end_time] + [e[0] for e in extents],
+                                   [None] + [e[1] for e in extents],
+                                   temporal_type=added_maps.temporal_type,
+                                   unit=added_maps.unit)
+                    gran = self._combine_granularities(
+                        gran, self._compute_map_time_and_granularity(maps)[1])
+                    if gran is False:
+                        map_time, gran = self._compute_map_time_and_granularity(
+                            self.get_registered_maps_as_map_list(dbif=dbif))
+
+        # Write the new values
+        if self.is_time_absolute():
+            self.absolute_time.set_start_time(start_time)
+            self.absolute_time.set_end_time(end_time)
+        else:
+            self.relative_time.set_start_time(start_time)
+            self.relative_time.set_end_time(end_time)
+        self.temporal_extent.set_map_time(map_time)
+        self.temporal_extent.set_granularity(gran)
+
+        for obj, key, value in values:
+            obj.D[key] = value
+        self.metadata.D["number_of_maps"] = new_num_maps
+
+        # Set the modification time
+        self.base.set_mtime(datetime.now())
+
+        dbif.execute_batch([self.temporal_extent.get_update_all_statement(),
+                            self.spatial_extent.get_update_all_statement(),
+                            self.metadata.get_update_all_statement(),
+                            self.base.get_update_statement()])
+
+        return True
+
+    def _combine_granularities(self, gran1, gran2):
+        """Return the common granularity of two granularities of this
+           dataset, None values are ignored
+
+           :return: The common granularity, False if the absolute
+                    granularities have different units
+        """
+        if gran1 is None:
+            return gran2
+        if gran2 is None:
+            return gran1
+        if self.is_time_relative():
+            return gcd(gran1, gran2)
+
+        unit = gran_singular_unit(gran1)
+        if unit != gran_singular_unit(gran2):
+            return False
+        num = gcd(int(gran1.split()[0]), int(gran2.split()[0]))
+        if num == 1:
+            return "%i %s" % (num, unit)
+        return "%i %ss" % (num, unit)
+
+    def update_from_registered_maps(self, dbif=None, added=None,
+                                    removed=None):
         """This methods updates the modification time, the spatial and
            temporal extent as well as type specific metadata. It should always
            been called after maps are registered or unregistered/deleted from
@@ -2276,7 +2585,18 @@ class AbstractSpaceTimeDataset(AbstractDataset):
            will be used. If the end time is earlier than the maximum start
            time, it will be replaced by the maximum start time.
 
+           In case the lists of the added or removed maps are provided,
+           the dataset is updated incrementally from these maps, without
+           scanning all registered maps. The maps must be filled with their
+           content from the temporal database. A full update is performed
+           if the removal of a map that defines a boundary of the extents or
+           the metadata makes it necessary.
+
            :param dbif: The database interface to be used
+           :param added: A list of the maps that were registered since the
+                         last update
+           :param removed: A list of the maps that were unregistered since
+                           the last update
         """
 
         if get_enable_mapset_check() is True and \
@@ -2296,6 +2616,15 @@ class AbstractSpaceTimeDataset(AbstractDataset):
 
         dbif, connected = init_dbif(dbif)
 
+        if added or removed:
+            if self._update_from_map_delta(added or [], removed or [], dbif):
+                if connected:
+                    dbif.close()
+                return
+            self.msgr.debug(1, "Incremental update of <%s> is not possible, "
+                               "updating from all registered maps" %
+                            (self.get_id()))
+
         map_time = None
 
         use_start_time = False
@@ -2416,32 +2745,9 @@ class AbstractSpaceTimeDataset(AbstractDataset):
 
             dbif.execute_transaction(sql)
 
-        # Count the temporal map types
-        maps = self.get_registered_maps_as_objects(dbif=dbif)
-        tlist = self.count_temporal_types(maps)
-
-        if tlist["interval"] > 0 and tlist["point"] == 0 and \
-           tlist["invalid"] == 0:
-            map_time = "interval"
-        elif tlist["interval"] == 0 and tlist["point"] > 0 and \
-             tlist["invalid"] == 0:
-            map_time = "point"
-        elif tlist["interval"] > 0 and tlist["point"] > 0 and \
-             tlist["invalid"] == 0:
-            map_time = "mixed"
-        else:
-            map_time = "invalid"
-
-        # Compute the granularity
-
-        if map_time != "invalid":
-            # Smallest supported temporal resolution
-            if self.is_time_absolute():
-                gran = compute_absolute_time_granularity(maps)
-            elif self.is_time_relative():
-                gran = compute_relative_time_granularity(maps)
-        else:
-            gran = None
+        # Count the temporal map types and compute the granularity
+        maps = self.get_registered_maps_as_map_list(dbif=dbif)
+        map_time, gran = self._compute_map_time_and_granularity(maps)
 
         # Set the map time type and update the time objects
         self.temporal_extent.select(dbif)
@@ -2463,6 +2769,54 @@ class AbstractSpaceTimeDataset(AbstractDataset):
 
 ###############################################################################
 
+# The spatial extent of a space time dataset is aggregated from the spatial
+# extents of its registered maps
+_SPATIAL_EXTENT_AGGREGATES = (("north", "max"), ("south", "min"),
+                              ("east", "max"), ("west", "min"),
+                              ("top", "max"), ("bottom", "min"),
+                              ("proj", "min"))
+
+# The type specific metadata of space time datasets and the metadata of the
+# registered maps they are aggregated from, see the
+# update_<type>_metadata_template.sql scripts
+_RASTER_METADATA_AGGREGATES = (("min_min", "min", "min"),
+                               ("min_max", "min", "max"),
+                               ("max_min", "max", "min"),
+                               ("max_max", "max", "max"),
+                               ("nsres_min", "nsres", "min"),
+                               ("nsres_max", "nsres", "max"),
+                               ("ewres_min", "ewres", "min"),
+                               ("ewres_max", "ewres", "max"))
+
+_METADATA_AGGREGATES = {
+    "strds": _RASTER_METADATA_AGGREGATES,
+    "str3ds": _RASTER_METADATA_AGGREGATES + (("tbres_min", "tbres", "min"),
+                                             ("tbres_max", "tbres", "max")),
+    "stvds": tuple((key, key, "sum") for key in
+                   ("points", "lines", "boundaries", "centroids", "faces",
+                    "kernels", "primitives", "nodes", "areas", "islands",
+                    "holes", "volumes"))}
+
+
+def _min(a, b):
+    """Return the minimum of two values ignoring None, like SQL min()"""
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return min(a, b)
+
+
+def _max(a, b):
+    """Return the maximum of two values ignoring None, like SQL max()"""
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return max(a, b)
+
+###############################################################################
+
 if __name__ == "__main__":
     import doctest
     doctest.testmod()
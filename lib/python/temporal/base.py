@@ -229,11 +229,11 @@ class SQLDatabaseInterface(DictSQLSerializer):
             >>> t.get_insert_statement_mogrified()
             "INSERT INTO raster ( creation_time  ,mapset  ,name  ,creator ) VALUES ('2001-01-01 00:00:00' ,'PERMANENT' ,'soil' ,'soeren') ;\\n"
             >>> t.get_update_statement()
-            ("UPDATE raster SET  creation_time = ?  ,mapset = ?  ,name = ?  ,creator = ? WHERE id = 'soil@PERMANENT';\\n", (datetime.datetime(2001, 1, 1, 0, 0), 'PERMANENT', 'soil', 'soeren'))
+            ('UPDATE raster SET  creation_time = ?  ,mapset = ?  ,name = ?  ,creator = ? WHERE id = ?;\\n', (datetime.datetime(2001, 1, 1, 0, 0), 'PERMANENT', 'soil', 'soeren', 'soil@PERMANENT'))
             >>> t.get_update_statement_mogrified()
             "UPDATE raster SET  creation_time = '2001-01-01 00:00:00'  ,mapset = 'PERMANENT'  ,name = 'soil'  ,creator = 'soeren' WHERE id = 'soil@PERMANENT';\\n"
             >>> t.get_update_all_statement()
-            ("UPDATE raster SET  creation_time = ?  ,mapset = ?  ,name = ?  ,creator = ? WHERE id = 'soil@PERMANENT';\\n", (datetime.datetime(2001, 1, 1, 0, 0), 'PERMANENT', 'soil', 'soeren'))
+            ('UPDATE raster SET  creation_time = ?  ,mapset = ?  ,name = ?  ,creator = ? WHERE id = ?;\\n', (datetime.datetime(2001, 1, 1, 0, 0), 'PERMANENT', 'soil', 'soeren', 'soil@PERMANENT'))
             >>> t.get_update_all_statement_mogrified()
             "UPDATE raster SET  creation_time = '2001-01-01 00:00:00'  ,mapset = 'PERMANENT'  ,name = 'soil'  ,creator = 'soeren' WHERE id = 'soil@PERMANENT';\\n"
 
@@ -419,6 +419,23 @@ class SQLDatabaseInterface(DictSQLSerializer):
             dbif.execute(sql, args, mapset=self.mapset)
             dbif.close()
 
+    def _serialize_where_id(self, type, ident=None):
+        """Serialize the content with a parameterized WHERE clause on the
+           identifier, hence the SQL string is the same for all the
+           objects stored in the same table
+
+           :param type: must be UPDATE or UPDATE ALL
+           :param ident: The identifier to be updated, if None the
+                         internal identifier is used
+           :return: a tuple containing the SQL string and the arguments
+        """
+        if self.dbmi_paramstyle == "qmark":
+            where = "WHERE id = ?"
+        else:
+            where = "WHERE id = %s"
+        sql, args = self.serialize(type, self.get_table_name(), where)
+        return sql, args + (str(ident if ident else self.ident),)
+
     def get_update_statement(self, ident=None):
         """Return the sql statement and the argument list
            in database specific style
@@ -427,12 +444,7 @@ class SQLDatabaseInterface(DictSQLSerializer):
            :return: The UPDATE string
 
            """
-        if ident:
-            return self.serialize("UPDATE", self.get_table_name(),
-                                  "WHERE id = \'" + str(ident) + "\'")
-        else:
-            return self.serialize("UPDATE", self.get_table_name(),
-                                  "WHERE id = \'" + str(self.ident) + "\'")
+        return self._serialize_where_id("UPDATE", ident)
 
     def get_update_statement_mogrified(self, dbif=None, ident=None):
         """Return the update statement as mogrified string
@@ -480,12 +492,7 @@ class SQLDatabaseInterface(DictSQLSerializer):
            :param ident: The identifier to be updated, useful for renaming
            :return: The UPDATE string
            """
-        if ident:
-            return self.serialize("UPDATE ALL", self.get_table_name(),
-                                  "WHERE id = \'" + str(ident) + "\'")
-        else:
-            return self.serialize("UPDATE ALL", self.get_table_name(),
-                                  "WHERE id = \'" + str(self.ident) + "\'")
+        return self._serialize_where_id("UPDATE ALL", ident)
 
     def get_update_all_statement_mogrified(self, dbif=None, ident=None):
         """Return the update all statement as mogrified string
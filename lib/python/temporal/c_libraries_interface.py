@@ -15,6 +15,7 @@ from grass.exceptions import FatalError
 import sys
 from multiprocessing import Process, Lock, Pipe
 import logging
+import threading
 from ctypes import *
 from datetime import datetime
 import grass.lib.gis as libgis
@@ -49,12 +50,22 @@ class RPCDefs(object):
     G_LOCATION = 12
     G_GISDBASE = 13
     READ_MAP_FULL_INFO = 14
+    MAP_EXISTS_MANY = 15
+    READ_MAP_INFO_MANY = 16
+    READ_TIMESTAMP_MANY = 17
     G_FATAL_ERROR = 49
 
     TYPE_RASTER = 0
     TYPE_RASTER3D = 1
     TYPE_VECTOR = 2
 
+    # The map types of the temporal framework
+    MAP_TYPES = {"raster": TYPE_RASTER, "raster3d": TYPE_RASTER3D,
+                 "vector": TYPE_VECTOR}
+
+    # The number of results send at once by the bulk requests
+    CHUNK_SIZE = 1000
+
 ###############################################################################
 
 
@@ -394,24 +405,30 @@ def _read_timestamp(lock, conn, data):
     check = False
     dates = None
     try:
-        maptype = data[1]
-        name = data[2]
-        mapset = data[3]
-        layer = data[4]
-        ts = libgis.TimeStamp()
-        if maptype == RPCDefs.TYPE_RASTER:
-            check = libgis.G_read_raster_timestamp(name, mapset, byref(ts))
-        elif maptype == RPCDefs.TYPE_VECTOR:
-            check = libgis.G_read_vector_timestamp(name, layer, mapset, byref(ts))
-        elif maptype == RPCDefs.TYPE_RASTER3D:
-            check = libgis.G_read_raster3d_timestamp(name, mapset, byref(ts))
-
-        dates = _convert_timestamp_from_grass(ts)
+        check, dates = _read_timestamp_of_map(data[1], data[2], data[3],
+                                              data[4])
     except:
         raise
     finally:
         conn.send((check, dates))
 
+
+def _read_timestamp_of_map(maptype, name, mapset, layer):
+    """Read the file based GRASS timestamp of a single map
+
+       :return: The tuple (return value of G_read_*_timestamp, timestamps)
+    """
+    check = False
+    ts = libgis.TimeStamp()
+    if maptype == RPCDefs.TYPE_RASTER:
+        check = libgis.G_read_raster_timestamp(name, mapset, byref(ts))
+    elif maptype == RPCDefs.TYPE_VECTOR:
+        check = libgis.G_read_vector_timestamp(name, layer, mapset, byref(ts))
+    elif maptype == RPCDefs.TYPE_RASTER3D:
+        check = libgis.G_read_raster3d_timestamp(name, mapset, byref(ts))
+
+    return check, _convert_timestamp_from_grass(ts)
+
 ###############################################################################
 
 
@@ -507,23 +524,29 @@ def _map_exists(lock, conn, data):
     """
     check = False
     try:
-        maptype = data[1]
-        name = data[2]
-        mapset = data[3]
-        if maptype == RPCDefs.TYPE_RASTER:
-            mapset = libgis.G_find_raster(name, mapset)
-        elif maptype == RPCDefs.TYPE_VECTOR:
-            mapset = libgis.G_find_vector(name, mapset)
-        elif maptype == RPCDefs.TYPE_RASTER3D:
-            mapset = libgis.G_find_raster3d(name, mapset)
-
-        if mapset:
-            check = True
+        check = _map_exists_in_mapset(data[1], data[2], data[3])
     except:
         raise
     finally:
         conn.send(check)
 
+
+def _map_exists_in_mapset(maptype, name, mapset, layer=None):
+    """Check if a single map exists in the spatial database
+
+       :return: True in case the map exists, False otherwise
+    """
+    if maptype == RPCDefs.TYPE_RASTER:
+        mapset = libgis.G_find_raster(name, mapset)
+    elif maptype == RPCDefs.TYPE_VECTOR:
+        mapset = libgis.G_find_vector(name, mapset)
+    elif maptype == RPCDefs.TYPE_RASTER3D:
+        mapset = libgis.G_find_raster3d(name, mapset)
+    else:
+        mapset = None
+
+    return bool(mapset)
+
 ###############################################################################
 
 
@@ -537,20 +560,118 @@ def _read_map_info(lock, conn, data):
     """
     kvp = None
     try:
-        maptype = data[1]
-        name = data[2]
-        mapset = data[3]
-        if maptype == RPCDefs.TYPE_RASTER:
-            kvp = _read_raster_info(name, mapset)
-        elif maptype == RPCDefs.TYPE_VECTOR:
-            kvp = _read_vector_info(name, mapset)
-        elif maptype == RPCDefs.TYPE_RASTER3D:
-            kvp = _read_raster3d_info(name, mapset)
+        kvp = _read_info_of_map(data[1], data[2], data[3])
     except:
         raise
     finally:
         conn.send(kvp)
 
+
+def _read_info_of_map(maptype, name, mapset, layer=None):
+    """Read the metadata of a single map
+
+       :return: The key value pairs of the map specific metadata
+    """
+    kvp = None
+    if maptype == RPCDefs.TYPE_RASTER:
+        kvp = _read_raster_info(name, mapset)
+    elif maptype == RPCDefs.TYPE_VECTOR:
+        kvp = _read_vector_info(name, mapset)
+    elif maptype == RPCDefs.TYPE_RASTER3D:
+        kvp = _read_raster3d_info(name, mapset)
+    return kvp
+
+###############################################################################
+
+
+def _split_map_id(map_id, maptype):
+    """Split a map id of the temporal framework (name@mapset or
+       name:layer@mapset for vector maps) into name, mapset and layer
+
+       :return: The tuple (name, mapset, layer)
+    """
+    if "@" in map_id:
+        name, mapset = map_id.split("@", 1)
+    else:
+        name, mapset = map_id, ""
+    layer = None
+    if maptype == RPCDefs.TYPE_VECTOR and ":" in name:
+        name, layer = name.split(":", 1)
+    return name, mapset, layer
+
+
+def _send_many(conn, data, function):
+    """Call a function for each map id and send the results in chunks
+       of RPCDefs.CHUNK_SIZE entries using the provided pipe, the end of
+       the results is marked by sending None.
+
+       The result of a map is None in case the function raised an exception.
+
+       :param conn: A multiprocessing.Pipe instance used to send the results
+       :param data: The list of data entries [function_id, maptype, ids]
+       :param function: The function to be called with the maptype, name,
+                        mapset and layer of each map
+    """
+    maptype = data[1]
+    chunk = []
+    try:
+        for map_id in data[2]:
+            name, mapset, layer = _split_map_id(map_id, maptype)
+            try:
+                chunk.append(function(maptype, name, mapset, layer))
+            except Exception as e:
+                logging.error("Unable to process map <%s>: %s" % (map_id, e))
+                chunk.append(None)
+            if len(chunk) == RPCDefs.CHUNK_SIZE:
+                conn.send(chunk)
+                chunk = []
+    except:
+        raise
+    finally:
+        if chunk:
+            conn.send(chunk)
+        conn.send(None)
+
+
+def _map_exists_many(lock, conn, data):
+    """Check if maps exist in the spatial database
+
+       The values to be send via pipe are lists of True or False,
+       followed by None.
+
+       :param lock: A multiprocessing.Lock instance
+       :param conn: A multiprocessing.Pipe instance used to send the results
+       :param data: The list of data entries [function_id, maptype, ids]
+    """
+    _send_many(conn, data, _map_exists_in_mapset)
+
+
+def _read_map_info_many(lock, conn, data):
+    """Read the metadata of maps from the spatial database using C-library
+       functions
+
+       The values to be send via pipe are lists of dictionaries,
+       followed by None.
+
+       :param lock: A multiprocessing.Lock instance
+       :param conn: A multiprocessing.Pipe instance used to send the results
+       :param data: The list of data entries [function_id, maptype, ids]
+    """
+    _send_many(conn, data, _read_info_of_map)
+
+
+def _read_timestamp_many(lock, conn, data):
+    """Read the file based GRASS timestamps of maps
+
+       The values to be send via pipe are lists of tuples (return value of
+       G_read_*_timestamp, timestamps), followed by None.
+
+       :param lock: A multiprocessing.Lock instance
+       :param conn: A multiprocessing.Pipe instance used to send the results
+       :param data: The list of data entries [function_id, maptype, ids]
+    """
+    _send_many(conn, data, _read_timestamp_of_map)
+
 ###############################################################################
 
 
@@ -950,6 +1071,9 @@ def c_library_server(lock, conn):
     functions[RPCDefs.G_LOCATION] = _get_location
     functions[RPCDefs.G_GISDBASE] = _get_gisdbase
     functions[RPCDefs.READ_MAP_FULL_INFO] = _read_map_full_info
+    functions[RPCDefs.MAP_EXISTS_MANY] = _map_exists_many
+    functions[RPCDefs.READ_MAP_INFO_MANY] = _read_map_info_many
+    functions[RPCDefs.READ_TIMESTAMP_MANY] = _read_timestamp_many
     functions[RPCDefs.G_FATAL_ERROR] = _fatal_error
 
     libgis.G_gisinit("c_library_server")
@@ -976,6 +1100,12 @@ class CLibrariesInterface(RPCServerBase):
        In this case the CLibrariesInterface object will simply start a
        new subprocess and restarts the pipeline.
 
+       The bulk requests (map_exists_many(), read_raster_info_many(), ...)
+       process a list of map ids with a single request, the results are
+       send back in chunks. If nprocs is larger than 1, long lists of map
+       ids are split and processed in parallel by a pool of additional
+       server processes.
+
 
        Usage:
 
@@ -1041,6 +1171,18 @@ class CLibrariesInterface(RPCServerBase):
            >>> ciface.has_raster_timestamp("test", tgis.get_current_mapset())
            True
 
+           # Bulk requests
+           >>> ids = ["test@" + tgis.get_current_mapset(),
+           ...        "nonexisting@" + tgis.get_current_mapset()]
+           >>> ciface.map_exists_many(ids)
+           [True, False]
+           >>> info = ciface.read_raster_info_many(ids[:1])
+           >>> info[0]["datatype"]
+           'CELL'
+           >>> check, dates = ciface.read_timestamps_many(ids[:1])[0]
+           >>> print check, str(dates[0])
+           1 1999-01-13 14:30:05
+
 
            # 3D raster map
            >>> check = ciface.raster3d_map_exists("test", tgis.get_current_mapset())
@@ -1142,7 +1284,14 @@ class CLibrariesInterface(RPCServerBase):
            >>> gscript.del_temp_region()
 
     """
-    def __init__(self):
+    def __init__(self, nprocs=1):
+        """Constructor
+
+           :param nprocs: The maximum number of server processes used
+                          in parallel by the bulk requests
+        """
+        self.nprocs = nprocs
+        self.pool = []
         RPCServerBase.__init__(self)
 
     def start_server(self):
@@ -1153,6 +1302,119 @@ class CLibrariesInterface(RPCServerBase):
         self.server.daemon = True
         self.server.start()
 
+    def stop(self):
+        """Stop the servers of the pool, the check thread, the libgis server
+           and close the pipe
+        """
+        for ciface in self.pool:
+            ciface.stop()
+        self.pool = []
+        RPCServerBase.stop(self)
+
+    def _receive_many(self, function, maptype, ids, message):
+        """Send a bulk request and receive the chunks of results"""
+        self.check_server()
+        self.client_conn.send([function, maptype, ids])
+        result = []
+        while True:
+            chunk = self.safe_receive(message)
+            if chunk is None:
+                return result
+            result.extend(chunk)
+
+    def _call_many(self, function, maptype, ids, message):
+        """Process a bulk request, long lists of map ids are split
+           between this server and the servers of the pool"""
+        if maptype not in RPCDefs.MAP_TYPES:
+            raise ValueError("Unsupported map type <%s>" % maptype)
+        maptype = RPCDefs.MAP_TYPES[maptype]
+        ids = list(ids)
+
+        nprocs = min(self.nprocs, len(ids) // RPCDefs.CHUNK_SIZE)
+        if nprocs < 2:
+            return self._receive_many(function, maptype, ids, message)
+
+        while len(self.pool) < nprocs - 1:
+            self.pool.append(CLibrariesInterface())
+        servers = [self, ] + self.pool[:nprocs - 1]
+        size = (len(ids) + nprocs - 1) // nprocs
+        results = [None] * nprocs
+        errors = []
+
+        def receive(i):
+            try:
+                results[i] = servers[i]._receive_many(
+                    function, maptype, ids[i * size:(i + 1) * size], message)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=receive, args=(i,))
+                   for i in range(nprocs)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        if errors:
+            raise errors[0]
+
+        return [res for result in results for res in result]
+
+    def map_exists_many(self, ids, maptype="raster"):
+        """Check if maps exist in the spatial database
+
+           :param ids: A list of map ids (name@mapset), the ids of vector
+                       maps may include the layer (name:layer@mapset)
+           :param maptype: The type of the maps: raster, raster3d or vector
+           :returns: A list with True or False for each map id
+        """
+        return self._call_many(RPCDefs.MAP_EXISTS_MANY, maptype, ids,
+                               "map_exists_many")
+
+    def read_raster_info_many(self, ids):
+        """Read the info of raster maps from the file system
+
+           :param ids: A list of map ids (name@mapset)
+           :returns: A list with the key value pairs of the map specific
+                     metadata for each map id, or None in case of an error
+        """
+        return self._call_many(RPCDefs.READ_MAP_INFO_MANY, "raster", ids,
+                               "read_raster_info_many")
+
+    def read_raster3d_info_many(self, ids):
+        """Read the info of 3D raster maps from the file system
+
+           :param ids: A list of map ids (name@mapset)
+           :returns: A list with the key value pairs of the map specific
+                     metadata for each map id, or None in case of an error
+        """
+        return self._call_many(RPCDefs.READ_MAP_INFO_MANY, "raster3d", ids,
+                               "read_raster3d_info_many")
+
+    def read_vector_info_many(self, ids):
+        """Read the info of vector maps from the file system
+
+           :param ids: A list of map ids (name@mapset or name:layer@mapset)
+           :returns: A list with the key value pairs of the map specific
+                     metadata for each map id, or None in case of an error
+        """
+        return self._call_many(RPCDefs.READ_MAP_INFO_MANY, "vector", ids,
+                               "read_vector_info_many")
+
+    def read_timestamps_many(self, ids, maptype="raster"):
+        """Read the file based timestamps of maps
+
+           Please have a look at the documentation of read_raster_timestamp()
+           for the description of the results.
+
+           :param ids: A list of map ids (name@mapset), the ids of vector
+                       maps may include the layer (name:layer@mapset)
+           :param maptype: The type of the maps: raster, raster3d or vector
+           :returns: A list with the tuple (return value of
+                     G_read_*_timestamp, timestamps) for each map id
+        """
+        return self._call_many(RPCDefs.READ_TIMESTAMP_MANY, maptype, ids,
+                               "read_timestamps_many")
+
     def raster_map_exists(self, name, mapset):
         """Check if a raster map exists in the spatial database
 
@@ -18,6 +18,9 @@ Usage:
     >>> dbif.mogrify_sql_statement(["SELECT name from raster_base where name = ?",
     ... ("precipitation",)])
     "SELECT name from raster_base where name = 'precipitation'"
+    >>> # Execute a batch of SQL statements with arguments in a transaction
+    >>> dbif.execute_batch([("UPDATE raster_base SET creator = creator "
+    ...                      "WHERE name = ?", ("precipitation",))])
     >>> dbif.close()
 
 
@@ -1014,6 +1017,49 @@ class SQLDatabaseInterfaceConnection(object):
 
         return self.connections[mapset].fetchall()
 
+    def executemany(self, statement, args_list, mapset=None):
+        """Execute a SQL statement with DBMI specific place holder
+           for each entry of the argument list
+
+           :param statement: The SQL statement with place holder
+           :param args_list: A list of argument tuples
+           :param mapset: The mapset of the abstract dataset or temporal
+                          database location, if None the current mapset
+                          will be used
+        """
+        if mapset is None:
+            mapset = self.current_mapset
+
+        mapset = decode(mapset)
+        if mapset not in self.tgis_mapsets.keys():
+            self.msgr.fatal(_("Unable to execute sql statement. " +
+                              self._create_mapset_error_message(mapset)))
+
+        return self.connections[mapset].executemany(statement, args_list)
+
+    def execute_batch(self, statements, mapset=None):
+        """Execute a list of SQL statements with arguments in a single
+           transaction, statements sharing the same SQL template are
+           executed together with executemany()
+
+           :param statements: A list of tuples with two entries, the first
+                              entry is the SQL statement with DBMI specific
+                              place holder, the second entry is the
+                              argument tuple
+           :param mapset: The mapset of the abstract dataset or temporal
+                          database location, if None the current mapset
+                          will be used
+        """
+        if mapset is None:
+            mapset = self.current_mapset
+
+        mapset = decode(mapset)
+        if mapset not in self.tgis_mapsets.keys():
+            self.msgr.fatal(_("Unable to execute transaction. " +
+                              self._create_mapset_error_message(mapset)))
+
+        return self.connections[mapset].execute_batch(statements)
+
     def execute_transaction(self, statement, mapset=None):
         """Execute a transactional SQL statement
 
@@ -1301,6 +1347,92 @@ class DBConnection(object):
         if connected:
             self.close()
 
+    def executemany(self, statement, args_list):
+        """Execute a SQL statement for each entry of the argument list
+
+           :param statement: The SQL statement with DBMI specific place holder
+           :param args_list: A list of argument tuples
+        """
+        connected = False
+        if not self.connected:
+            self.connect()
+            connected = True
+        try:
+            self._executemany(statement, args_list)
+        except:
+            if connected:
+                self.close()
+            self.msgr.error(_("Unable to execute :\n %(sql)s" %
+                            {"sql": statement}))
+            raise
+
+        if connected:
+            self.close()
+
+    def _executemany(self, statement, args_list):
+        """Run executemany() with the fastest method of the backend"""
+        if self.dbmi.__name__ == "psycopg2" and \
+           hasattr(self.dbmi.extras, "execute_batch"):
+            self.dbmi.extras.execute_batch(self.cursor, statement, args_list)
+        else:
+            self.cursor.executemany(statement, args_list)
+
+    def execute_batch(self, statements):
+        """Execute a list of SQL statements with arguments in a single
+           transaction
+
+           The statements are grouped by their SQL template and each group
+           is executed with executemany(), hence the arguments are passed
+           to the database backend without building SQL strings. The
+           groups are executed in the order in which their template appears
+           first in the list, so that inserts in a base table are executed
+           before the inserts in the tables that reference it.
+
+           :param statements: A list of tuples with two entries, the first
+                              entry is the SQL statement with DBMI specific
+                              place holder, the second entry is the
+                              argument tuple
+        """
+        templates = []
+        groups = {}
+        for sql, args in statements:
+            if sql not in groups:
+                templates.append(sql)
+                groups[sql] = []
+            groups[sql].append(tuple(args))
+
+        if not templates:
+            return
+
+        connected = False
+        if not self.connected:
+            self.connect()
+            connected = True
+
+        sql = None
+        try:
+            if self.dbmi.__name__ == "sqlite3":
+                self.cursor.execute("BEGIN TRANSACTION")
+            for sql in templates:
+                self._executemany(sql, groups[sql])
+            if self.dbmi.__name__ == "sqlite3":
+                self.cursor.execute("COMMIT")
+            else:
+                self.connection.commit()
+        except:
+            if self.dbmi.__name__ == "sqlite3":
+                self.cursor.execute("ROLLBACK")
+            else:
+                self.connection.rollback()
+            if connected:
+                self.close()
+            self.msgr.error(_("Unable to execute transaction:\n %(sql)s" %
+                            {"sql": sql}))
+            raise
+
+        if connected:
+            self.close()
+
     def fetchone(self):
         if self.connected:
             return self.cursor.fetchone()
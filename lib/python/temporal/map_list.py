@@ -0,0 +1,392 @@
+# -*- coding: utf-8 -*-
+"""
+Columnar list of the maps registered in a space time dataset
+
+The ids, the temporal extents and the spatial extents of the maps are
+stored in NumPy arrays, the map objects are only created when they are
+accessed.
+
+Usage:
+
+.. code-block:: python
+
+    >>> import grass.temporal as tgis
+    >>> from datetime import datetime
+    >>> tgis.init()
+    >>> maps = tgis.MapList(["a@P", "b@P", "c@P"],
+    ...                     [datetime(2001, 1, 1), datetime(2001, 2, 1),
+    ...                      datetime(2001, 4, 1)],
+    ...                     [datetime(2001, 2, 1), datetime(2001, 3, 1),
+    ...                      None],
+    ...                     factory=tgis.RasterDataset)
+    >>> len(maps)
+    3
+    >>> maps.count_temporal_types() == {'point': 1, 'interval': 2,
+    ...                                 'invalid': 0}
+    True
+    >>> maps.count_gaps()
+    1
+    >>> tgis.compute_absolute_time_granularity(maps)
+    '1 month'
+    >>> maps[1].get_id()
+    'b@P'
+    >>> maps[1] is maps[1]
+    True
+    >>> maps[2].get_temporal_extent_as_tuple()
+    (datetime.datetime(2001, 4, 1, 0, 0), None)
+    >>> [map.get_id() for map in maps.insert_gaps()]
+    ['a@P', 'b@P', None, 'c@P']
+    >>> maps.insert_gaps().get_temporal_extent_as_tuple(2)
+    (datetime.datetime(2001, 3, 1, 0, 0), datetime.datetime(2001, 4, 1, 0, 0))
+
+(C) 2016 by the GRASS Development Team
+This program is free software under the GNU General Public
+License (>=v2). Read the file COPYING that comes with GRASS
+for details.
+
+:authors: Soeren Gebbert
+"""
+from __future__ import print_function
+import numpy as np
+
+#: The names of the spatial extent columns in the order of
+#: set_spatial_extent_from_values()
+SPATIAL_COLUMNS = ("north", "south", "east", "west", "top", "bottom")
+
+
+def _to_float(value):
+    """Convert a NaN value of a float array into None"""
+    value = float(value)
+    if value != value:
+        return None
+    return value
+
+
+def _to_relative_time(value):
+    """Convert a value of a relative time array into a Python number,
+    NaN values are converted into None"""
+    value = _to_float(value)
+    if value is not None and value.is_integer():
+        return int(value)
+    return value
+
+
+class MapList(object):
+    """A lightweight list of maps that stores the id, the temporal extent
+    and the spatial extent of each map in NumPy arrays.
+
+    The absolute start and end times are stored as datetime64 arrays,
+    the relative start and end times as float arrays, missing values are
+    NaT and NaN. A map object is created with the factory only when the
+    map is accessed by index or by iteration, the created objects are
+    cached so that topology information set on them is not lost.
+
+    A MapList can be used in place of the object lists returned by
+    AbstractSpaceTimeDataset.get_registered_maps_as_objects(), the gap,
+    the temporal type and the granularity computations work directly
+    on the arrays.
+    """
+    def __init__(self, ids, start_times, end_times, north=None, south=None,
+                 east=None, west=None, top=None, bottom=None,
+                 temporal_type="absolute", unit=None, factory=None):
+        """Constructor
+
+        :param ids: The ids of the maps, None for gaps
+        :param start_times: The start times of the maps
+        :param end_times: The end times of the maps, None for time points
+        :param north: The northern edges of the maps, default 0
+        :param south: The southern edges of the maps, default 0
+        :param east: The eastern edges of the maps, default 0
+        :param west: The western edges of the maps, default 0
+        :param top: The top edges of the maps, default 0
+        :param bottom: The bottom edges of the maps, default 0
+        :param temporal_type: The temporal type, absolute or relative
+        :param unit: The relative time unit
+        :param factory: A callable that returns a new map object for an
+                        id, like AbstractSpaceTimeDataset.get_new_map_instance
+        """
+        self.ids = np.array(ids, dtype=object).reshape(-1)
+        num = len(self.ids)
+        self.temporal_type = temporal_type
+        self.unit = unit
+        self.factory = factory
+        self.start = self._time_array(start_times, num)
+        self.end = self._time_array(end_times, num)
+        extent = {"north": north, "south": south, "east": east,
+                  "west": west, "top": top, "bottom": bottom}
+        for name in SPATIAL_COLUMNS:
+            values = extent[name]
+            if values is None:
+                values = np.zeros(num, dtype=np.float64)
+            else:
+                values = np.array([np.nan if value is None else value
+                                   for value in values], dtype=np.float64)
+            setattr(self, name, values)
+        self._objects = [None] * num
+
+    def _time_array(self, values, num):
+        if self.temporal_type == "absolute":
+            if isinstance(values, np.ndarray) and values.dtype.kind == "M":
+                return values.astype("datetime64[us]")
+            return np.array([np.datetime64("NaT") if value is None else
+                             np.datetime64(value, "us") for value in values],
+                            dtype="datetime64[us]").reshape(num)
+        if isinstance(values, np.ndarray) and values.dtype.kind == "f":
+            return values.astype(np.float64)
+        return np.array([np.nan if value is None else value
+                         for value in values], dtype=np.float64).reshape(num)
+
+    @classmethod
+    def from_rows(cls, rows, temporal_type="absolute", unit=None,
+                  factory=None):
+        """Create a MapList from the rows returned by
+        AbstractSpaceTimeDataset.get_registered_maps(), the rows must
+        contain the columns id, start_time, end_time, north, south, east
+        and west, the columns top and bottom are optional
+
+        :param rows: The SQL rows
+        :param temporal_type: The temporal type, absolute or relative
+        :param unit: The relative time unit
+        :param factory: A callable that returns a new map object for an id
+        """
+        rows = rows or []
+        columns = {"id": [], "start_time": [], "end_time": []}
+        for name in SPATIAL_COLUMNS:
+            columns[name] = []
+        has_bt_columns = len(rows) > 0 and "top" in rows[0].keys()
+        for row in rows:
+            for name in columns:
+                if name in ("top", "bottom") and not has_bt_columns:
+                    columns[name].append(0)
+                else:
+                    columns[name].append(row[name])
+        return cls(columns["id"], columns["start_time"],
+                   columns["end_time"], north=columns["north"],
+                   south=columns["south"], east=columns["east"],
+                   west=columns["west"], top=columns["top"],
+                   bottom=columns["bottom"], temporal_type=temporal_type,
+                   unit=unit, factory=factory)
+
+    @classmethod
+    def from_objects(cls, maps, factory=None):
+        """Create a MapList from a list of map objects, the objects are
+        kept and returned on access
+
+        :param maps: A list of AbstractMapDataset objects
+        :param factory: A callable that returns a new map object for an id,
+                        by default the get_new_instance() method of the
+                        first map is used
+        """
+        maps = list(maps)
+        temporal_type = "absolute"
+        unit = None
+        if maps:
+            if maps[0].is_time_relative():
+                temporal_type = "relative"
+                unit = maps[0].get_relative_time_unit()
+            if factory is None:
+                factory = maps[0].get_new_instance
+        extents = [map.get_spatial_extent_as_tuple() for map in maps]
+        times = [map.get_temporal_extent_as_tuple() for map in maps]
+        columns = list(zip(*extents)) if extents else [[]] * 6
+        map_list = cls([map.get_id() for map in maps],
+                       [time[0] for time in times],
+                       [time[1] for time in times],
+                       temporal_type=temporal_type, unit=unit,
+                       factory=factory,
+                       **dict(zip(SPATIAL_COLUMNS, columns)))
+        map_list._objects = maps
+        return map_list
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.take(np.arange(len(self))[index])
+        if index < 0:
+            index += len(self)
+        if index < 0 or index >= len(self):
+            raise IndexError("MapList index out of range")
+        map = self._objects[index]
+        if map is None:
+            map = self._promote(index)
+            self._objects[index] = map
+        return map
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def __repr__(self):
+        return "MapList(%i maps, %s time)" % (len(self), self.temporal_type)
+
+    def _promote(self, index):
+        """Create the map object of the map at index"""
+        map = self.factory(self.ids[index])
+        start, end = self.get_temporal_extent_as_tuple(index)
+        if self.is_time_absolute():
+            map.set_absolute_time(start, end)
+        else:
+            map.set_relative_time(start, end, self.unit)
+        map.set_spatial_extent_from_values(
+            *self.get_spatial_extent_as_tuple(index))
+        return map
+
+    def is_time_absolute(self):
+        """Return True if the maps have an absolute time"""
+        return self.temporal_type == "absolute"
+
+    def is_time_relative(self):
+        """Return True if the maps have a relative time"""
+        return self.temporal_type == "relative"
+
+    def get_relative_time_unit(self):
+        """Return the relative time unit of the maps"""
+        return self.unit
+
+    def get_id_list(self):
+        """Return the ids of the maps as list"""
+        return self.ids.tolist()
+
+    def get_temporal_extent_as_tuple(self, index):
+        """Return the start and end time of the map at index as Python
+        objects, like AbstractDataset.get_temporal_extent_as_tuple()
+
+        :param index: The index of the map
+        """
+        if self.is_time_absolute():
+            return (self.start[index].astype(object),
+                    self.end[index].astype(object))
+        return (_to_relative_time(self.start[index]),
+                _to_relative_time(self.end[index]))
+
+    def get_temporal_extents(self):
+        """Return the list of the (start, end) tuples of all maps, the
+        map objects are not created"""
+        if self.is_time_absolute():
+            return list(zip(self.start.astype(object).tolist(),
+                            self.end.astype(object).tolist()))
+        return [(_to_relative_time(start), _to_relative_time(end))
+                for start, end in zip(self.start, self.end)]
+
+    def get_spatial_extent_as_tuple(self, index):
+        """Return the spatial extent of the map at index as tuple
+        (north, south, east, west, top, bottom)
+
+        :param index: The index of the map
+        """
+        return tuple(_to_float(getattr(self, name)[index])
+                     for name in SPATIAL_COLUMNS)
+
+    def get_time_points(self):
+        """Return the start and end times as float arrays in seconds
+        (absolute time) or in the relative time unit, missing values are NaN
+        """
+        if self.is_time_absolute():
+            start = self.start.astype(np.int64).astype(np.float64) / 1e6
+            end = self.end.astype(np.int64).astype(np.float64) / 1e6
+            start[np.isnat(self.start)] = np.nan
+            end[np.isnat(self.end)] = np.nan
+            return start, end
+        return self.start.copy(), self.end.copy()
+
+    def get_gap_mask(self):
+        """Return a boolean array with an entry for each pair of temporal
+        neighbors, True if there is a gap between map i and map i + 1.
+
+        A gap exists if map i + 1 is "after" map i, the list must be
+        ordered by start time.
+        """
+        start, end = self.get_time_points()
+        if len(start) < 2:
+            return np.zeros(0, dtype=bool)
+        previous = np.where(np.isnan(end[:-1]), start[:-1], end[:-1])
+        with np.errstate(invalid="ignore"):
+            return start[1:] > previous
+
+    def count_gaps(self):
+        """Return the number of gaps between temporal neighbors, the list
+        must be ordered by start time"""
+        return int(np.count_nonzero(self.get_gap_mask()))
+
+    def count_temporal_types(self):
+        """Return the temporal type of the maps as dictionary with the
+        keys point, interval and invalid"""
+        start, end = self.get_time_points()
+        has_start = ~np.isnan(start)
+        has_end = ~np.isnan(end)
+        interval = int(np.count_nonzero(has_start & has_end))
+        point = int(np.count_nonzero(has_start & ~has_end))
+        return {"point": point, "interval": interval,
+                "invalid": len(self) - interval - point}
+
+    def take(self, indices):
+        """Return a new MapList with the maps at the given indices, the
+        map objects that were already created are shared
+
+        :param indices: A sequence of integer indices
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+        map_list = MapList(self.ids[indices], self.start[indices],
+                           self.end[indices],
+                           temporal_type=self.temporal_type,
+                           unit=self.unit, factory=self.factory)
+        for name in SPATIAL_COLUMNS:
+            setattr(map_list, name, getattr(self, name)[indices])
+        map_list._objects = [self._objects[i] for i in indices]
+        return map_list
+
+    def insert_gaps(self):
+        """Return a new MapList with a gap entry between the temporal
+        neighbors that are not adjacent or overlapping, the list must be
+        ordered by start time.
+
+        The gaps have the id None and a spatial extent of zero, they
+        start at the end time of the previous map (or its start time, in
+        case it is a time point) and end at the start time of the next map.
+        """
+        positions = np.nonzero(self.get_gap_mask())[0]
+        if not len(positions):
+            return self.take(np.arange(len(self)))
+        num = len(self) + len(positions)
+        # The index of each map in the new list
+        new_index = np.arange(len(self))
+        new_index[1:] += np.cumsum(self.get_gap_mask())
+        gap_index = new_index[positions] + 1
+        previous_end = np.where(self._isnull(self.end[positions]),
+                                self.start[positions], self.end[positions])
+
+        map_list = MapList(np.empty(num, dtype=object),
+                           np.empty(num, dtype=self.start.dtype),
+                           np.empty(num, dtype=self.end.dtype),
+                           temporal_type=self.temporal_type,
+                           unit=self.unit, factory=self.factory)
+        map_list.ids[new_index] = self.ids
+        map_list.ids[gap_index] = None
+        map_list.start[new_index] = self.start
+        map_list.start[gap_index] = previous_end
+        map_list.end[new_index] = self.end
+        map_list.end[gap_index] = self.start[positions + 1]
+        for name in SPATIAL_COLUMNS:
+            values = np.zeros(num, dtype=np.float64)
+            values[new_index] = getattr(self, name)
+            setattr(map_list, name, values)
+        for i, index in enumerate(new_index):
+            map_list._objects[index] = self._objects[i]
+        return map_list
+
+    def _isnull(self, values):
+        if self.is_time_absolute():
+            return np.isnat(values)
+        return np.isnan(values)
+
+    def to_objects(self):
+        """Return the list of all map objects"""
+        return [map for map in self]
+
+###############################################################################
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
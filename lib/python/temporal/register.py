@@ -17,8 +17,10 @@ for details.
 :authors: Soeren Gebbert
 """
 from datetime import datetime
+import threading
 import grass.script as gscript
 from .core import get_tgis_message_interface, init_dbif, get_current_mapset
+from .c_libraries_interface import CLibrariesInterface, RPCDefs
 from .open_stds import open_old_stds
 from .abstract_map_dataset import AbstractMapDataset
 from .factory import dataset_factory
@@ -30,7 +32,7 @@ from .datetime_math import check_datetime_string, increment_datetime_by_string,
 def register_maps_in_space_time_dataset(
     type, name, maps=None, file=None, start=None,
     end=None, unit=None, increment=None, dbif=None,
-    interval=False, fs="|", update_cmd_list=True):
+    interval=False, fs="|", update_cmd_list=True, nprocs=1):
     """Use this method to register maps in space time datasets.
 
        Additionally a start time string and an increment string can be
@@ -39,6 +41,12 @@ def register_maps_in_space_time_dataset(
        It takes care of the correct update of the space time datasets from all
        registered maps.
 
+       The maps are processed in chunks, the existence, the metadata and
+       the timestamps of the maps of the next chunk are read from the
+       spatial database in a background thread by nprocs C-library server
+       processes, while the current chunk is processed. The temporal
+       database is accessed with bulk statements.
+
        :param type: The type of the maps raster, raster_3d or vector
        :param name: The name of the space time dataset. Maps will be
                     registered in the temporal database if the name was set
@@ -63,6 +71,8 @@ def register_maps_in_space_time_dataset(
        :param fs: Field separator used in input file
        :param update_cmd_list: If is True, the command that was invoking this
                                process will be written to the process history
+       :param nprocs: The number of processes used to read the map
+                      information from the spatial database
     """
     start_time_in_file = False
     end_time_in_file = False
@@ -178,171 +188,224 @@ def register_maps_in_space_time_dataset(
 
     num_maps = len(maplist)
     map_object_list = []
-    statement = ""
+    statements = []
     # Store the ids of datasets that must be updated
     datatsets_to_modify = {}
 
     msgr.message(_("Gathering map information..."))
 
-    for count in range(len(maplist)):
-        if count % 50 == 0:
-            msgr.percent(count, num_maps, 1)
-
+    # Create the map objects and assign the time stamps that
+    # were provided as arguments or in the input file
+    map_time_list = []
+    for count in range(num_maps):
         # Get a new instance of the map type
         map = dataset_factory(type, maplist[count]["id"])
 
-        if map.map_exists() is not True:
-            msgr.fatal(_("Unable to update %(t)s map <%(id)s>. "
-                         "The map does not exist.") % {'t': map.get_type(),
-                                                       'id': map.get_map_id()})
-
         # Use the time data from file
         if "start" in maplist[count]:
             start = maplist[count]["start"]
         if "end" in maplist[count]:
             end = maplist[count]["end"]
 
-        is_in_db = False
-
-        # Put the map into the database
-        if not map.is_in_db(dbif):
-            # Break in case no valid time is provided
-            if (start == "" or start is None) and not map.has_grass_timestamp():
-                dbif.close()
-                if map.get_layer():
-                    msgr.fatal(_("Unable to register %(t)s map <%(id)s> with "
-                                 "layer %(l)s. The map has timestamp and "
-                                 "the start time is not set.") % {
-                               't': map.get_type(), 'id': map.get_map_id(),
-                               'l': map.get_layer()})
-                else:
-                    msgr.fatal(_("Unable to register %(t)s map <%(id)s>. The"
-                                 " map has no timestamp and the start time "
-                                 "is not set.") % {'t': map.get_type(),
-                                                   'id': map.get_map_id()})
-            if start != "" and start is not None:
-                # We need to check if the time is absolute and the unit was specified
-                time_object = check_datetime_string(start)
-                if isinstance(time_object, datetime) and unit:
-                    msgr.fatal(_("%(u)s= can only be set for relative time") %
-                               {'u': "unit"})
-                if not isinstance(time_object, datetime) and not unit:
-                    msgr.fatal(_("%(u)s= must be set in case of relative time"
-                                 " stamps") % {'u': "unit"})
-
-                if unit:
-                    map.set_time_to_relative()
-                else:
-                    map.set_time_to_absolute()
-
+        # In case the time is in the input file we ignore the increment
+        # counter
+        if start_time_in_file:
+            mult = 1
         else:
-            is_in_db = True
-            # Check the overwrite flag
-            if not gscript.overwrite():
-                if map.get_layer():
-                    msgr.warning(_("Map is already registered in temporal "
-                                   "database. Unable to update %(t)s map "
-                                   "<%(id)s> with layer %(l)s. Overwrite flag"
-                                   " is not set.") % {'t': map.get_type(),
-                                                      'id': map.get_map_id(),
-                                                      'l': str(map.get_layer())})
+            mult = count
+
+        map_time_list.append((map, start, end, mult))
+
+    # Check which maps are already in the temporal database
+    maps_in_db = _get_maps_in_db([entry[0] for entry in map_time_list], dbif)
+
+    ciface = CLibrariesInterface(nprocs=nprocs)
+    chunk_size = RPCDefs.CHUNK_SIZE * max(1, nprocs)
+    chunks = [map_time_list[i:i + chunk_size]
+              for i in range(0, num_maps, chunk_size)]
+
+    def read_chunk(chunk):
+        """Read the existence, the info and the timestamps of the maps"""
+        maptype = chunk[0][0].get_type()
+        ids = [entry[0].get_id() for entry in chunk]
+        exists = ciface.map_exists_many(ids, maptype)
+        if maptype == "raster":
+            infos = ciface.read_raster_info_many(ids)
+        elif maptype == "raster3d":
+            infos = ciface.read_raster3d_info_many(ids)
+        else:
+            infos = ciface.read_vector_info_many(ids)
+        # Timestamps are only required for new maps without time stamps
+        ts_ids = [entry[0].get_id() for entry in chunk
+                  if not entry[1] and entry[0].get_id() not in maps_in_db]
+        timestamps = {}
+        if ts_ids:
+            timestamps = dict(zip(ts_ids,
+                                  ciface.read_timestamps_many(ts_ids,
+                                                              maptype)))
+        return exists, infos, timestamps
+
+    count = 0
+    try:
+        for chunk, result in _prefetch_chunks(read_chunk, chunks):
+            msgr.percent(count, num_maps, 1)
+            exists, infos, timestamps = result
+
+            # Select the maps that are already in the temporal database
+            _select_maps([entry[0] for entry in chunk
+                          if entry[0].get_id() in maps_in_db], dbif)
+
+            for (map, start, end, mult), exist, kvp in zip(chunk, exists,
+                                                            infos):
+                count += 1
+                if exist is not True:
+                    msgr.fatal(_("Unable to update %(t)s map <%(id)s>. "
+                                 "The map does not exist.") %
+                               {'t': map.get_type(), 'id': map.get_map_id()})
+
+                is_in_db = False
+                timestamp = timestamps.get(map.get_id())
+
+                # Put the map into the database
+                if map.get_id() not in maps_in_db:
+                    # Break in case no valid time is provided
+                    if (start == "" or start is None) and \
+                       not _has_timestamp(map, timestamp):
+                        dbif.close()
+                        if map.get_layer():
+                            msgr.fatal(_("Unable to register %(t)s map "
+                                         "<%(id)s> with layer %(l)s. The map "
+                                         "has timestamp and the start time is"
+                                         " not set.") % {
+                                       't': map.get_type(),
+                                       'id': map.get_map_id(),
+                                       'l': map.get_layer()})
+                        else:
+                            msgr.fatal(_("Unable to register %(t)s map "
+                                         "<%(id)s>. The map has no timestamp "
+                                         "and the start time is not set.") %
+                                       {'t': map.get_type(),
+                                        'id': map.get_map_id()})
+                    if start != "" and start is not None:
+                        # We need to check if the time is absolute and the
+                        # unit was specified
+                        time_object = check_datetime_string(start)
+                        if isinstance(time_object, datetime) and unit:
+                            msgr.fatal(_("%(u)s= can only be set for "
+                                         "relative time") % {'u': "unit"})
+                        if not isinstance(time_object, datetime) and not unit:
+                            msgr.fatal(_("%(u)s= must be set in case of "
+                                         "relative time stamps") %
+                                       {'u': "unit"})
+
+                        if unit:
+                            map.set_time_to_relative()
+                        else:
+                            map.set_time_to_absolute()
+
+                else:
+                    is_in_db = True
+                    # Check the overwrite flag
+                    if not gscript.overwrite():
+                        if map.get_layer():
+                            msgr.warning(_("Map is already registered in "
+                                           "temporal database. Unable to "
+                                           "update %(t)s map <%(id)s> with "
+                                           "layer %(l)s. Overwrite flag is "
+                                           "not set.") % {
+                                         't': map.get_type(),
+                                         'id': map.get_map_id(),
+                                         'l': str(map.get_layer())})
+                        else:
+                            msgr.warning(_("Map is already registered in "
+                                           "temporal database. Unable to "
+                                           "update %(t)s map <%(id)s>. "
+                                           "Overwrite flag is not set.") %
+                                         {'t': map.get_type(),
+                                          'id': map.get_map_id()})
+
+                        # Simple registration is allowed
+                        if name:
+                            map_object_list.append(map)
+                        # Jump to next map
+                        continue
+
+                    # Save the datasets that must be updated
+                    datasets = map.get_registered_stds(select=False)
+                    if datasets is not None:
+                        for dataset in datasets:
+                            if dataset != "":
+                                datatsets_to_modify[dataset] = dataset
+
+                        if name and \
+                           map.get_temporal_type() != sp.get_temporal_type():
+                            dbif.close()
+                            if map.get_layer():
+                                msgr.fatal(_("Unable to update %(t)s map "
+                                             "<%(id)s> with layer %(l)s. The "
+                                             "temporal types are different.")
+                                           % {'t': map.get_type(),
+                                              'id': map.get_map_id(),
+                                              'l': map.get_layer()})
+                            else:
+                                msgr.fatal(_("Unable to update %(t)s map "
+                                             "<%(id)s>. The temporal types "
+                                             "are different.") %
+                                           {'t': map.get_type(),
+                                            'id': map.get_map_id()})
+
+                # Load the data from the grass file database
+                map.load(kvp=kvp)
+
+                # Try to read an existing time stamp from the grass spatial
+                # database in case this map wasn't already registered in the
+                # temporal database. Read the spatial database time stamp
+                # only, if no time stamp was provided for this map as
+                # method argument or in the input file
+                if not is_in_db and not start:
+                    map.read_timestamp_from_grass(timestamp=timestamp)
+
+                # Set the valid time
+                if start:
+                    assign_valid_time_to_map(ttype=map.get_temporal_type(),
+                                             map=map, start=start, end=end,
+                                             unit=unit, increment=increment,
+                                             mult=mult, interval=interval)
+
+                if is_in_db:
+                    #  Gather the SQL update statements
+                    statements += map.update_all(dbif=dbif, execute=False,
+                                                 mogrify=False)
                 else:
-                    msgr.warning(_("Map is already registered in temporal "
-                                   "database. Unable to update %(t)s map "
-                                   "<%(id)s>. Overwrite flag is not set.") %
-                                 {'t': map.get_type(), 'id': map.get_map_id()})
+                    #  Gather the SQL insert statements
+                    statements += map.insert(dbif=dbif, execute=False,
+                                             mogrify=False)
 
-                # Simple registration is allowed
+                # Store the maps in a list to register in a space time dataset
                 if name:
                     map_object_list.append(map)
-                # Jump to next map
-                continue
-
-            # Select information from temporal database
-            map.select(dbif)
-
-            # Save the datasets that must be updated
-            datasets = map.get_registered_stds(dbif)
-            if datasets is not None:
-                for dataset in datasets:
-                    if dataset != "":
-                        datatsets_to_modify[dataset] = dataset
-
-                if name and map.get_temporal_type() != sp.get_temporal_type():
-                    dbif.close()
-                    if map.get_layer():
-                        msgr.fatal(_("Unable to update %(t)s map <%(id)s> "
-                                     "with layer %(l)s. The temporal types "
-                                     "are different.") % {'t': map.get_type(),
-                                                          'id': map.get_map_id(),
-                                                          'l': map.get_layer()})
-                    else:
-                        msgr.fatal(_("Unable to update %(t)s map <%(id)s>. "
-                                     "The temporal types are different.") %
-                                   {'t': map.get_type(),
-                                    'id': map.get_map_id()})
-
-        # Load the data from the grass file database
-        map.load()
-
-        # Try to read an existing time stamp from the grass spatial database
-        # in case this map wasn't already registered in the temporal database
-        # Read the spatial database time stamp only, if no time stamp was provided for this map
-        # as method argument or in the input file
-        if not is_in_db and not start:
-            map.read_timestamp_from_grass()
-
-        # Set the valid time
-        if start:
-            # In case the time is in the input file we ignore the increment
-            # counter
-            if start_time_in_file:
-                count = 1
-            assign_valid_time_to_map(ttype=map.get_temporal_type(),
-                                     map=map, start=start, end=end, unit=unit,
-                                     increment=increment, mult=count,
-                                     interval=interval)
-
-        if is_in_db:
-            #  Gather the SQL update statement
-            statement += map.update_all(dbif=dbif, execute=False)
-        else:
-            #  Gather the SQL insert statement
-            statement += map.insert(dbif=dbif, execute=False)
-
-        # Sqlite3 performance is better for huge datasets when committing in
-        # small chunks
-        if dbif.get_dbmi().__name__ == "sqlite3":
-            if count % 100 == 0:
-                if statement is not None and statement != "":
-                    dbif.execute_transaction(statement)
-                    statement = ""
-
-        # Store the maps in a list to register in a space time dataset
-        if name:
-            map_object_list.append(map)
+    finally:
+        ciface.stop()
 
     msgr.percent(num_maps, num_maps, 1)
 
-    if statement is not None and statement != "":
+    if statements:
         msgr.message(_("Registering maps in the temporal database..."))
-        dbif.execute_transaction(statement)
+        dbif.execute_batch(statements)
 
     # Finally Register the maps in the space time dataset
     if name and map_object_list:
-        count = 0
-        num_maps = len(map_object_list)
         msgr.message(_("Registering maps in the space time dataset..."))
-        for map in map_object_list:
-            if count % 50 == 0:
-                msgr.percent(count, num_maps, 1)
-            sp.register_map(map=map, dbif=dbif)
-            count += 1
+        registered_maps = sp.register_maps(map_object_list, dbif=dbif)
 
     # Update the space time tables
     if name and map_object_list:
         msgr.message(_("Updating space time dataset..."))
-        sp.update_from_registered_maps(dbif)
+        if sp.get_id() in datatsets_to_modify:
+            # Maps of the dataset were modified, hence all maps are required
+            sp.update_from_registered_maps(dbif)
+        else:
+            sp.update_from_registered_maps(dbif, added=registered_maps)
         if update_cmd_list is True:
             sp.update_command_string(dbif=dbif)
 
@@ -364,6 +427,138 @@ def register_maps_in_space_time_dataset(
     msgr.percent(num_maps, num_maps, 1)
 
 
+###############################################################################
+
+
+def _prefetch_chunks(function, chunks):
+    """Iterate over the chunks and the results of function for each chunk,
+       the result of the next chunk is computed in a background thread
+       while the current chunk is processed by the caller
+
+       :param function: The function that is called with a chunk
+       :param chunks: A list of chunks
+       :return: A generator of (chunk, result) tuples
+    """
+    results = {}
+
+    def run(i):
+        try:
+            results[i] = (True, function(chunks[i]))
+        except Exception as e:
+            results[i] = (False, e)
+
+    thread = None
+    try:
+        for i in range(len(chunks)):
+            if thread is None:
+                thread = threading.Thread(target=run, args=(i,))
+                thread.daemon = True
+                thread.start()
+            thread.join()
+            thread = None
+            success, result = results.pop(i)
+            if not success:
+                raise result
+            if i + 1 < len(chunks):
+                thread = threading.Thread(target=run, args=(i + 1,))
+                thread.daemon = True
+                thread.start()
+            yield chunks[i], result
+    finally:
+        if thread is not None:
+            thread.join()
+
+
+def _get_maps_in_db(maps, dbif):
+    """Return the set of map ids that are present in the temporal database
+
+       :param maps: A list of AbstractMapDataset objects of the same type
+       :param dbif: The database interface to be used
+       :return: A set of map ids
+    """
+    maps_in_db = set()
+    for mapset, chunk in _split_maps_by_mapset(maps):
+        sql = "SELECT id FROM " + chunk[0].base.get_table_name() + \
+              " WHERE id IN (" + \
+              ",".join([_get_placeholder(dbif, mapset)] * len(chunk)) + ")"
+        dbif.execute(sql, tuple([map.get_id() for map in chunk]),
+                     mapset=mapset)
+        for row in dbif.fetchall(mapset=mapset):
+            maps_in_db.add(row[0])
+    return maps_in_db
+
+
+def _select_maps(maps, dbif):
+    """Select the content of maps from the temporal database with a single
+       SELECT statement for each table and chunk of maps
+
+       :param maps: A list of AbstractMapDataset objects of the same type
+                    that are present in the temporal database
+       :param dbif: The database interface to be used
+    """
+    for mapset, chunk in _split_maps_by_mapset(maps):
+        # The base must be selected first, since the temporal extent
+        # depends on the temporal type stored in base
+        for attr in ("base", "temporal_extent", "spatial_extent",
+                     "metadata", "stds_register"):
+            tables = {}
+            for map in chunk:
+                obj = getattr(map, attr)
+                tables.setdefault(obj.get_table_name(), []).append(obj)
+
+            for table, objs in tables.items():
+                sql = "SELECT " + " , ".join(objs[0].D.keys()) + " FROM " + \
+                      table + " WHERE id IN (" + \
+                      ",".join([_get_placeholder(dbif, mapset)] * len(objs)) + ")"
+                dbif.execute(sql, tuple([obj.ident for obj in objs]),
+                             mapset=mapset)
+                rows = dict([(row["id"], row)
+                             for row in dbif.fetchall(mapset=mapset)])
+                for obj in objs:
+                    row = rows.get(obj.ident)
+                    if row is not None:
+                        obj.deserialize(row)
+
+
+def _split_maps_by_mapset(maps, size=500):
+    """Split a list of maps into chunks of maps from the same mapset,
+       the chunk size respects the SQLite limit of host parameters
+
+       :param maps: A list of AbstractMapDataset objects
+       :param size: The maximum number of maps in a chunk
+       :return: A list of (mapset, maps) tuples
+    """
+    mapsets = {}
+    for map in maps:
+        mapsets.setdefault(map.get_mapset(), []).append(map)
+
+    chunks = []
+    for mapset in mapsets:
+        mapset_maps = mapsets[mapset]
+        for i in range(0, len(mapset_maps), size):
+            chunks.append((mapset, mapset_maps[i:i + size]))
+    return chunks
+
+
+def _get_placeholder(dbif, mapset):
+    """Return the parameter placeholder of the database backend"""
+    if dbif.get_dbmi(mapset).paramstyle == "qmark":
+        return "?"
+    return "%s"
+
+
+def _has_timestamp(map, timestamp):
+    """Check if a map has a file based timestamp
+
+       :param map: An AbstractMapDataset object
+       :param timestamp: The (check, dates) tuple read with
+                         CLibrariesInterface.read_timestamps_many() or None
+    """
+    if timestamp is None:
+        return map.has_grass_timestamp()
+    return timestamp[0] != 0
+
+
 ###############################################################################
 
 def assign_valid_time_to_map(ttype, map, start, end, unit, increment=None,
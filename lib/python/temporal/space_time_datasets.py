@@ -230,20 +230,29 @@ class RasterDataset(AbstractMapDataset):
         return self.ciface.has_raster_timestamp(self.get_name(),
                                                 self.get_mapset())
 
-    def read_timestamp_from_grass(self):
+    def read_timestamp_from_grass(self, timestamp=None):
         """Read the timestamp of this map from the map metadata
            in the grass file system based spatial database and
            set the internal time stamp that should be insert/updated
            in the temporal database.
 
+           :param timestamp: The tuple (check, dates) of this map that was
+                             already read with
+                             CLibrariesInterface.read_timestamps_many(),
+                             if None the timestamp is read from the map
            :return: True if success, False on error
         """
 
-        if not self.has_grass_timestamp():
-            return False
+        if timestamp is None:
+            if not self.has_grass_timestamp():
+                return False
 
-        check, dates = self.ciface.read_raster_timestamp(self.get_name(),
-                                                         self.get_mapset(),)
+            check, dates = self.ciface.read_raster_timestamp(self.get_name(),
+                                                             self.get_mapset(),)
+        else:
+            check, dates = timestamp
+            if check == 0:
+                return False
 
         if check < 1:
             self.msgr.error(_("Unable to read timestamp file "
@@ -311,26 +320,31 @@ class RasterDataset(AbstractMapDataset):
         return self.ciface.raster_map_exists(self.get_name(),
                                              self.get_mapset())
 
-    def load(self):
+    def load(self, kvp=None):
         """Load all info from an existing raster map into the internal structure
 
            This method checks first if the map exists, in case it exists
            the metadata of the map is put into this object and True is returned
 
+           :param kvp: The key value pairs of the map info that were already
+                       read with the bulk methods of CLibrariesInterface,
+                       if None the existence of the map is checked and
+                       its info is read
            :return: True is the map exists and the metadata was filled
                     successfully and getting the data was successful,
                     False otherwise
         """
 
-        if self.map_exists() is not True:
-            return False
+        if kvp is None:
+            if self.map_exists() is not True:
+                return False
+
+            kvp = self.ciface.read_raster_info(self.get_name(),
+                                               self.get_mapset())
 
         # Fill base information
         self.base.set_creator(str(getpass.getuser()))
 
-        kvp = self.ciface.read_raster_info(self.get_name(),
-                                           self.get_mapset())
-
         if kvp:
             # Fill spatial extent
             self.set_spatial_extent_from_values(north=kvp["north"],
@@ -578,20 +592,29 @@ class Raster3DDataset(AbstractMapDataset):
         return self.ciface.has_raster3d_timestamp(self.get_name(),
                                                   self.get_mapset())
 
-    def read_timestamp_from_grass(self):
+    def read_timestamp_from_grass(self, timestamp=None):
         """Read the timestamp of this map from the map metadata
            in the grass file system based spatial database and
            set the internal time stamp that should be insert/updated
            in the temporal database.
 
+           :param timestamp: The tuple (check, dates) of this map that was
+                             already read with
+                             CLibrariesInterface.read_timestamps_many(),
+                             if None the timestamp is read from the map
            :return: True if success, False on error
         """
 
-        if not self.has_grass_timestamp():
-            return False
+        if timestamp is None:
+            if not self.has_grass_timestamp():
+                return False
 
-        check, dates = self.ciface.read_raster3d_timestamp(self.get_name(),
-                                                           self.get_mapset(),)
+            check, dates = self.ciface.read_raster3d_timestamp(self.get_name(),
+                                                               self.get_mapset(),)
+        else:
+            check, dates = timestamp
+            if check == 0:
+                return False
 
         if check < 1:
             self.msgr.error(_("Unable to read timestamp file "
@@ -656,26 +679,32 @@ class Raster3DDataset(AbstractMapDataset):
         return self.ciface.raster3d_map_exists(self.get_name(),
                                                self.get_mapset())
 
-    def load(self):
+    def load(self, kvp=None):
         """Load all info from an existing 3d raster map into the internal structure
 
            This method checks first if the map exists, in case it exists
            the metadata of the map is put into this object and True is returned
 
+           :param kvp: The key value pairs of the map info that were already
+                       read with the bulk methods of CLibrariesInterface,
+                       if None the existence of the map is checked and
+                       its info is read
            :return: True is the map exists and the metadata was filled
                     successfully and getting the data was successful,
                     False otherwise
         """
 
-        if self.map_exists() is not True:
-            return False
+        if kvp is None:
+            if self.map_exists() is not True:
+                return False
+
+            kvp = self.ciface.read_raster3d_info(self.get_name(),
+                                                 self.get_mapset())
 
         # Fill base information
         self.base.set_creator(str(getpass.getuser()))
 
         # Fill spatial extent
-        kvp = self.ciface.read_raster3d_info(self.get_name(),
-                                             self.get_mapset())
 
         if kvp:
             self.set_spatial_extent_from_values(north=kvp["north"],
@@ -888,18 +917,28 @@ class VectorDataset(AbstractMapDataset):
                                                 self.get_mapset(),
                                                 self.get_layer())
 
-    def read_timestamp_from_grass(self):
+    def read_timestamp_from_grass(self, timestamp=None):
         """Read the timestamp of this map from the map metadata
            in the grass file system based spatial database and
            set the internal time stamp that should be insert/updated
            in the temporal database.
+
+           :param timestamp: The tuple (check, dates) of this map that was
+                             already read with
+                             CLibrariesInterface.read_timestamps_many(),
+                             if None the timestamp is read from the map
         """
 
-        if not self.has_grass_timestamp():
-            return False
+        if timestamp is None:
+            if not self.has_grass_timestamp():
+                return False
 
-        check, dates = self.ciface.read_vector_timestamp(self.get_name(),
-                                                         self.get_mapset(),)
+            check, dates = self.ciface.read_vector_timestamp(self.get_name(),
+                                                             self.get_mapset(),)
+        else:
+            check, dates = timestamp
+            if check == 0:
+                return False
 
         if check < 1:
             self.msgr.error(_("Unable to read timestamp file "
@@ -960,29 +999,33 @@ class VectorDataset(AbstractMapDataset):
         return self.ciface.vector_map_exists(self.get_name(),
                                              self.get_mapset())
 
-    def load(self):
+    def load(self, kvp=None):
 
         """Load all info from an existing vector map into the internal structure
 
            This method checks first if the map exists, in case it exists
            the metadata of the map is put into this object and True is returned
 
+           :param kvp: The key value pairs of the map info that were already
+                       read with the bulk methods of CLibrariesInterface,
+                       if None the existence of the map is checked and
+                       its info is read
            :return: True is the map exists and the metadata was filled
                     successfully and getting the data was successful,
                     False otherwise
         """
 
-        if self.map_exists() is not True:
-            return False
+        if kvp is None:
+            if self.map_exists() is not True:
+                return False
+
+            # Get the data from an existing vector map
+            kvp = self.ciface.read_vector_info(self.get_name(),
+                                               self.get_mapset())
 
         # Fill base information
         self.base.set_creator(str(getpass.getuser()))
 
-        # Get the data from an existing vector map
-
-        kvp = self.ciface.read_vector_info(self.get_name(),
-                                           self.get_mapset())
-
         if kvp:
             # Fill spatial extent
             self.set_spatial_extent_from_values(north=kvp["north"],
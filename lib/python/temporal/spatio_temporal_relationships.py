@@ -19,9 +19,11 @@ for details.
 """
 from __future__ import print_function
 from datetime import datetime
+import numpy as np
 from .core import init_dbif
 from .abstract_dataset import AbstractDatasetComparisonKeyStartTime
 from .datetime_math import time_delta_to_relative_time_seconds
+from .map_list import MapList
 import grass.lib.vector as vector
 import grass.lib.rtree as rtree
 import grass.lib.gis as gis
@@ -590,6 +592,314 @@ class SpatioTemporalTopologyBuilder(object):
 ###############################################################################
 
 
+#: The temporal relations in the order in which they are checked by
+#: TemporalExtent.temporal_relation(), the index 0 is no relation
+TEMPORAL_RELATIONS = np.array([None, "equal", "during", "contains",
+                               "overlaps", "overlapped", "after", "before",
+                               "starts", "finishes", "started", "finished",
+                               "follows", "precedes"], dtype=object)
+
+
+def _get_time_arrays(map_list):
+    """Return the start and end times of a MapList as numeric arrays
+       (microseconds or relative time units) and two boolean arrays that
+       are True for the maps that have a start and an end time
+    """
+    if map_list.is_time_absolute():
+        has_start = ~np.isnat(map_list.start)
+        has_end = ~np.isnat(map_list.end)
+        return (map_list.start.astype(np.int64),
+                map_list.end.astype(np.int64), has_start, has_end)
+    return (map_list.start, map_list.end, ~np.isnan(map_list.start),
+            ~np.isnan(map_list.end))
+
+
+def compute_temporal_relations(startA, endA, has_endA, startB, endB,
+                               has_endB):
+    """Compute the temporal relations of the maps B to the maps A, this is
+       the vectorized version of TemporalExtent.temporal_relation() called
+       as B.temporal_relation(A) for each pair of maps.
+
+       The start times of all maps must be valid, the end times are only
+       used where has_end is True.
+
+       :param startA: The start times of the maps A as NumPy array
+       :param endA: The end times of the maps A as NumPy array
+       :param has_endA: A boolean array, True for the maps A with end time
+       :param startB: The start times of the maps B as NumPy array
+       :param endB: The end times of the maps B as NumPy array
+       :param has_endB: A boolean array, True for the maps B with end time
+       :return: An object array with the relation names, None if no
+                relation was found
+
+       .. code-block:: python
+
+           >>> import numpy as np
+           >>> relations = compute_temporal_relations(
+           ...     np.array([0, 0, 2, 1]), np.array([2, 2, 0, 3]),
+           ...     np.array([True, True, False, True]),
+           ...     np.array([0, 2, 2, 0]), np.array([2, 4, 0, 2]),
+           ...     np.array([True, True, False, True]))
+           >>> list(relations)
+           ['equal', 'follows', 'equal', 'overlaps']
+
+    """
+    both = has_endA & has_endB
+    point_a = ~has_endA
+    point_b = ~has_endB
+    with np.errstate(invalid="ignore"):
+        conditions = [
+            # equal
+            (point_b & point_a & (startB == startA)) |
+            (both & (startB == startA) & (endB == endA)),
+            # during
+            has_endA & ((point_b & (startB >= startA) & (startB < endA)) |
+                        (has_endB & (startB > startA) & (endB < endA))),
+            # contains
+            has_endB & ((point_a & (startB <= startA) & (endB > startA)) |
+                        (has_endA & (startB < startA) & (endB > endA))),
+            # overlaps
+            both & (startB < startA) & (endB < endA) & (endB > startA),
+            # overlapped
+            both & (startB > startA) & (endB > endA) & (startB < endA),
+            # after
+            (point_a & (startB > startA)) | (has_endA & (startB > endA)),
+            # before
+            (point_b & (startB < startA)) | (has_endB & (endB < startA)),
+            # starts
+            both & (startB == startA) & (endB < endA),
+            # finishes
+            both & (endB == endA) & (startB > startA),
+            # started
+            both & (startB == startA) & (endB > endA),
+            # finished
+            both & (endB == endA) & (startB < startA),
+            # follows
+            has_endA & (startB == endA),
+            # precedes
+            has_endB & (endB == startA)]
+    codes = np.select(conditions, range(1, len(TEMPORAL_RELATIONS)),
+                      default=0)
+    return TEMPORAL_RELATIONS[codes]
+
+
+class SweepLineTopologyBuilder(SpatioTemporalTopologyBuilder):
+    """This class builds the same spatio-temporal topology as the
+       SpatioTemporalTopologyBuilder, but without an R*-Tree.
+
+       The start and end times of all maps are stored in NumPy arrays,
+       the maps of the first list are sorted by start time and the
+       temporally overlapping maps are found with a sweep over the sorted
+       start times and the running maximum of the end times. The spatial
+       overlap of the bounding boxes and the temporal relations of all
+       candidate pairs are computed in bulk with NumPy. Only the spatial
+       relations, if requested, are computed for each pair of maps.
+
+       The map lists can be lists of map objects or MapList objects.
+
+       .. code-block:: python
+
+           >>> import grass.temporal as tgis
+           >>> import datetime
+           >>> tgis.init()
+           >>> mapsA = []
+           >>> for i in range(4):
+           ...     start = datetime.datetime(2000, 1, 1, 0, 0, i)
+           ...     end = datetime.datetime(2000, 1, 1, 0, 0, i + 2)
+           ...     map = tgis.RasterDataset("a%i@B" % i)
+           ...     check = map.set_absolute_time(start, end)
+           ...     mapsA.append(map)
+           >>> def get_relations(maps):
+           ...     result = []
+           ...     for map in maps:
+           ...         relations = map.get_temporal_relations()
+           ...         result.append(sorted((key, sorted(m.get_id() for m in
+           ...                                           relations[key]))
+           ...                              for key in relations
+           ...                              if key not in ["NEXT", "PREV"]))
+           ...     return result
+           >>> tb = tgis.SpatioTemporalTopologyBuilder()
+           >>> tb.build(mapsA)
+           >>> expected = get_relations(mapsA)
+           >>> tb = tgis.SweepLineTopologyBuilder()
+           >>> tb.build(mapsA)
+           >>> get_relations(mapsA) == expected
+           True
+           >>> get_relations(mapsA)[0]
+           [('OVERLAPS', ['a1@B']), ('PRECEDES', ['a2@B'])]
+           >>> [map.get_id() for map in tb]
+           ['a0@B', 'a1@B', 'a2@B', 'a3@B']
+
+    """
+    def __init__(self, chunk_size=1000000):
+        """Constructor
+
+           :param chunk_size: The maximum number of candidate map pairs
+                              that are processed at once
+        """
+        SpatioTemporalTopologyBuilder.__init__(self)
+        self.chunk_size = chunk_size
+
+    def _build_iteratable(self, maps, spatial):
+        """Build an iteratable temporal topology structure for
+           all maps in the list
+
+           Maps stored in a MapList are ordered using the start time array,
+           other lists are handled by SpatioTemporalTopologyBuilder.
+
+           :param maps: A MapList or a list of abstract_dataset
+                        objects with initiated temporal extent
+        """
+        if not isinstance(maps, MapList):
+            return SpatioTemporalTopologyBuilder._build_iteratable(self, maps,
+                                                                   spatial)
+
+        start, end, has_start, has_end = _get_time_arrays(maps)
+        # A stable sort, like sorted() with the start time comparison key
+        sorted_maps = [maps[i] for i in np.argsort(start, kind="mergesort")]
+
+        for i in range(len(sorted_maps) - 1):
+            sorted_maps[i].set_next(sorted_maps[i + 1])
+
+        for map_ in sorted_maps:
+            next_ = map_.next()
+            if next_:
+                next_.set_prev(map_)
+            map_.set_temporal_topology_build_true()
+            if spatial is not None:
+                map_.set_spatial_topology_build_true()
+
+    def _get_candidates(self, listA, listB, spatial=None):
+        """Return the pairs of maps of the two lists whose temporal extents
+           and, if spatial is set, whose bounding boxes overlap or touch,
+           like the R*-Tree search of the SpatioTemporalTopologyBuilder
+
+           The pairs are yielded in chunks as two arrays of indices in
+           listA and listB.
+
+           :param listA: A MapList
+           :param listB: A MapList
+           :param spatial: None, "2D" or "3D"
+        """
+        startA, endA, has_startA, has_endA = _get_time_arrays(listA)
+        startB, endB, has_startB, has_endB = _get_time_arrays(listB)
+        # Time points are handled as intervals of length zero
+        endA = np.where(has_endA, endA, startA)
+        endB = np.where(has_endB, endB, startB)
+
+        # Sort the maps A by start time and compute the running maximum of
+        # their end times, all maps A before the index lo end before the
+        # start of map B, all maps A from the index hi start after its end
+        order = np.nonzero(has_startA)[0]
+        order = order[np.argsort(startA[order], kind="mergesort")]
+        if not len(order):
+            return
+        max_end = np.maximum.accumulate(endA[order])
+        hi = np.searchsorted(startA[order], endB, side="right")
+        lo = np.searchsorted(max_end, startB, side="left")
+        counts = np.where(has_startB, np.maximum(hi - lo, 0), 0)
+        offsets = np.cumsum(counts) - counts
+
+        if spatial == "3D":
+            sides = ("west", "east", "south", "north", "bottom", "top")
+        elif spatial == "2D":
+            sides = ("west", "east", "south", "north")
+        else:
+            sides = ()
+
+        first = 0
+        while first < len(listB):
+            last = np.searchsorted(offsets, offsets[first] + self.chunk_size,
+                                   side="left")
+            last = max(last, first + 1)
+            num = counts[first:last]
+            indexB = np.repeat(np.arange(first, last), num)
+            position = (np.arange(len(indexB)) -
+                        np.repeat(offsets[first:last] - offsets[first], num) +
+                        np.repeat(lo[first:last], num))
+            indexA = order[position]
+            keep = endA[indexA] >= startB[indexB]
+            with np.errstate(invalid="ignore"):
+                for low, high in zip(sides[0::2], sides[1::2]):
+                    keep &= ((getattr(listA, low)[indexA] <=
+                              getattr(listB, high)[indexB]) &
+                             (getattr(listA, high)[indexA] >=
+                              getattr(listB, low)[indexB]))
+            yield indexA[keep], indexB[keep]
+            first = last
+
+    def build(self, mapsA, mapsB=None, spatial=None):
+        """Build the spatio-temporal topology structure between
+           one or two unordered lists of abstract dataset objects
+
+           The result is the same as the result of
+           SpatioTemporalTopologyBuilder.build().
+
+           :param mapsA: A MapList or a list of abstract_dataset
+                         objects with initiated spatio-temporal extent
+           :param mapsB: An optional MapList or list of abstract_dataset
+                         objects with initiated spatio-temporal extent
+           :param spatial: This indicates if the spatial topology is created
+                           as well: spatial can be None (no spatial topology),
+                           "2D" using west, east, south, north or "3D" using
+                           west, east, south, north, bottom, top
+        """
+
+        identical = False
+        if mapsA == mapsB:
+            identical = True
+
+        if mapsB is None:
+            mapsB = mapsA
+            identical = True
+
+        if not isinstance(mapsA, MapList):
+            mapsA = MapList.from_objects(mapsA)
+        if identical:
+            mapsB = mapsA
+        elif not isinstance(mapsB, MapList):
+            mapsB = MapList.from_objects(mapsB)
+
+        for map_ in mapsA:
+            map_.reset_topology()
+
+        if not identical:
+            for map_ in mapsB:
+                map_.reset_topology()
+
+        startA, endA, has_startA, has_endA = _get_time_arrays(mapsA)
+        startB, endB, has_startB, has_endB = _get_time_arrays(mapsB)
+
+        # The temporal relation of relative times with different units is
+        # not defined
+        compare = (mapsA.temporal_type == mapsB.temporal_type and
+                   (mapsA.is_time_absolute() or mapsA.unit == mapsB.unit))
+
+        for indexA, indexB in self._get_candidates(mapsA, mapsB, spatial):
+            if compare:
+                relations = compute_temporal_relations(
+                    startA[indexA], endA[indexA], has_endA[indexA],
+                    startB[indexB], endB[indexB], has_endB[indexB])
+            else:
+                relations = TEMPORAL_RELATIONS[np.zeros(len(indexA),
+                                                        dtype=int)]
+
+            for i, j, relation in zip(indexA, indexB, relations):
+                A = mapsA[i]
+                B = mapsB[j]
+                set_temoral_relationship(A, B, relation)
+
+                if spatial is not None:
+                    relation = B.spatial_relation(A)
+                    set_spatial_relationship(A, B, relation)
+
+        self._build_internal_iteratable(mapsA, spatial)
+        if not identical and mapsB is not None:
+            self._build_iteratable(mapsB, spatial)
+
+###############################################################################
+
+
 def set_temoral_relationship(A, B, relation):
     if relation == "equal" or relation == "equals":
         if A != B:
@@ -777,7 +1087,7 @@ def print_temporal_topology_relationships(maps1, maps2=None, dbif=None):
         :param dbif: The database interface to be used
     """
 
-    tb = SpatioTemporalTopologyBuilder()
+    tb = SweepLineTopologyBuilder()
 
     tb.build(maps1, maps2)
 
@@ -810,7 +1120,7 @@ def print_spatio_temporal_topology_relationships(maps1, maps2=None,
         :param dbif: The database interface to be used
     """
 
-    tb = SpatioTemporalTopologyBuilder()
+    tb = SweepLineTopologyBuilder()
 
     tb.build(maps1, maps2, spatial)
 
@@ -841,7 +1151,7 @@ def count_temporal_topology_relationships(maps1, maps2=None, dbif=None):
         :return: A dictionary with counted temporal relationships
     """
 
-    tb = SpatioTemporalTopologyBuilder()
+    tb = SweepLineTopologyBuilder()
     tb.build(maps1, maps2)
 
     dbif, connected = init_dbif(dbif)
@@ -442,7 +442,6 @@ from __future__ import print_function
 
 try:
     import ply.lex as lex
-    import ply.yacc as yacc
 except:
     pass
 
@@ -460,8 +459,8 @@ from .abstract_map_dataset import AbstractMapDataset
 from .space_time_datasets import RasterDataset
 from .factory import dataset_factory
 from .open_stds import open_new_stds, open_old_stds
-from .temporal_operator import TemporalOperatorParser
-from .spatio_temporal_relationships import SpatioTemporalTopologyBuilder
+from .temporal_operator import TemporalOperatorParser, build_cached_parser
+from .spatio_temporal_relationships import SweepLineTopologyBuilder
 from .datetime_math import time_delta_to_relative_time, string_to_datetime
 from .abstract_space_time_dataset import AbstractSpaceTimeDataset
 from .temporal_granularity import compute_absolute_time_granularity
@@ -895,7 +894,7 @@ class TemporalAlgebraParser(object):
         """
         self.lexer = TemporalAlgebraLexer()
         self.lexer.build()
-        self.parser = yacc.yacc(module=self, debug=self.debug, write_tables=False)
+        self.parser = build_cached_parser(self, debug=self.debug)
 
         self.overwrite = overwrite
         self.count = 0
@@ -1479,7 +1478,7 @@ class TemporalAlgebraParser(object):
         resultdict = {}
 
         # Create spatio-temporal topology for maplistA to maplistB.
-        tb = SpatioTemporalTopologyBuilder()
+        tb = SweepLineTopologyBuilder()
         if len(spatial_topo_list) > 0:
             # Dictionary with different spatial variables used for topology builder.
             spatialdict = {'strds' : '2D', 'stvds' : '2D', 'str3ds' : '3D'}
@@ -1780,7 +1779,7 @@ class TemporalAlgebraParser(object):
               raise SyntaxError("Unpermitted temporal relation name '" + topo + "'")
 
         # Create temporal topology for maplistA to maplistB.
-        tb = SpatioTemporalTopologyBuilder()
+        tb = SweepLineTopologyBuilder()
         # Dictionary with different spatial variables used for topology builder.
         spatialdict = {'strds' : '2D', 'stvds' : '2D', 'str3ds' : '3D'}
         # Build spatial temporal topology for maplistB to maplistB.
@@ -20,6 +20,7 @@ for details.
 from __future__ import print_function
 from .datetime_math import *
 from .core import get_tgis_message_interface
+from .map_list import MapList
 from functools import reduce
 from collections import OrderedDict
 import ast
@@ -113,6 +114,25 @@ def check_granularity_string(granularity, temporal_type):
 ###############################################################################
 
 
+def _get_extents_and_gaps(maps):
+    """Return the list of the temporal extent tuples of the maps and a
+       list with a True entry for each map that is followed by a gap
+
+       A MapList is processed without creating the map objects.
+
+       :param maps: a ordered by start_time list of map objects or a MapList
+    """
+    if isinstance(maps, MapList):
+        return maps.get_temporal_extents(), maps.get_gap_mask()
+
+    extents = [map.get_temporal_extent_as_tuple() for map in maps]
+    gaps = [maps[i + 1].temporal_relation(maps[i]) == "after"
+            for i in range(len(maps) - 1)]
+    return extents, gaps
+
+###############################################################################
+
+
 def compute_relative_time_granularity(maps):
     """Compute the relative time granularity
 
@@ -120,7 +140,8 @@ def compute_relative_time_granularity(maps):
         is only correct in case of not overlapping intervals.
         Hence a correct temporal topology is required for computation.
 
-        :param maps: a ordered by start_time list of map objects
+        :param maps: a ordered by start_time list of map objects or a
+                     MapList
         :return: An integer
 
 
@@ -226,9 +247,9 @@ def compute_relative_time_granularity(maps):
     # The interval time must be scaled to days resolution
     granularity = None
     delta = []
+    extents, gaps = _get_extents_and_gaps(maps)
     # First we compute the timedelta of the intervals
-    for map in maps:
-        start, end = map.get_temporal_extent_as_tuple()
+    for start, end in extents:
         if (start == 0 or start) and end:
             t = abs(end - start)
             delta.append(int(t))
@@ -236,10 +257,9 @@ def compute_relative_time_granularity(maps):
     # Compute the timedelta of the gaps
     for i in range(len(maps)):
         if i < len(maps) - 1:
-            relation = maps[i + 1].temporal_relation(maps[i])
-            if relation == "after":
-                start1, end1 = maps[i].get_temporal_extent_as_tuple()
-                start2, end2 = maps[i + 1].get_temporal_extent_as_tuple()
+            if gaps[i]:
+                start1, end1 = extents[i]
+                start2, end2 = extents[i + 1]
                 # Gaps are between intervals, intervals and
                 # points, points and points
                 if end1 and start2:
@@ -274,7 +294,8 @@ def compute_absolute_time_granularity(maps):
         The computed granularity is returned as number of seconds or minutes
         or hours or days or months or years.
 
-        :param maps: a ordered by start_time list of map objects
+        :param maps: a ordered by start_time list of map objects or a
+                     MapList
         :return: The temporal topology as string "integer unit"
 
         .. code-block:: python
@@ -361,9 +382,9 @@ def compute_absolute_time_granularity(maps):
 
     delta = []
     datetime_delta = []
+    extents, gaps = _get_extents_and_gaps(maps)
     # First we compute the timedelta of the intervals
-    for map in maps:
-        start, end = map.get_temporal_extent_as_tuple()
+    for start, end in extents:
         if start and end:
             delta.append(end - start)
             datetime_delta.append(compute_datetime_delta(start, end))
@@ -371,10 +392,9 @@ def compute_absolute_time_granularity(maps):
     # Compute the timedelta of the gaps
     for i in range(len(maps)):
         if i < len(maps) - 1:
-            relation = maps[i + 1].temporal_relation(maps[i])
-            if relation == "after":
-                start1, end1 = maps[i].get_temporal_extent_as_tuple()
-                start2, end2 = maps[i + 1].get_temporal_extent_as_tuple()
+            if gaps[i]:
+                start1, end1 = extents[i]
+                start2, end2 = extents[i + 1]
                 # Gaps are between intervals, intervals and
                 # points, points and points
                 if end1 and start2:
@@ -140,6 +140,9 @@ for details.
 
 """
 from __future__ import print_function
+import hashlib
+import os
+import sys
 
 try:
     import ply.lex as lex
@@ -147,6 +150,83 @@ try:
 except:
     pass
 
+
+def get_parser_cache_dir():
+    """Return the directory in which the LALR tables of the temporal
+    parsers are cached, or None if the cache is disabled
+
+    The directory can be set with the GRASS_TGIS_PARSER_CACHE variable,
+    0 disables the cache.
+    """
+    cache_dir = os.getenv('GRASS_TGIS_PARSER_CACHE')
+    if cache_dir == '0':
+        return None
+    if cache_dir:
+        return cache_dir
+    if sys.platform == 'win32':
+        if not os.getenv('APPDATA'):
+            return None
+        config_dir = os.path.join(os.getenv('APPDATA'), 'GRASS7')
+    else:
+        if not os.getenv('HOME'):
+            return None
+        config_dir = os.path.join(os.getenv('HOME'), '.grass7')
+    return os.path.join(config_dir, 'cache', 'tgis_parser')
+
+
+def get_grammar_hash(parser_class):
+    """Return a hash of the grammar of a parser class, built from the
+    tokens, the precedence and the docstrings of the grammar rules
+
+    :param parser_class: The class that defines the grammar rules (p_*)
+    """
+    grammar = [yacc.__tabversion__, sys.version_info[0],
+               getattr(parser_class, 'start', None),
+               tuple(getattr(parser_class, 'tokens', ())),
+               getattr(parser_class, 'precedence', None)]
+    for name in sorted(dir(parser_class)):
+        if name.startswith('p_') and name != 'p_error':
+            grammar.append((name, getattr(parser_class, name).__doc__))
+    return hashlib.sha1(repr(grammar).encode('utf-8')).hexdigest()
+
+
+def build_cached_parser(module, debug=0):
+    """Build the PLY parser of a parser object reusing the LALR tables
+    cached in the user cache directory, the tables are generated and
+    stored only if they are not present for the grammar of the parser
+
+    :param module: The parser object that defines the grammar rules
+    :param debug: Create a debug file of the parser
+    :return: The yacc parser
+    """
+    cache_dir = get_parser_cache_dir()
+    if cache_dir is None:
+        return yacc.yacc(module=module, debug=debug, write_tables=False)
+    name = module.__class__.__name__
+    table = os.path.join(cache_dir, "%s_%s.pickle" % (
+        name, get_grammar_hash(module.__class__)))
+    if os.path.exists(table):
+        return yacc.yacc(module=module, debug=debug, picklefile=table,
+                         write_tables=False)
+    try:
+        if not os.path.isdir(cache_dir):
+            os.makedirs(cache_dir)
+    except OSError:
+        return yacc.yacc(module=module, debug=debug, write_tables=False)
+    # write a temporary file and rename it, so that concurrent processes
+    # never read an incomplete table
+    tmp_table = "%s.%d.tmp" % (table, os.getpid())
+    parser = yacc.yacc(module=module, debug=debug, picklefile=tmp_table)
+    try:
+        os.rename(tmp_table, table)
+    except OSError:
+        try:
+            os.remove(tmp_table)
+        except OSError:
+            pass
+    return parser
+
+
 class TemporalOperatorLexer(object):
     """Lexical analyzer for the GRASS GIS temporal operator"""
 
@@ -289,7 +369,7 @@ class TemporalOperatorParser(object):
     def __init__(self):
         self.lexer = TemporalOperatorLexer()
         self.lexer.build()
-        self.parser = yacc.yacc(module=self, debug=0)
+        self.parser = build_cached_parser(self)
         self.relations = None   # Temporal relations (equals, contain, during, ...)
         self.temporal  = None   # Temporal operation (intersect, left, right, ...)
         self.function  = None   # Actual operation (+, -, /, *, ... )
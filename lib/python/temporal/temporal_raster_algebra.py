@@ -55,12 +55,12 @@ from __future__ import print_function
 
 try:
     import ply.lex as lex
-    import ply.yacc as yacc
 except:
     pass
 
 from .temporal_raster_base_algebra import TemporalRasterBaseAlgebraParser,\
     TemporalRasterAlgebraLexer
+from .temporal_operator import build_cached_parser
 import grass.pygrass.modules as pymod
 from .space_time_datasets import RasterDataset
 
@@ -98,7 +98,7 @@ class TemporalRasterAlgebraParser(TemporalRasterBaseAlgebraParser):
 
         self.lexer = TemporalRasterAlgebraLexer()
         self.lexer.build()
-        self.parser = yacc.yacc(module=self, debug=self.debug, write_tables=False)
+        self.parser = build_cached_parser(self, debug=self.debug)
 
         self.overwrite = overwrite
         self.count = 0
@@ -56,7 +56,7 @@ from .core import init_dbif
 from .abstract_dataset import AbstractDatasetComparisonKeyStartTime
 from .factory import dataset_factory
 from .open_stds import open_new_stds
-from .spatio_temporal_relationships import SpatioTemporalTopologyBuilder
+from .spatio_temporal_relationships import SweepLineTopologyBuilder
 from .space_time_datasets import Raster3DDataset, RasterDataset
 from .temporal_granularity import compute_absolute_time_granularity
 
@@ -253,7 +253,7 @@ class TemporalRasterBaseAlgebraParser(TemporalAlgebraParser):
 
         resultdict = {}
         # Create temporal topology for maplistA to maplistB.
-        tb = SpatioTemporalTopologyBuilder()
+        tb = SweepLineTopologyBuilder()
         # Build spatio-temporal topology
         if len(spatial_topo_list) > 0:
             # Dictionary with different spatial variables used for topology builder.
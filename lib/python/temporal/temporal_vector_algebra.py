@@ -45,7 +45,6 @@ from __future__ import print_function
 
 try:
     import ply.lex as lex
-    import ply.yacc as yacc
 except:
     pass
 
@@ -53,10 +52,11 @@ import grass.pygrass.modules as pygrass
 
 import copy
 from .temporal_algebra import TemporalAlgebraLexer, TemporalAlgebraParser, GlobalTemporalVar
+from .temporal_operator import build_cached_parser
 from .core import init_dbif, get_current_mapset
 from .abstract_dataset import AbstractDatasetComparisonKeyStartTime
 from .open_stds import open_new_stds
-from .spatio_temporal_relationships import SpatioTemporalTopologyBuilder
+from .spatio_temporal_relationships import SweepLineTopologyBuilder
 from .space_time_datasets import VectorDataset
 
 
@@ -149,7 +149,7 @@ class TemporalVectorAlgebraParser(TemporalAlgebraParser):
 
         self.lexer = TemporalVectorAlgebraLexer()
         self.lexer.build()
-        self.parser = yacc.yacc(module=self, debug=self.debug, write_tables=False)
+        self.parser = build_cached_parser(self, debug=self.debug)
 
         self.overwrite = overwrite
         self.count = 0
@@ -208,7 +208,7 @@ class TemporalVectorAlgebraParser(TemporalAlgebraParser):
               raise SyntaxError("Unpermitted temporal relation name '" + topo + "'")
 
         # Create temporal topology for maplistA to maplistB.
-        tb = SpatioTemporalTopologyBuilder()
+        tb = SweepLineTopologyBuilder()
         # Dictionary with different spatial variables used for topology builder.
         spatialdict = {'strds' : '2D', 'stvds' : '2D', 'str3ds' : '3D'}
         # Build spatial temporal topology
@@ -0,0 +1,152 @@
+"""Unit test to compare the topology built by the SweepLineTopologyBuilder
+   with the topology built by the SpatioTemporalTopologyBuilder
+
+(C) 2020 by the GRASS Development Team
+This program is free software under the GNU General Public
+License (>=v2). Read the file COPYING that comes with GRASS
+for details.
+"""
+
+import random
+import datetime
+
+import grass.temporal as tgis
+from grass.gunittest.case import TestCase
+from grass.gunittest.main import test
+
+# north, south, east, west, top, bottom
+EXTENT_A = (80, 0, 120, 0, 1, 0)
+EXTENT_B = (50, 10, 60, 20, 1, 0)
+EXTENT_C = (80, 40, 120, 60, 2, 1)
+EXTENT_D = (300, 200, 400, 300, 10, 5)
+
+# start, end and spatial extent of intervals and time points, with
+# equal, overlapping, contained and adjacent intervals and with time
+# points at the boundaries of the intervals
+SPECS = [(0, 10, EXTENT_A), (0, 10, EXTENT_A), (5, 15, EXTENT_B),
+         (10, 20, EXTENT_C), (10, None, EXTENT_A), (12, None, EXTENT_B),
+         (12, None, EXTENT_B), (2, 8, EXTENT_C), (0, 5, EXTENT_A),
+         (5, 10, EXTENT_D), (20, 25, EXTENT_A), (30, 40, EXTENT_D),
+         (40, None, EXTENT_C), (25, None, EXTENT_A)]
+
+
+def create_maps(prefix, specs, absolute=True):
+    """Create raster map objects from a list of (start, end, extent)"""
+    maps = []
+    ref = datetime.datetime(2001, 1, 1)
+    for i, (start, end, extent) in enumerate(specs):
+        map = tgis.RasterDataset("%s%i@test" % (prefix, i))
+        if absolute:
+            start = ref + datetime.timedelta(days=start)
+            if end is not None:
+                end = ref + datetime.timedelta(days=end)
+            map.set_absolute_time(start, end)
+        else:
+            map.set_relative_time(start, end, "days")
+        map.set_spatial_extent_from_values(*extent)
+        maps.append(map)
+    return maps
+
+
+def random_specs(seed, number):
+    """Return a list of random intervals and time points"""
+    rand = random.Random(seed)
+    extents = [EXTENT_A, EXTENT_B, EXTENT_C, EXTENT_D]
+    specs = []
+    for i in range(number):
+        start = rand.randint(0, 50)
+        end = None if rand.random() < 0.3 else start + rand.randint(1, 10)
+        specs.append((start, end, rand.choice(extents)))
+    return specs
+
+
+def get_relations(maps, spatial=None):
+    """Return a dictionary with the relations of each map"""
+    result = {}
+    for map in maps:
+        relations = {}
+        for key, value in map.get_temporal_relations().items():
+            if key not in ("NEXT", "PREV"):
+                relations[key] = sorted(m.get_id() for m in value)
+        relations["NEXT"] = map.next().get_id() if map.next() else None
+        relations["PREV"] = map.prev().get_id() if map.prev() else None
+        if spatial is not None:
+            for key, value in map.get_spatial_relations().items():
+                relations["SPATIAL_" + key] = sorted(m.get_id()
+                                                     for m in value)
+        result[map.get_id()] = relations
+    return result
+
+
+class TestSweepLineTopologyBuilder(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        """Initiate the temporal GIS"""
+        tgis.init(True)
+
+    def compare(self, specsA, specsB=None, absolute=True, spatial=None,
+                map_list=False):
+        """Build the topology with both builders and compare the
+           relations of all maps
+        """
+        results = []
+        for builder in (tgis.SpatioTemporalTopologyBuilder(),
+                        tgis.SweepLineTopologyBuilder(chunk_size=7)):
+            mapsA = create_maps("a", specsA, absolute)
+            mapsB = None
+            if specsB is not None:
+                mapsB = create_maps("b", specsB, absolute)
+            if map_list and isinstance(builder,
+                                       tgis.SweepLineTopologyBuilder):
+                mapsA = tgis.MapList.from_objects(mapsA)
+                if mapsB is not None:
+                    mapsB = tgis.MapList.from_objects(mapsB)
+            builder.build(mapsA, mapsB, spatial)
+            relations = get_relations(mapsA, spatial)
+            if mapsB is not None:
+                relations.update(get_relations(mapsB, spatial))
+            order = [map.get_id() for map in builder]
+            results.append((relations, order))
+
+        expected, result = results
+        self.assertEqual(sorted(expected[0].keys()),
+                         sorted(result[0].keys()))
+        for map_id in expected[0]:
+            self.assertEqual(expected[0][map_id], result[0][map_id],
+                             msg="Relations of map <%s>" % map_id)
+        self.assertListEqual(expected[1], result[1])
+
+    def test_absolute(self):
+        """Test a single list of maps with absolute time"""
+        self.compare(SPECS)
+
+    def test_relative(self):
+        """Test a single list of maps with relative time"""
+        self.compare(SPECS, absolute=False)
+
+    def test_two_lists(self):
+        """Test two lists of maps"""
+        self.compare(SPECS, SPECS[::-1][:8])
+        self.compare(SPECS[:6], SPECS, absolute=False)
+
+    def test_spatial(self):
+        """Test the spatio-temporal topology"""
+        self.compare(SPECS, spatial="2D")
+        self.compare(SPECS, SPECS[3:], spatial="3D")
+
+    def test_map_list(self):
+        """Test MapList objects as input of the sweep-line builder"""
+        self.compare(SPECS, map_list=True)
+        self.compare(SPECS, SPECS[2:9], absolute=False, map_list=True)
+
+    def test_random(self):
+        """Test random intervals and time points"""
+        for seed in range(5):
+            self.compare(random_specs(seed, 60), absolute=seed % 2 == 0)
+            self.compare(random_specs(seed, 40), random_specs(seed + 10, 30),
+                         spatial="2D")
+
+
+if __name__ == '__main__':
+    test()
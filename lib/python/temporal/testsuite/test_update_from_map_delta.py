@@ -0,0 +1,140 @@
+"""Unit test of the incremental update of space time datasets from the
+   registered and unregistered maps
+
+(C) 2020 by the GRASS Development Team
+This program is free software under the GNU General Public
+License (>=v2). Read the file COPYING that comes with GRASS
+for details.
+"""
+
+import os
+
+import grass.temporal as tgis
+from grass.gunittest.case import TestCase
+from grass.gunittest.main import test
+
+STDS_TYPES = {"raster": "strds", "vector": "stvds"}
+
+
+class TestUpdateFromMapDelta(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        """Initiate the temporal GIS, set the region and create the maps
+        """
+        os.putenv("GRASS_OVERWRITE", "1")
+        # Use always the current mapset as temporal database
+        cls.runModule("g.gisenv", set="TGIS_USE_CURRENT_MAPSET=1")
+        tgis.init()
+        cls.use_temp_region()
+        cls.runModule("g.region", n=80.0, s=0.0, e=120.0, w=0.0,
+                      t=1.0, b=0.0, res=10.0)
+        for i in range(1, 6):
+            cls.runModule("r.mapcalc", overwrite=True, quiet=True,
+                          expression="delta_map_%i = %i" % (i, i * 10))
+            cls.runModule("v.random", overwrite=True, quiet=True,
+                          output="delta_map_%i" % i, npoints=i * 5, seed=i)
+        # A raster map with a larger extent and a higher maximum
+        cls.runModule("g.region", n=100.0, e=140.0, res=5.0)
+        cls.runModule("r.mapcalc", overwrite=True, quiet=True,
+                      expression="delta_map_4 = row() + 40")
+        cls.runModule("g.region", n=80.0, e=120.0, res=10.0)
+
+    @classmethod
+    def tearDownClass(cls):
+        """Remove the maps and the temporary region
+        """
+        names = ",".join("delta_map_%i" % i for i in range(1, 6))
+        cls.runModule("g.remove", flags="f", type="raster,vector",
+                      name=names, quiet=True)
+        cls.del_temp_region()
+
+    def assertDatasetEqual(self, first, second):
+        """Check that the extents and the metadata of two datasets are
+           equal
+        """
+        for attr in ("temporal_extent", "spatial_extent", "metadata"):
+            first_dict = getattr(first, attr).D
+            second_dict = getattr(second, attr).D
+            self.assertEqual(sorted(first_dict.keys()),
+                             sorted(second_dict.keys()))
+            for key in first_dict:
+                if isinstance(first_dict[key], float):
+                    self.assertAlmostEqual(first_dict[key], second_dict[key],
+                                           msg="%s %s" % (attr, key))
+                else:
+                    self.assertEqual(first_dict[key], second_dict[key],
+                                     msg="%s %s" % (attr, key))
+
+    def check_update(self, stds):
+        """Compare the incrementally updated dataset with the dataset
+           updated from all registered maps
+        """
+        incremental = tgis.open_old_stds(stds.get_id(), stds.get_type())
+        stds.update_from_registered_maps()
+        full = tgis.open_old_stds(stds.get_id(), stds.get_type())
+        self.assertDatasetEqual(incremental, full)
+        return full
+
+    def run_steps(self, type):
+        """Append, insert and remove maps, checking the dataset after each
+           step
+        """
+        stds = tgis.open_new_stds(name="delta_test_%s" % type,
+                                  type=STDS_TYPES[type],
+                                  temporaltype="absolute", title="Test",
+                                  descr="Test", semantic="field",
+                                  overwrite=True)
+        name = stds.get_name()
+
+        # Build the dataset
+        tgis.register_maps_in_space_time_dataset(
+            type=type, name=name, maps="delta_map_1,delta_map_2,delta_map_3",
+            start="2001-01-01", increment="1 month", interval=True)
+        stds = self.check_update(stds)
+        self.assertEqual(stds.metadata.get_number_of_maps(), 3)
+        self.assertEqual(stds.temporal_extent.get_map_time(), "interval")
+        self.assertEqual(stds.temporal_extent.get_granularity(), "1 month")
+
+        # Append a map after a gap
+        tgis.register_maps_in_space_time_dataset(
+            type=type, name=name, maps="delta_map_4", start="2001-06-01",
+            increment="1 month", interval=True)
+        stds = self.check_update(stds)
+        self.assertEqual(stds.metadata.get_number_of_maps(), 4)
+
+        # Insert a time point before the end of the dataset
+        tgis.register_maps_in_space_time_dataset(
+            type=type, name=name, maps="delta_map_5",
+            start="2001-04-16")
+        stds = self.check_update(stds)
+        self.assertEqual(stds.metadata.get_number_of_maps(), 5)
+        self.assertEqual(stds.temporal_extent.get_map_time(), "mixed")
+
+        # Remove an interior map
+        self.runModule("t.unregister", type=type, input=name,
+                       maps="delta_map_2", quiet=True)
+        stds = self.check_update(stds)
+        self.assertEqual(stds.metadata.get_number_of_maps(), 4)
+
+        # Remove the last map, a boundary of the extents
+        self.runModule("t.unregister", type=type, input=name,
+                       maps="delta_map_4", quiet=True)
+        stds = self.check_update(stds)
+        self.assertEqual(stds.metadata.get_number_of_maps(), 3)
+
+        self.runModule("t.unregister", type=type,
+                       maps="delta_map_1,delta_map_3,delta_map_5", quiet=True)
+        stds.delete()
+
+    def test_strds(self):
+        """Test the incremental update of a space time raster dataset"""
+        self.run_steps("raster")
+
+    def test_stvds(self):
+        """Test the incremental update of a space time vector dataset"""
+        self.run_steps("vector")
+
+
+if __name__ == '__main__':
+    test()
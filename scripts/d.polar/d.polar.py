@@ -37,6 +37,14 @@
 #% description: Name for optional EPS output file
 #% required : no
 #%end
+#%option
+#% key: step
+#% type: integer
+#% description: Sampling step, only every step-th row and column is read (for a quick preview)
+#% required : no
+#% answer: 1
+#% options: 1-
+#%end
 #%flag
 #% key: x
 #% description: Plot using Xgraph
@@ -44,24 +52,50 @@
 
 import os
 import string
-import types
 import math
-import atexit
-import glob
 import shutil
-from grass.script.utils import try_remove, basename
+
+import numpy as np
+
+from grass.script.utils import basename
 from grass.script import core as gcore
 
+CELL_NULL = np.iinfo(np.int32).min
+
 
 def raster_map_required(name):
     if not gcore.find_file(name, 'cell')['file']:
         gcore.fatal(_("Raster map <%s> not found") % name)
 
 
-def cleanup():
-    try_remove(tmp)
-    for f in glob.glob(tmp + '_*'):
-        try_remove(f)
+def read_blocks(name, step=1, block_rows=256):
+    """Generator of the values of every step-th row and column of a raster
+    map in the current region, as 2D arrays of at most block_rows rows;
+    NULL cells are returned as NaN.
+    """
+    from grass.pygrass.gis.region import Region
+    from grass.pygrass.raster import RasterRow
+
+    region = Region()
+    rows = range(0, region.rows, step)
+    ncols = len(range(0, region.cols, step))
+    rast = RasterRow(*name.split('@', 1))
+    rast.open('r')
+    try:
+        buf = None
+        for start in range(0, len(rows), block_rows):
+            block_range = rows[start:start + block_rows]
+            block = np.empty((len(block_range), ncols), dtype=np.float64)
+            for i, row in enumerate(block_range):
+                buf = rast.get_row(row, buf)
+                block[i] = buf[::step]
+            if rast.mtype == 'CELL':
+                block[block == CELL_NULL] = np.nan
+            gcore.percent(start, len(rows), 1)
+            yield block
+        gcore.percent(1, 1, 1)
+    finally:
+        rast.close()
 
 
 def plot_xgraph():
@@ -404,7 +438,6 @@ col1                                    %% colAVERAGE-DIRECTION-COLOR
 
 
 def main():
-    global tmp
     global sine_cosine_replic, outercircle, vector
     global totalvalidnumber, totalnumber, maxradius
 
@@ -412,8 +445,7 @@ def main():
     undef = options['undef']
     eps = options['output']
     xgraph = flags['x']
-
-    tmp = gcore.tempfile()
+    step = int(options['step'])
 
     if eps and xgraph:
         gcore.fatal(_("Please select only one output method"))
@@ -425,47 +457,28 @@ def main():
 
     raster_map_required(map)
 
-    #################################
-    # this file contains everything:
-    rawfile = tmp + "_raw"
-    rawf = file(rawfile, 'w')
-    gcore.run_command('r.stats', flags='1', input=map, stdout=rawf)
-    rawf.close()
-
-    rawf = file(rawfile)
-    totalnumber = 0
-    for line in rawf:
-        totalnumber += 1
-    rawf.close()
-
     gcore.message(
         _("Calculating statistics for polar diagram... (be patient)"))
 
     # wipe out NULL data and undef data if defined by user
     # - generate degree binned to integer, eliminate NO DATA (NULL):
     # change 360 to 0 to close polar diagram:
-    rawf = file(rawfile)
+    totalnumber = 0
     nvals = 0
     sumcos = 0
     sumsin = 0
-    freq = {}
-    for line in rawf:
-        line = line.rstrip('\r\n')
-        if line in ['*', undef]:
-            continue
-        nvals += 1
-        x = float(line)
-        rx = math.radians(x)
-        sumcos += math.cos(rx)
-        sumsin += math.sin(rx)
-        ix = round(x)
-        if ix == 360:
-            ix = 0
-        if ix in freq:
-            freq[ix] += 1
-        else:
-            freq[ix] = 1
-    rawf.close()
+    freq = np.zeros(360, dtype=np.int64)
+    for block in read_blocks(map, step):
+        totalnumber += block.size
+        x = block[~np.isnan(block)]
+        if undef:
+            x = x[x != float(undef)]
+        nvals += x.size
+        rx = np.radians(x)
+        sumcos += np.cos(rx).sum()
+        sumsin += np.sin(rx).sum()
+        ix = np.floor(x + 0.5).astype(np.int64) % 360
+        freq += np.bincount(ix, minlength=360)
 
     totalvalidnumber = nvals
     if totalvalidnumber == 0:
@@ -478,7 +491,8 @@ def main():
 
     #################################
     # how many are there?:
-    occurrences = sorted([(math.radians(x), freq[x]) for x in freq])
+    occurrences = [(math.radians(x), int(freq[x]))
+                   for x in np.flatnonzero(freq)]
 
     # find the maximum value
     maxradius = max([f for a, f in occurrences])
@@ -532,5 +546,4 @@ def main():
 
 if __name__ == "__main__":
     options, flags = gcore.parser()
-    atexit.register(cleanup)
     main()
@@ -56,41 +56,60 @@
 #%end
 
 import sys
-import atexit
 import math
+from itertools import islice
 
-import grass.script as gscript
-
-
-def cleanup():
-    for ext in ['', '.sort']:
-        gscript.try_remove(tmp + ext)
-
+import numpy as np
 
-def sortfile(infile, outfile):
-    inf = open(infile, 'r')
-    outf = open(outfile, 'w')
+import grass.script as gscript
 
-    if gscript.find_program('sort', '--help'):
-        gscript.run_command('sort', flags='n', stdin=inf, stdout=outf)
+# number of rows read and converted at once
+CHUNK = 100000
+
+
+def read_chunks(sql, table, database, driver, chunk=CHUNK):
+    """Generator of the values selected by the SQL statement, as numpy
+    arrays of at most chunk values; NULL values are returned as NaN.
+
+    SQLite and PostgreSQL tables are read with a cursor, the other drivers
+    stream the output of db.select.
+    """
+    if driver in ('sqlite', 'pg'):
+        from grass.pygrass.vector.table import Link
+        conn = Link(table=table, database=database,
+                    driver=driver).connection()
+        try:
+            cur = conn.cursor()
+            cur.execute(sql)
+            while True:
+                rows = cur.fetchmany(chunk)
+                if not rows:
+                    break
+                yield np.array([row[0] for row in rows], dtype=np.float64)
+            cur.close()
+        finally:
+            conn.close()
     else:
-        # FIXME: we need a large-file sorting function
-        gscript.warning(_("'sort' not found: sorting in memory"))
-        lines = inf.readlines()
-        for i in range(len(lines)):
-            lines[i] = float(lines[i].rstrip('\r\n'))
-        lines.sort()
-        for line in lines:
-            outf.write(str(line) + '\n')
+        proc = gscript.pipe_command('db.select', flags='c', sql=sql,
+                                    database=database, driver=driver)
+        while True:
+            lines = list(islice(proc.stdout, chunk))
+            if not lines:
+                break
+            yield np.array([float(line) if line.strip() else np.nan
+                            for line in lines], dtype=np.float64)
+        if proc.wait() != 0:
+            gscript.fatal(_("Unable to select data from table <%s>") % table)
 
-    inf.close()
-    outf.close()
 
+def position(n, fraction):
+    """Return the 1-based position of a quantile in n sorted values,
+    rounding half up
+    """
+    return max(1, int(math.floor(n * fraction + 0.5)))
 
-def main():
-    global tmp
-    tmp = gscript.tempfile()
 
+def main():
     extend = flags['e']
     shellstyle = flags['g']
     table = options['table']
@@ -123,48 +142,41 @@ def main():
     if where:
         sql += " WHERE " + where
 
-    if not database:
-        database = None
-
-    if not driver:
-        driver = None
-
-    tmpf = open(tmp, 'w')
-    gscript.run_command('db.select', flags='c', table=table,
-                        database=database, driver=driver, sql=sql,
-                        stdout=tmpf)
-    tmpf.close()
-
-    # check if result is empty
-    tmpf = open(tmp)
-    if tmpf.read(1) == '':
-        gscript.fatal(_("Table <%s> contains no data.") % table)
-        tmpf.close()
+    if not database or not driver:
+        connection = gscript.db_connection(force=True)
+        database = database or connection['database']
+        driver = driver or connection['driver']
 
     # calculate statistics
     if not shellstyle:
         gscript.verbose(_("Calculating statistics..."))
 
+    nrows = 0
     N = 0
     sum = 0.0
     sum2 = 0.0
     sum3 = 0.0
     minv = 1e300
     maxv = -1e300
+    # the values are kept in memory only for the extended statistics
+    chunks = []
 
-    tmpf = open(tmp)
-    for line in tmpf:
-        if len(line.rstrip('\r\n')) == 0:
+    for values in read_chunks(sql, table, database, driver):
+        nrows += len(values)
+        values = values[~np.isnan(values)]
+        if not len(values):
             continue
-        x = float(line.rstrip('\r\n'))
-        N += 1
-        sum += x
-        sum2 += x * x
-        sum3 += abs(x)
-        maxv = max(maxv, x)
-        minv = min(minv, x)
-    tmpf.close()
-
+        N += len(values)
+        sum += values.sum()
+        sum2 += np.dot(values, values)
+        sum3 += np.abs(values).sum()
+        maxv = max(maxv, values.max())
+        minv = min(minv, values.min())
+        if extend:
+            chunks.append(values)
+
+    if nrows <= 0:
+        gscript.fatal(_("Table <%s> contains no data.") % table)
     if N <= 0:
         gscript.fatal(_("No non-null values found"))
 
@@ -208,45 +220,32 @@ def main():
         return
 
     # preparations:
-    sortfile(tmp, tmp + ".sort")
+    values = np.concatenate(chunks)
+    del chunks
 
     odd = N % 2
     eostr = ['even', 'odd'][odd]
 
-    q25pos = round(N * 0.25)
-    if q25pos == 0:
-        q25pos = 1
-    q50apos = round(N * 0.50)
-    if q50apos == 0:
-        q50apos = 1
+    q25pos = position(N, 0.25)
+    q50apos = position(N, 0.50)
     q50bpos = q50apos + (1 - odd)
-    q75pos = round(N * 0.75)
-    if q75pos == 0:
-        q75pos = 1
+    q75pos = position(N, 0.75)
 
     ppos = {}
+    for i in range(len(perc)):
+        ppos[i] = position(N, perc[i] / 100)
+
+    # select the values at the (1-based) positions of the sorted values
+    positions = [q25pos, q50apos, q50bpos, q75pos] + list(ppos.values())
+    values.partition(np.unique(np.array(positions) - 1))
+
+    q25 = values[q25pos - 1]
+    q50a = values[q50apos - 1]
+    q50b = values[q50bpos - 1]
+    q75 = values[q75pos - 1]
     pval = {}
     for i in range(len(perc)):
-        ppos[i] = round(N * perc[i] / 100)
-        if ppos[i] == 0:
-            ppos[i] = 1
-        pval[i] = 0
-
-    inf = open(tmp + ".sort")
-    l = 1
-    for line in inf:
-        if l == q25pos:
-            q25 = float(line.rstrip('\r\n'))
-        if l == q50apos:
-            q50a = float(line.rstrip('\r\n'))
-        if l == q50bpos:
-            q50b = float(line.rstrip('\r\n'))
-        if l == q75pos:
-            q75 = float(line.rstrip('\r\n'))
-        for i in range(len(ppos)):
-            if l == ppos[i]:
-                pval[i] = float(line.rstrip('\r\n'))
-        l += 1
+        pval[i] = values[ppos[i] - 1]
 
     q50 = (q50a + q50b) / 2
 
@@ -295,5 +294,4 @@ def main():
 
 if __name__ == "__main__":
     options, flags = gscript.parser()
-    atexit.register(cleanup)
     main()
@@ -44,5 +44,23 @@ class TestDbUnivar(TestCase):
                               column=self.columnName)
         self.assertModule(module)
 
+    def test_extended(self):
+        """run db.univar with extended statistics"""
+        run_command('db.execute',
+                    sql="CREATE TABLE univar_test (value INTEGER)")
+        for value in range(1, 10):
+            run_command('db.execute',
+                        sql="INSERT INTO univar_test VALUES (%d)" % value)
+        run_command('db.execute', sql="INSERT INTO univar_test VALUES (NULL)")
+
+        reference = dict(n=9, min=1, max=9, range=8, mean=5, sum=45,
+                         first_quartile=2, median=5, third_quartile=7,
+                         percentile_90=8)
+        self.assertModuleKeyValue('db.univar', flags='eg',
+                                  table='univar_test', column='value',
+                                  reference=reference, precision=1e-10,
+                                  sep='=')
+        run_command('db.execute', sql="DROP TABLE univar_test")
+
 if __name__ == '__main__':
     test()
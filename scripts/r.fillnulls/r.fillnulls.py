@@ -106,12 +106,23 @@
 #% description: Cache size for raster rows
 #% answer: 300
 #%end
+#%option
+#% key: nprocs
+#% type: integer
+#% required: no
+#% multiple: no
+#% label: Number of holes filled in parallel
+#% description: Used in RST interpolation, each hole is processed in its own region
+#% answer: 1
+#% guisection: RST options
+#%end
 
 
 import sys
 import os
 import atexit
 import subprocess
+from multiprocessing.pool import ThreadPool
 
 import grass.script as grass
 from grass.exceptions import CalledModuleError
@@ -135,6 +146,137 @@ def cleanup():
             grass.run_command('g.rename', quiet=True, raster=(usermask, 'MASK'), overwrite=True)
 
 
+def fill_hole(cat, hole_region, input, prefix, edge, tension, smooth,
+              segmax, npmin, quiet):
+    """Interpolate one hole with v.surf.rst in its own region
+
+    Returns a tuple with the hole cat and the name of the raster map with
+    the interpolated hole, None if the hole could not be filled or the
+    CalledModuleError raised by a failed module.
+    """
+    holename = prefix + 'hole_' + cat
+    env = dict(os.environ)
+    env['GRASS_REGION'] = hole_region
+
+    try:
+        # copy only data around hole
+        grass.mapcalc("$out = if($inp == $catn, $inp, null())",
+                      out=holename, inp=prefix + 'holes', catn=cat, env=env)
+        tmp_rmaps.append(holename)
+
+        # grow hole border to get it's edge area
+        tmp_rmaps.append(holename + '_grown')
+        grass.run_command('r.grow', input=holename, radius=edge + 0.01,
+                          old=-1, out=holename + '_grown', quiet=quiet,
+                          env=env)
+
+        # no idea why r.grow old=-1 doesn't replace existing values with NULL
+        grass.mapcalc("$out = if($inp == -1, null(), \"$dem\")",
+                      out=holename + '_edges', inp=holename + '_grown',
+                      dem=input, env=env)
+        tmp_rmaps.append(holename + '_edges')
+
+        # convert to points for interpolation
+        tmp_vmaps.append(holename)
+        grass.run_command('r.to.vect',
+                          input=holename + '_edges', output=holename,
+                          type='point', flags='z', quiet=quiet, env=env)
+
+        # count number of points to control segmax parameter for interpolation:
+        pointsnumber = grass.vector_info_topo(map=holename)['points']
+        grass.verbose(_("Interpolating %d points") % pointsnumber)
+
+        if pointsnumber < 2:
+            grass.verbose(_("No points to interpolate"))
+            return cat, None
+
+        # Avoid v.surf.rst warnings
+        if pointsnumber < segmax:
+            use_npmin = pointsnumber
+            use_segmax = pointsnumber * 2
+        else:
+            use_npmin = npmin
+            use_segmax = segmax
+
+        # launch v.surf.rst
+        tmp_rmaps.append(holename + '_dem')
+        grass.run_command('v.surf.rst', quiet=quiet,
+                          input=holename, elev=holename + '_dem',
+                          tension=tension, smooth=smooth,
+                          segmax=use_segmax, npmin=use_npmin, env=env)
+
+        # v.surf.rst sometimes fails with exit code 0
+        # related bug #1813
+        if not grass.find_file(holename + '_dem')['file']:
+            try:
+                tmp_rmaps.remove(holename)
+                tmp_rmaps.remove(holename + '_grown')
+                tmp_rmaps.remove(holename + '_edges')
+                tmp_rmaps.remove(holename + '_dem')
+                tmp_vmaps.remove(holename)
+            except:
+                pass
+            grass.warning(
+                _("Filling has failed silently. Leaving temporary maps "
+                  "with prefix <%s> for debugging.") %
+                holename)
+            return cat, None
+
+        # keep only the interpolated values of the hole, they are patched
+        # into the filled map when all the holes are processed
+        grass.mapcalc("$out = if(isnull($inp), null(), $dem)",
+                      out=holename + '_fill', inp=holename,
+                      dem=holename + '_dem', env=env)
+        tmp_rmaps.append(holename + '_fill')
+
+        # remove temporary maps to not overfill disk
+        for name in ('', '_grown', '_edges', '_dem'):
+            tmp_rmaps.remove(holename + name)
+        grass.run_command('g.remove', quiet=quiet,
+                          flags='fb', type='raster',
+                          name=(holename,
+                                holename + '_grown',
+                                holename + '_edges',
+                                holename + '_dem'))
+        tmp_vmaps.remove(holename)
+        grass.run_command('g.remove', quiet=quiet, flags='fb',
+                          type='vector', name=holename)
+    except CalledModuleError as e:
+        return cat, e
+
+    return cat, holename + '_fill'
+
+
+def patch_maps(maps, output, quiet, size=100):
+    """Patch the non overlapping maps into output in the current region
+
+    The maps are patched in groups of size maps, to not open too many
+    maps at the same time, and removed when patched.
+    """
+    patched = None
+    for i in range(0, len(maps), size):
+        group = maps[i:i + size]
+        if i + size >= len(maps):
+            name = output
+        else:
+            name = '%s_%d' % (output, i)
+            tmp_rmaps.append(name)
+        if patched:
+            group = [patched] + group
+        # r.patch requires at least two maps
+        if len(group) == 1:
+            grass.run_command('g.rename', raster=(group[0], name),
+                              overwrite=True, quiet=quiet)
+        else:
+            grass.run_command('r.patch', input=group, output=name,
+                              overwrite=True, quiet=quiet)
+            grass.run_command('g.remove', quiet=quiet, flags='fb',
+                              type='raster', name=group)
+        for removed in group:
+            tmp_rmaps.remove(removed)
+        patched = name
+
+
 def main():
     global usermask, mapset, tmp_rmaps, tmp_vmaps
 
@@ -148,6 +290,7 @@ def main():
     npmin = int(options['npmin'])
     lambda_ = float(options['lambda'])
     memory = options['memory']
+    nprocs = int(options['nprocs'])
     quiet = True  # FIXME
     mapset = grass.gisenv()['MAPSET']
     unique = str(os.getpid())  # Shouldn't we use temp name?
@@ -245,202 +388,80 @@ def main():
                           "user mask if needed:"))
         tmp_vmaps.append(prefix + 'holes')
 
-        # get a list of unique hole cat's
-        cats_file_name = grass.tempfile(False)
-        grass.run_command(
-            'v.db.select',
-            flags='c',
-            map=prefix + 'holes',
-            columns='cat',
-            file=cats_file_name,
-            quiet=quiet)
-        cat_list = list()
-        cats_file = open(cats_file_name)
-        for line in cats_file:
-            cat_list.append(line.rstrip('\n'))
-        cats_file.close()
-        os.remove(cats_file_name)
+        # get bounding box and size of each hole, to set the region of
+        # each hole without changing the current region and to fill the
+        # largest holes first
+        holes = {}
+        bboxes = grass.read_command('v.to.db', flags='p', map=prefix + 'holes',
+                                    option='bbox', separator='pipe',
+                                    quiet=True)
+        for line in bboxes.splitlines():
+            cat, north, south, east, west = line.split('|')
+            if int(cat) > 0:
+                holes[cat] = {'n': float(north), 's': float(south),
+                              'e': float(east), 'w': float(west), 'area': 0.}
+        areas = grass.read_command('v.to.db', flags='p', map=prefix + 'holes',
+                                   option='area', separator='pipe',
+                                   quiet=True)
+        for line in areas.splitlines():
+            cat, area = line.split('|')
+            if cat in holes:
+                holes[cat]['area'] = float(area)
+        cat_list = sorted(holes, key=lambda cat: holes[cat]['area'],
+                          reverse=True)
 
         if len(cat_list) < 1:
             grass.fatal(_("Input map has no holes. Check region settings."))
 
         # GTC Hole is NULL area in a raster map
         grass.message(_("Processing %d map holes") % len(cat_list))
-        first = True
-        hole_n = 1
-        for cat in cat_list:
-            holename = prefix + 'hole_' + cat
-            # GTC Hole is a NULL area in a raster map
-            grass.message(_("Filling hole %s of %s") % (hole_n, len(cat_list)))
-            hole_n = hole_n + 1
-            # cut out only CAT hole for processing
-            try:
-                grass.run_command('v.extract', input=prefix + 'holes',
-                                  output=holename + '_pol',
-                                  cats=cat, quiet=quiet)
-            except CalledModuleError:
-                grass.fatal(_("abandoned. Removing temporary maps, restoring "
-                              "user mask if needed:"))
-            tmp_vmaps.append(holename + '_pol')
-
-            # zoom to specific hole with a buffer of two cells around the hole to
-            # remove rest of data
-            try:
-                grass.run_command('g.region',
-                                  vector=holename + '_pol', align=input,
-                                  w='w-%d' % (edge * 2 * ew_res),
-                                  e='e+%d' % (edge * 2 * ew_res),
-                                  n='n+%d' % (edge * 2 * ns_res),
-                                  s='s-%d' % (edge * 2 * ns_res),
-                                  quiet=quiet)
-            except CalledModuleError:
-                grass.fatal(_("abandoned. Removing temporary maps, restoring "
-                              "user mask if needed:"))
-
-            # remove temporary map to not overfill disk
-            try:
-                grass.run_command('g.remove', flags='fb', type='vector',
-                                  name=holename + '_pol', quiet=quiet)
-            except CalledModuleError:
-                grass.fatal(_("abandoned. Removing temporary maps, restoring "
-                              "user mask if needed:"))
-            tmp_vmaps.remove(holename + '_pol')
-
-            # copy only data around hole
-            grass.mapcalc("$out = if($inp == $catn, $inp, null())",
-                          out=holename, inp=prefix + 'holes', catn=cat)
-            tmp_rmaps.append(holename)
-
-            # If here loop is split into two, next part of loop can be run in parallel
-            # (except final result patching)
-            # Downside - on large maps such approach causes large disk usage
-
-            # grow hole border to get it's edge area
-            tmp_rmaps.append(holename + '_grown')
-            try:
-                grass.run_command('r.grow', input=holename, radius=edge + 0.01,
-                                  old=-1, out=holename + '_grown', quiet=quiet)
-            except CalledModuleError:
-                grass.fatal(_("abandoned. Removing temporary map, restoring "
-                              "user mask if needed:"))
-
-            # no idea why r.grow old=-1 doesn't replace existing values with NULL
-            grass.mapcalc("$out = if($inp == -1, null(), \"$dem\")",
-                          out=holename + '_edges', inp=holename + '_grown', dem=input)
-            tmp_rmaps.append(holename + '_edges')
 
-            # convert to points for interpolation
-            tmp_vmaps.append(holename)
-            try:
-                grass.run_command('r.to.vect',
-                                  input=holename + '_edges', output=holename,
-                                  type='point', flags='z', quiet=quiet)
-            except CalledModuleError:
-                grass.fatal(_("abandoned. Removing temporary maps, restoring "
-                              "user mask if needed:"))
+        def fill(cat):
+            # region of the specific hole with a buffer of two edges around
+            # the hole to remove rest of data
+            bbox = holes[cat]
+            hole_region = grass.region_env(align=input,
+                                           n=bbox['n'] + edge * 2 * ns_res,
+                                           s=bbox['s'] - edge * 2 * ns_res,
+                                           e=bbox['e'] + edge * 2 * ew_res,
+                                           w=bbox['w'] - edge * 2 * ew_res)
+            return fill_hole(cat, hole_region, input, prefix, edge, tension,
+                             smooth, segmax, npmin, quiet)
+
+        # holes are filled in their own region, in parallel if requested
+        if nprocs > 1:
+            pool = ThreadPool(nprocs)
+            results = pool.imap_unordered(fill, cat_list)
+        else:
+            pool = None
+            results = (fill(cat) for cat in cat_list)
 
-            # count number of points to control segmax parameter for interpolation:
-            pointsnumber = grass.vector_info_topo(map=holename)['points']
-            grass.verbose(_("Interpolating %d points") % pointsnumber)
-
-            if pointsnumber < 2:
-                grass.verbose(_("No points to interpolate"))
-                failed_list.append(holename)
-                continue
-
-            # Avoid v.surf.rst warnings
-            if pointsnumber < segmax:
-                use_npmin = pointsnumber
-                use_segmax = pointsnumber * 2
-            else:
-                use_npmin = npmin
-                use_segmax = segmax
-
-            # launch v.surf.rst
-            tmp_rmaps.append(holename + '_dem')
-            try:
-                grass.run_command('v.surf.rst', quiet=quiet,
-                                  input=holename, elev=holename + '_dem',
-                                  tension=tension, smooth=smooth,
-                                  segmax=use_segmax, npmin=use_npmin)
-            except CalledModuleError:
-                # GTC Hole is NULL area in a raster map
-                grass.fatal(_("Failed to fill hole %s") % cat)
-
-            # v.surf.rst sometimes fails with exit code 0
-            # related bug #1813
-            if not grass.find_file(holename + '_dem')['file']:
-                try:
-                    tmp_rmaps.remove(holename)
-                    tmp_rmaps.remove(holename + '_grown')
-                    tmp_rmaps.remove(holename + '_edges')
-                    tmp_rmaps.remove(holename + '_dem')
-                    tmp_vmaps.remove(holename)
-                except:
-                    pass
-                grass.warning(
-                    _("Filling has failed silently. Leaving temporary maps "
-                      "with prefix <%s> for debugging.") %
-                    holename)
-                failed_list.append(holename)
-                continue
-
-            # append hole result to interpolated version later used to patch into original DEM
-            if first:
-                tmp_rmaps.append(filling)
-                grass.run_command('g.region', align=input, raster=holename + '_dem', quiet=quiet)
-                grass.mapcalc("$out = if(isnull($inp), null(), $dem)",
-                              out=filling, inp=holename, dem=holename + '_dem')
-                first = False
-            else:
-                tmp_rmaps.append(filling + '_tmp')
-                grass.run_command(
-                    'g.region', align=input, raster=(
-                        filling, holename + '_dem'), quiet=quiet)
-                grass.mapcalc(
-                    "$out = if(isnull($inp), if(isnull($fill), null(), $fill), $dem)",
-                    out=filling + '_tmp',
-                    inp=holename,
-                    dem=holename + '_dem',
-                    fill=filling)
-                try:
-                    grass.run_command('g.rename',
-                                      raster=(filling + '_tmp', filling),
-                                      overwrite=True, quiet=quiet)
-                except CalledModuleError:
-                    grass.fatal(
-                        _("abandoned. Removing temporary maps, restoring user "
-                          "mask if needed:"))
-                # this map has been removed. No need for later cleanup.
-                tmp_rmaps.remove(filling + '_tmp')
-
-            # remove temporary maps to not overfill disk
-            try:
-                tmp_rmaps.remove(holename)
-                tmp_rmaps.remove(holename + '_grown')
-                tmp_rmaps.remove(holename + '_edges')
-                tmp_rmaps.remove(holename + '_dem')
-            except:
-                pass
+        filled_list = list()
+        hole_n = 1
+        try:
+            for cat, result in results:
+                # GTC Hole is a NULL area in a raster map
+                grass.message(_("Filling hole %s of %s") % (hole_n, len(cat_list)))
+                hole_n = hole_n + 1
+                if isinstance(result, CalledModuleError):
+                    # GTC Hole is NULL area in a raster map
+                    grass.fatal(_("Failed to fill hole %s") % cat)
+                if result is None:
+                    failed_list.append(prefix + 'hole_' + cat)
+                else:
+                    filled_list.append(result)
+        finally:
+            if pool is not None:
+                pool.terminate()
+
+        # patch the interpolated holes into a single map
+        if filled_list:
+            tmp_rmaps.append(filling)
             try:
-                grass.run_command('g.remove', quiet=quiet,
-                                  flags='fb', type='raster',
-                                  name=(holename,
-                                        holename + '_grown',
-                                        holename + '_edges',
-                                        holename + '_dem'))
+                patch_maps(filled_list, filling, quiet)
             except CalledModuleError:
                 grass.fatal(_("abandoned. Removing temporary maps, restoring "
                               "user mask if needed:"))
-            try:
-                tmp_vmaps.remove(holename)
-            except:
-                pass
-            try:
-                grass.run_command('g.remove', quiet=quiet, flags='fb',
-                                  type='vector', name=holename)
-            except CalledModuleError:
-                grass.fatal(_("abandoned. Removing temporary maps, restoring user mask if needed:"))
 
     # check if method is different from rst to use r.resamp.bspline
     if method != 'rst':
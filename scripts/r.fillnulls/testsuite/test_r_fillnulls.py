@@ -44,5 +44,17 @@ class TestRFillNulls(TestCase):
         self.assertRasterFitsUnivar(raster=self.mapComplete,
                                     reference=self.values)
 
+    def test_fill_nulls_nprocs(self):
+        """Fill nulls test with holes filled in parallel"""
+        run_command('r.mapcalc', expression=self.expression, overwrite=True)
+
+        module = SimpleModule('r.fillnulls', input=self.mapNameCalc,
+                              output=self.mapComplete, tension=20, nprocs=2,
+                              overwrite=True)
+        self.assertModule(module)
+
+        self.assertRasterFitsUnivar(raster=self.mapComplete,
+                                    reference=self.values)
+
 if __name__ == '__main__':
     test()
@@ -145,6 +145,49 @@ This program is free software under the GNU General Public License
 #% guisection: Map style
 #%end
 
+#%option
+#% key: nprocs
+#% type: integer
+#% description: Number of tiles requested to the server at the same time
+#% answer: 1
+#% required: no
+#% guisection: Connection
+#%end
+
+#%option
+#% key: connections
+#% type: integer
+#% description: Maximum number of requests to the same server at the same time
+#% answer: 2
+#% required: no
+#% guisection: Connection
+#%end
+
+#%option
+#% key: interval
+#% type: double
+#% description: Minimum time in seconds between two requests to the same server
+#% answer: 0
+#% required: no
+#% guisection: Connection
+#%end
+
+#%option G_OPT_M_DIR
+#% key: cachedir
+#% required: no
+#% description: Directory of the local tile cache, tiles found there are not requested again
+#% guisection: Connection
+#%end
+
+#%option
+#% key: cachesize
+#% type: integer
+#% description: Maximum size of the local tile cache in MB
+#% answer: 100
+#% required: no
+#% guisection: Connection
+#%end
+
 #%option G_OPT_F_BIN_INPUT
 #% key: capfile
 #% required: no
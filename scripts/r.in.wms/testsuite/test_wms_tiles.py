@@ -0,0 +1,173 @@
+"""
+TEST:      test_wms_tiles.py
+
+PURPOSE:   Test concurrent tile fetching and the tile cache of r.in.wms
+           against a local HTTP server
+
+COPYRIGHT: (C) 2020 by the GRASS Development Team
+
+           This program is free software under the GNU General Public
+           License (>=v2). Read the file COPYING that comes with GRASS
+           for details.
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import threading
+import time
+
+try:
+    from BaseHTTPServer import HTTPServer, BaseHTTPRequestHandler
+    from SocketServer import ThreadingMixIn
+    from urllib2 import urlopen, HTTPError
+except ImportError:
+    from http.server import HTTPServer, BaseHTTPRequestHandler
+    from socketserver import ThreadingMixIn
+    from urllib.request import urlopen
+    from urllib.error import HTTPError
+
+from grass.gunittest.case import TestCase
+from grass.gunittest.main import test
+
+sys.path.insert(1, os.path.join(os.environ['GISBASE'], 'etc', 'r.in.wms'))
+from wms_tiles import TileCache, TileFetcher
+
+
+class TileHandler(BaseHTTPRequestHandler):
+    """Return the path as tile data, fail twice for paths ending with
+    'flaky' and always for paths ending with 'missing', paths ending with
+    'slow' are answered after a delay"""
+    requests = []
+    failures = {}
+    times = []
+    active = [0, 0]  # current and maximum number of concurrent requests
+    lock = threading.Lock()
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        self.requests.append(self.path)
+        with self.lock:
+            self.times.append(time.time())
+            self.active[0] += 1
+            self.active[1] = max(self.active)
+        if self.path.endswith('slow'):
+            time.sleep(0.3)
+        with self.lock:
+            self.active[0] -= 1
+        self.reply()
+
+    def reply(self):
+        if self.path.endswith('missing'):
+            self.send_response(404)
+            self.end_headers()
+            return
+        if self.path.endswith('flaky') and self.failures.get(self.path, 0) < 2:
+            self.failures[self.path] = self.failures.get(self.path, 0) + 1
+            self.send_response(503)
+            self.end_headers()
+            return
+        body = self.path.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class ThreadingServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class TestTileFetcher(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingServer(('127.0.0.1', 0), TileHandler)
+        cls.url = 'http://127.0.0.1:%d' % cls.server.server_address[1]
+        cls.thread = threading.Thread(target=cls.server.serve_forever)
+        cls.thread.daemon = True
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.cachedir = tempfile.mkdtemp()
+        del TileHandler.requests[:]
+        del TileHandler.times[:]
+        TileHandler.active[:] = [0, 0]
+        TileHandler.failures.clear()
+
+    def tearDown(self):
+        shutil.rmtree(self.cachedir)
+
+    def tiles(self, names):
+        return [(self.url + '/' + name, {'name': name}) for name in names]
+
+    def test_fetch_and_cache(self):
+        """Test that cached tiles are not requested again"""
+        tiles = self.tiles(['tile%d' % i for i in range(10)] + ['flaky'])
+        cache = TileCache(self.cachedir, 1024 * 1024)
+        fetcher = TileFetcher(urlopen, nprocs=4, cache=cache, backoff=0)
+        fetched = list(fetcher.fetch(tiles))
+        self.assertEqual(len(fetched), len(tiles))
+        for tile, data, cached in fetched:
+            self.assertFalse(cached)
+            self.assertEqual(data, ('/' + tile[1]['name']).encode('utf-8'))
+            fetcher.store(tile, data)
+        # 2 failed requests of the flaky tile
+        self.assertEqual(len(TileHandler.requests), len(tiles) + 2)
+
+        tiles.extend(self.tiles(['new']))
+        fetched = list(fetcher.fetch(tiles))
+        self.assertEqual(sum(1 for tile, data, cached in fetched
+                             if not cached), 1)
+        self.assertEqual(TileHandler.requests[-1], '/new')
+
+    def test_error(self):
+        """Test that not transient errors are raised"""
+        fetcher = TileFetcher(urlopen, nprocs=2, backoff=0)
+        with self.assertRaises(HTTPError):
+            list(fetcher.fetch(self.tiles(['tile', 'missing', 'tile2'])))
+
+    def test_host_limit(self):
+        """Test that the requests to the same host are throttled"""
+        tiles = self.tiles(['tile1_slow', 'tile2_slow'])
+        fetcher = TileFetcher(urlopen, nprocs=2, backoff=0)
+        self.assertEqual(len(list(fetcher.fetch(tiles))), 2)
+        self.assertEqual(TileHandler.active[1], 2)
+
+        TileHandler.active[:] = [0, 0]
+        fetcher = TileFetcher(urlopen, nprocs=2, backoff=0,
+                              max_connections=1)
+        self.assertEqual(len(list(fetcher.fetch(tiles))), 2)
+        self.assertEqual(TileHandler.active[1], 1)
+
+        del TileHandler.times[:]
+        fetcher = TileFetcher(urlopen, nprocs=2, backoff=0,
+                              min_interval=0.5)
+        self.assertEqual(len(list(fetcher.fetch(self.tiles(['a', 'b'])))), 2)
+        self.assertGreaterEqual(TileHandler.times[1] - TileHandler.times[0],
+                                0.45)
+
+    def test_eviction(self):
+        """Test that the least recently used tiles are evicted"""
+        cache = TileCache(self.cachedir, 25)
+        for i in range(3):
+            cache.put(cache.key('tile%d' % i), b'0123456789')
+            os.utime(os.path.join(self.cachedir,
+                                  cache.key('tile%d' % i) + '.tile'),
+                     (i, i))
+        self.assertEqual(cache.size, 20)
+        # the first tile is the oldest one
+        self.assertIsNone(cache.get(cache.key('tile0')))
+        self.assertEqual(cache.get(cache.key('tile1')), b'0123456789')
+
+
+if __name__ == '__main__':
+    test()
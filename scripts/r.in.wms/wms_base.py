@@ -81,6 +81,19 @@ class WMSBase:
         for key in ['password', 'username', 'urlparams']:
             self.params[key] = options[key]
 
+        # not available in d.wms
+        self.params['cachedir'] = options.get('cachedir', '').strip()
+        self.params['nprocs'] = int(options.get('nprocs') or 1)
+        self.params['cachesize'] = int(options.get('cachesize') or 100)
+        self.params['connections'] = int(options.get('connections') or 2)
+        self.params['interval'] = float(options.get('interval') or 0)
+        if self.params['nprocs'] < 1:
+            grass.fatal(_("Invalid number of concurrent requests %d") %
+                        self.params['nprocs'])
+        if self.params['connections'] < 1:
+            grass.fatal(_("Invalid number of connections to a server %d") %
+                        self.params['connections'])
+
         if (self.params ['password'] and self.params ['username'] == '') or \
            (self.params['password'] == '' and self.params['username']):
             grass.fatal(_("Please insert both %s and %s parameters or none of them." %
@@ -186,7 +199,9 @@ class WMSBase:
 
             if i_param in options and \
                options[i_param] and \
-               i_param not in ['srs', 'wms_version', 'format']:  # params with default value
+               i_param not in ['srs', 'wms_version', 'format', 'nprocs',
+                               'cachesize', 'connections',
+                               'interval']:  # params with default value
                 not_relevant_params.append('<' + i_param + '>')
 
         if len(not_relevant_params) > 0:
@@ -662,7 +677,8 @@ class WMSDriversInfo:
         props = {}
         props['ignored_flags'] = []
         props['ignored_params'] = ['urlparams', 'bgcolor', 'capfile', 'capfile_output',
-                                   'username', 'password']
+                                   'username', 'password', 'nprocs', 'cachedir',
+                                   'cachesize', 'connections', 'interval']
         props['req_multiple_layers'] = True
 
         return props
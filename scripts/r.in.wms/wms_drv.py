@@ -16,11 +16,8 @@ This program is free software under the GNU General Public License
 @author Stepan Turek <stepan.turek seznam.cz> (Mentor: Martin Landa)
 """
 
-import socket
 import grass.script as grass
 
-from time import sleep
-
 try:
     from osgeo import gdal
     from osgeo import gdalconst
@@ -28,7 +25,6 @@ except:
     grass.fatal(_("Unable to load GDAL Python bindings (requires package 'python-gdal' being installed)"))
 
 import numpy as Numeric
-Numeric.arrayrange = Numeric.arange
 
 from math import pi, floor
 try:
@@ -47,6 +43,7 @@ except ImportError:  # < Python 2.7
 from wms_base import WMSBase, GetSRSParamVal
 
 from wms_cap_parsers import WMTSCapabilitiesTree, OnEarthCapabilitiesTree
+from wms_tiles import TileCache, TileFetcher
 from srs import Srs
 
 
@@ -100,125 +97,90 @@ class WMSDrv(WMSBase):
         init = True
         temp_map = None
 
-        fetch_try = 0
+        cache = None
+        if self.params['cachedir']:
+            cache = TileCache(self.params['cachedir'],
+                              self.params['cachesize'] * 1024 * 1024)
+        fetcher = TileFetcher(self._fetchDataFromServerAuth,
+                              nprocs=self.params['nprocs'], cache=cache,
+                              username=self.params['username'],
+                              max_connections=self.params['connections'],
+                              min_interval=self.params['interval'])
 
         # iterate through all tiles and download them
-        while True:
-
-            if fetch_try == 0:
-                # get url for request the tile and information for placing the tile into
-                # raster with other tiles
-                tile = req_mgr.GetNextTile()
-
-            # if last tile has been already downloaded
-            if not tile:
-                break
-
-            # url for request the tile
-            query_url = tile[0]
-
-            # the tile size and offset in pixels for placing it into raster where tiles are joined
-            tile_ref = tile[1]
-            grass.debug(query_url, 2)
-            try:
-                wms_data = self._fetchDataFromServer(
-                    query_url, self.params['username'],
-                    self.params['password'])
-            except (IOError, HTTPException) as e:
-                if isinstance(e, HTTPError) and e.code == 401:
-                    grass.fatal(
-                        _("Authorization failed to '%s' when fetching data.\n%s") %
-                        (self.params['url'], str(e)))
-                else:
-                    grass.fatal(
-                        _("Unable to fetch data from: '%s'\n%s") %
-                        (self.params['url'], str(e)))
-
-            temp_tile = self._tempfile()
-
-            # download data into temporary file
-            try:
-                temp_tile_opened = open(temp_tile, 'wb')
-                temp_tile_opened.write(wms_data.read())
-            except IOError as e:
-                # some servers are not happy with many subsequent requests for tiles done immediately,
-                # if immediate request was unsuccessful, try to repeat the request after 5s and 30s breaks
-                # TODO probably servers can return more kinds of errors related to this
-                # problem (not only 104)
-                if isinstance(e, socket.error) and e[0] == 104 and fetch_try < 2:
-                    fetch_try += 1
-
-                    if fetch_try == 1:
-                        sleep_time = 5
-                    elif fetch_try == 2:
-                        sleep_time = 30
-
-                    grass.warning(
-                        _("Server refused to send data for a tile.\nRequest will be repeated after %d s.") %
-                        sleep_time)
-
-                    sleep(sleep_time)
-                    continue
-                else:
-                    grass.fatal(_("Unable to write data into tempfile.\n%s") % str(e))
-            finally:
-                temp_tile_opened.close()
+        try:
+            tiles = fetcher.fetch(self._iterTiles(req_mgr))
+            for tile, wms_data, cached in tiles:
+                # the tile size and offset in pixels for placing it into raster where tiles are joined
+                tile_ref = tile[1]
+                grass.debug(tile[0], 2)
 
-            fetch_try = 0
+                temp_tile = self._tempfile()
 
-            tile_dataset_info = gdal.Open(temp_tile, gdal.GA_ReadOnly)
-            if tile_dataset_info is None:
-                # print error xml returned from server
+                # download data into temporary file
                 try:
-                    error_xml_opened = open(temp_tile, 'rb')
-                    err_str = error_xml_opened.read()
+                    temp_tile_opened = open(temp_tile, 'wb')
+                    temp_tile_opened.write(wms_data)
                 except IOError as e:
-                    grass.fatal(_("Unable to read data from tempfile.\n%s") % str(e))
+                    grass.fatal(_("Unable to write data into tempfile.\n%s") % str(e))
                 finally:
-                    error_xml_opened.close()
-
-                if err_str is not None:
-                    grass.fatal(_("WMS server error: %s") % err_str)
+                    temp_tile_opened.close()
+
+                tile_dataset_info = gdal.Open(temp_tile, gdal.GA_ReadOnly)
+                if tile_dataset_info is None:
+                    # print error xml returned from server
+                    err_str = wms_data
+                    if err_str:
+                        grass.fatal(_("WMS server error: %s") % err_str)
+                    else:
+                        grass.fatal(_("WMS server unknown error"))
+
+                if not cached:
+                    fetcher.store(tile, wms_data)
+
+                if tile_dataset_info.RasterCount < 1:
+                    grass.fatal(_("WMS server error: no band(s) received. Is server URL correct? <%s>") % server_url )
+                if tile_dataset_info.RasterCount == 1 and \
+                   tile_dataset_info.GetRasterBand(1).GetRasterColorTable() is not None:
+                    # expansion of color table into bands
+                    tile_dataset = self._pct2rgb(tile_dataset_info)
                 else:
-                    grass.fatal(_("WMS server unknown error"))
-
-            temp_tile_pct2rgb = None
-            if tile_dataset_info.RasterCount < 1:
-                grass.fatal(_("WMS server error: no band(s) received. Is server URL correct? <%s>") % server_url )
-            if tile_dataset_info.RasterCount == 1 and \
-               tile_dataset_info.GetRasterBand(1).GetRasterColorTable() is not None:
-                # expansion of color table into bands
-                temp_tile_pct2rgb = self._tempfile()
-                tile_dataset = self._pct2rgb(temp_tile, temp_tile_pct2rgb)
+                    tile_dataset = tile_dataset_info
+
+                # initialization of temp_map_dataset, where all tiles are merged
+                if init:
+                    temp_map = self._tempfile()
+
+                    driver = gdal.GetDriverByName(self.gdal_drv_format)
+                    metadata = driver.GetMetadata()
+                    if gdal.DCAP_CREATE not in metadata or \
+                            metadata[gdal.DCAP_CREATE] == 'NO':
+                        grass.fatal(_('Driver %s does not supports Create() method') % drv_format)
+                    self.temp_map_bands_num = tile_dataset.RasterCount
+                    temp_map_dataset = driver.Create(temp_map, map_region['cols'], map_region['rows'],
+                                                     self.temp_map_bands_num,
+                                                     tile_dataset.GetRasterBand(1).DataType)
+                    init = False
+
+                # tile is written into temp_map
+                tile_to_temp_map = tile_dataset.ReadRaster(0, 0, tile_ref['sizeX'], tile_ref['sizeY'],
+                                                           tile_ref['sizeX'], tile_ref['sizeY'])
+
+                temp_map_dataset.WriteRaster(tile_ref['t_cols_offset'], tile_ref['t_rows_offset'],
+                                             tile_ref['sizeX'], tile_ref['sizeY'], tile_to_temp_map)
+
+                tile_dataset = None
+                tile_dataset_info = None
+                grass.try_remove(temp_tile)
+        except (IOError, HTTPException) as e:
+            if isinstance(e, HTTPError) and e.code == 401:
+                grass.fatal(
+                    _("Authorization failed to '%s' when fetching data.\n%s") %
+                    (self.params['url'], str(e)))
             else:
-                tile_dataset = tile_dataset_info
-
-            # initialization of temp_map_dataset, where all tiles are merged
-            if init:
-                temp_map = self._tempfile()
-
-                driver = gdal.GetDriverByName(self.gdal_drv_format)
-                metadata = driver.GetMetadata()
-                if gdal.DCAP_CREATE not in metadata or \
-                        metadata[gdal.DCAP_CREATE] == 'NO':
-                    grass.fatal(_('Driver %s does not supports Create() method') % drv_format)
-                self.temp_map_bands_num = tile_dataset.RasterCount
-                temp_map_dataset = driver.Create(temp_map, map_region['cols'], map_region['rows'],
-                                                 self.temp_map_bands_num,
-                                                 tile_dataset.GetRasterBand(1).DataType)
-                init = False
-
-            # tile is written into temp_map
-            tile_to_temp_map = tile_dataset.ReadRaster(0, 0, tile_ref['sizeX'], tile_ref['sizeY'],
-                                                       tile_ref['sizeX'], tile_ref['sizeY'])
-
-            temp_map_dataset.WriteRaster(tile_ref['t_cols_offset'], tile_ref['t_rows_offset'],
-                                         tile_ref['sizeX'], tile_ref['sizeY'], tile_to_temp_map)
-
-            tile_dataset = None
-            tile_dataset_info = None
-            grass.try_remove(temp_tile)
-            grass.try_remove(temp_tile_pct2rgb)
+                grass.fatal(
+                    _("Unable to fetch data from: '%s'\n%s") %
+                    (self.params['url'], str(e)))
 
         if not temp_map:
             return temp_map
@@ -244,8 +206,28 @@ class WMSDrv(WMSBase):
 
         return temp_map
 
-    def _pct2rgb(self, src_filename, dst_filename):
-        """!Create new dataset with data in dst_filename with bands according to src_filename
+    def _iterTiles(self, req_mgr):
+        """!Generator of the tiles returned by the request manager
+        """
+        while True:
+            # get url for request the tile and information for placing the tile into
+            # raster with other tiles
+            tile = req_mgr.GetNextTile()
+            # if last tile has been already downloaded
+            if not tile:
+                break
+            # some managers reuse the same tile_ref dictionary, copy it
+            # because the tiles are fetched ahead of merging
+            yield tile[0], dict(tile[1])
+
+    def _fetchDataFromServerAuth(self, url):
+        """!Fetch data from server with the credentials of the module
+        """
+        return self._fetchDataFromServer(url, self.params['username'],
+                                         self.params['password'])
+
+    def _pct2rgb(self, src_ds):
+        """!Create new in-memory dataset with bands according to src_ds
         raster color table - modified code from gdal utility pct2rgb
 
         @return new dataset
@@ -253,42 +235,30 @@ class WMSDrv(WMSBase):
         out_bands = 4
         band_number = 1
 
-        # open source file
-        src_ds = gdal.Open(src_filename)
-        if src_ds is None:
-            grass.fatal(_('Unable to open %s ' % src_filename))
-
         src_band = src_ds.GetRasterBand(band_number)
 
-        # Build color table
-        lookup = [Numeric.arrayrange(256),
-                  Numeric.arrayrange(256),
-                  Numeric.arrayrange(256),
-                  Numeric.ones(256) * 255]
-
+        # Build color table, indexes without color entry are kept as they are
         ct = src_band.GetRasterColorTable()
-        if ct is not None:
-            for i in range(min(256, ct.GetCount())):
-                entry = ct.GetColorEntry(i)
-                for c in range(4):
-                    lookup[c][i] = entry[c]
-
-        # create the working file
-        gtiff_driver = gdal.GetDriverByName(self.gdal_drv_format)
-        tif_ds = gtiff_driver.Create(dst_filename,
-                                     src_ds.RasterXSize, src_ds.RasterYSize, out_bands)
-
-        # do the processing one scanline at a time
-        for iY in range(src_ds.RasterYSize):
-            src_data = src_band.ReadAsArray(0, iY, src_ds.RasterXSize, 1)
-
-            for iBand in range(out_bands):
-                band_lookup = lookup[iBand]
-
-                dst_data = Numeric.take(band_lookup, src_data)
-                tif_ds.GetRasterBand(iBand + 1).WriteArray(dst_data, 0, iY)
-
-        return tif_ds
+        count = ct.GetCount() if ct is not None else 0
+        lookup = Numeric.empty((out_bands, max(256, count)), dtype=Numeric.uint8)
+        lookup[:3] = Numeric.arange(lookup.shape[1])
+        lookup[3] = 255
+        if count:
+            lookup[:, :count] = Numeric.array(
+                [ct.GetColorEntry(i) for i in range(count)]).T
+
+        # create the working dataset in memory
+        mem_driver = gdal.GetDriverByName('MEM')
+        mem_ds = mem_driver.Create('', src_ds.RasterXSize, src_ds.RasterYSize,
+                                   out_bands, gdal.GDT_Byte)
+
+        # expand the whole tile at once
+        src_data = src_band.ReadAsArray()
+        dst_data = lookup[:, src_data]
+        for iBand in range(out_bands):
+            mem_ds.GetRasterBand(iBand + 1).WriteArray(dst_data[iBand])
+
+        return mem_ds
 
 
 class BaseRequestMgr:
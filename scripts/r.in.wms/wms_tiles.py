@@ -0,0 +1,331 @@
+"""!
+@brief Concurrent fetching and local caching of tiles for the GRASS drivers.
+
+List of classes:
+ - wms_tiles::TileCache
+ - wms_tiles::HostLimiter
+ - wms_tiles::TileFetcher
+
+(C) 2020 by the GRASS Development Team
+
+This program is free software under the GNU General Public License
+(>=v2). Read the file COPYING that comes with GRASS for details.
+"""
+
+import os
+import errno
+import socket
+import hashlib
+import threading
+from time import sleep, time
+
+try:
+    from urllib2 import HTTPError, URLError
+    from urlparse import urlparse
+    from Queue import Queue, Empty
+except ImportError:
+    # python3
+    from urllib.error import HTTPError, URLError
+    from urllib.parse import urlparse
+    from queue import Queue, Empty
+
+import grass.script as grass
+
+# HTTP status codes which mean that the request can be repeated later
+RETRY_HTTP_CODES = (429, 500, 502, 503, 504)
+
+
+class TileCache:
+    """!On-disk cache of the downloaded tiles with size-based LRU eviction.
+
+    Tiles are stored in files named by a hash of the request, the file
+    modification time is refreshed on every hit and the least recently
+    used tiles are removed when the cache grows over its maximum size.
+    """
+
+    def __init__(self, directory, max_size):
+        """!
+        @param directory path to the cache directory, created if missing
+        @param max_size maximum size of the cache in bytes
+        """
+        self.directory = directory
+        self.max_size = max_size
+        self._lock = threading.Lock()
+
+        if not os.path.isdir(directory):
+            try:
+                os.makedirs(directory)
+            except OSError as e:
+                if e.errno != errno.EEXIST:
+                    raise
+
+        self.size = 0
+        for name, size, mtime in self._entries():
+            self.size += size
+
+    def key(self, url, username=None):
+        """!Return the cache key of a request
+        """
+        key = url if not username else '%s\n%s' % (username, url)
+        return hashlib.sha1(grass.encode(key)).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + '.tile')
+
+    def _entries(self):
+        """!Return a list of tuples (name, size, mtime) of the cached tiles
+        """
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith('.tile'):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.directory, name))
+            except OSError:
+                continue
+            entries.append((name, stat.st_size, stat.st_mtime))
+        return entries
+
+    def get(self, key):
+        """!Return the cached data of the key or None
+        """
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as tile:
+                data = tile.read()
+            os.utime(path, None)
+        except (IOError, OSError):
+            return None
+        return data
+
+    def put(self, key, data):
+        """!Store the data of the key and evict the least recently used
+        tiles if the cache is too large
+        """
+        if len(data) > self.max_size:
+            return
+        path = self._path(key)
+        temp = '%s.%d.tmp' % (path, threading.current_thread().ident)
+        with self._lock:
+            try:
+                old_size = os.path.getsize(path)
+            except OSError:
+                old_size = 0
+            try:
+                with open(temp, 'wb') as tile:
+                    tile.write(data)
+                if old_size:
+                    os.remove(path)
+                os.rename(temp, path)
+            except (IOError, OSError) as e:
+                grass.warning(_("Unable to write tile into cache.\n%s") % e)
+                grass.try_remove(temp)
+                return
+            self.size += len(data) - old_size
+            if self.size > self.max_size:
+                self._evict()
+
+    def _evict(self):
+        """!Remove the least recently used tiles until the cache fits in
+        its maximum size
+        """
+        entries = sorted(self._entries(), key=lambda entry: entry[2])
+        self.size = sum(entry[1] for entry in entries)
+        for name, size, mtime in entries:
+            if self.size <= self.max_size:
+                break
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                continue
+            self.size -= size
+
+
+class HostLimiter:
+    """!Limit the number of concurrent requests and the request rate per host
+    """
+
+    def __init__(self, max_connections, min_interval=0):
+        """!
+        @param max_connections maximum number of concurrent requests to a host
+        @param min_interval minimum time in seconds between two requests to
+                            the same host
+        """
+        self.max_connections = max_connections
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._hosts = {}
+
+    def _host(self, url):
+        host = urlparse(url).netloc
+        with self._lock:
+            if host not in self._hosts:
+                self._hosts[host] = [threading.Semaphore(self.max_connections),
+                                     0.]
+            return self._hosts[host]
+
+    def acquire(self, url):
+        """!Wait until a request to the host of the url is allowed
+        """
+        host = self._host(url)
+        host[0].acquire()
+        if self.min_interval:
+            with self._lock:
+                now = time()
+                wait = max(0., host[1] - now)
+                host[1] = max(now, host[1]) + self.min_interval
+            if wait:
+                sleep(wait)
+
+    def release(self, url):
+        """!Release a request slot of the host of the url
+        """
+        self._host(url)[0].release()
+
+
+class TileFetcher:
+    """!Fetch tiles with a bounded number of threads, the tiles already in
+    the cache are not requested to the server.
+
+    Transient errors (refused connections, timeouts and HTTP codes in
+    RETRY_HTTP_CODES) are retried with an exponential backoff, other errors
+    are raised by fetch().
+    """
+
+    def __init__(self, fetch, nprocs=1, cache=None, username=None,
+                 retries=3, backoff=5, max_connections=2, min_interval=0):
+        """!
+        @param fetch function which gets an url and returns a file-like object
+        @param nprocs number of concurrent requests
+        @param cache TileCache object or None
+        @param username username of the requests, it is part of the cache key
+        @param retries number of retries of a request with a transient error
+        @param backoff seconds to wait before the first retry, the time is
+                       doubled for every next retry
+        @param max_connections maximum number of concurrent requests to the
+                               same host
+        @param min_interval minimum time in seconds between two requests to
+                            the same host
+        """
+        self.fetch_url = fetch
+        self.nprocs = max(1, nprocs)
+        self.cache = cache
+        self.username = username
+        self.retries = retries
+        self.backoff = backoff
+        self.limiter = HostLimiter(max(1, max_connections), min_interval)
+
+    def _isTransient(self, error):
+        """!Return True if the request can be repeated
+        """
+        if isinstance(error, HTTPError):
+            return error.code in RETRY_HTTP_CODES
+        if isinstance(error, URLError):
+            error = error.reason
+        if isinstance(error, socket.timeout):
+            return True
+        return getattr(error, 'errno', None) in (errno.ECONNRESET,
+                                                 errno.ECONNREFUSED,
+                                                 errno.ETIMEDOUT)
+
+    def _download(self, url):
+        """!Download data of the url, retrying the transient errors
+        """
+        fetch_try = 0
+        while True:
+            self.limiter.acquire(url)
+            try:
+                return self.fetch_url(url).read()
+            except (IOError, socket.error) as e:
+                if fetch_try >= self.retries or not self._isTransient(e):
+                    raise
+            finally:
+                self.limiter.release(url)
+
+            sleep_time = self.backoff * 2 ** fetch_try
+            fetch_try += 1
+            grass.warning(
+                _("Server refused to send data for a tile.\nRequest will be repeated after %d s.") %
+                sleep_time)
+            sleep(sleep_time)
+
+    def _get(self, tile):
+        """!Return a tuple (tile, data, cached) or (tile, exception, None)
+        """
+        url = tile[0]
+        try:
+            if self.cache is not None:
+                data = self.cache.get(self.cache.key(url, self.username))
+                if data is not None:
+                    return tile, data, True
+            return tile, self._download(url), False
+        except Exception as e:
+            return tile, e, None
+
+    def _worker(self, tasks, results):
+        while True:
+            tile = tasks.get()
+            if tile is None:
+                break
+            results.put(self._get(tile))
+
+    def fetch(self, tiles):
+        """!Generator of the tiles data
+
+        Tiles are yielded in the order of completion as tuples
+        (tile, data, cached), at most 2 * nprocs tiles are pending at
+        the same time.
+
+        @param tiles iterable of tiles, the first item of each tile is the url
+        """
+        if self.nprocs == 1:
+            for tile in tiles:
+                tile, data, cached = self._get(tile)
+                if cached is None:
+                    raise data
+                yield tile, data, cached
+            return
+
+        tasks = Queue()
+        results = Queue()
+        workers = []
+        for i in range(self.nprocs):
+            worker = threading.Thread(target=self._worker,
+                                      args=(tasks, results))
+            worker.daemon = True
+            worker.start()
+            workers.append(worker)
+
+        tiles = iter(tiles)
+        pending = 0
+        try:
+            while True:
+                while pending < 2 * self.nprocs:
+                    tile = next(tiles, None)
+                    if tile is None:
+                        break
+                    tasks.put(tile)
+                    pending += 1
+                if not pending:
+                    break
+                tile, data, cached = results.get()
+                pending -= 1
+                if cached is None:
+                    raise data
+                yield tile, data, cached
+        finally:
+            # drop the tiles not yet requested, if the iteration is stopped
+            while pending:
+                try:
+                    tasks.get_nowait()
+                except Empty:
+                    break
+                pending -= 1
+            for worker in workers:
+                tasks.put(None)
+
+    def store(self, tile, data):
+        """!Store the data of a downloaded tile in the cache
+        """
+        if self.cache is not None:
+            self.cache.put(self.cache.key(tile[0], self.username), data)
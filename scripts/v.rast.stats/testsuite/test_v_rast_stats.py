@@ -64,6 +64,26 @@ class TestRastStats(TestCase):
         self.assertLooksLike(univar_string, str(v_db_select.outputs.stdout))
 
 
+    def test_multiple_rasters(self):
+        # map_b is null in the first 9 rows of zone 1
+        self.runModule("r.mapcalc",
+                       expression="map_b = if(row() < 10, null(), row())",
+                       overwrite=True)
+        univar_string = """cat|value|label|a_number|a_null_cells|a_minimum|a_maximum|b_number|b_null_cells|b_minimum|b_maximum
+1|1||1710|0|102|209|900|810|10|19
+2|2||6390|0|121|280|6390|0|20|90
+"""
+
+        self.assertModule("v.rast.stats", map="zone_map",
+                          raster="map_a,map_b",
+                          method=["number", "null_cells", "minimum",
+                                  "maximum"],
+                          flags="c", column_prefix="a,b")
+        v_db_select = SimpleModule("v.db.select", map="zone_map")
+
+        self.runModule(v_db_select)
+        self.assertLooksLike(univar_string, str(v_db_select.outputs.stdout))
+
     def test_line_d(self):
         output_str = """cat|name|a_median|a_number|a_range
 1|first|192|3|1
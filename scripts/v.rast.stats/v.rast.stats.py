@@ -72,11 +72,18 @@
 #%end
 
 import sys
-import os
 import atexit
+import numpy as np
 import grass.script as grass
 from grass.script.utils import decode
 from grass.exceptions import CalledModuleError
+from grass.pygrass.gis.region import Region
+from grass.pygrass.raster import RasterRow
+
+# null value of CELL raster maps
+CELL_NULL = np.iinfo(np.int32).min
+# values of variance below it are 0 in r.univar
+GRASS_EPSILON = 1.0e-15
 
 
 def cleanup():
@@ -87,8 +94,141 @@ def cleanup():
 #        grass.try_remove(f)
 
 
+
+def read_block(rast, row_start, row_end):
+    """Return the rows of an open raster map and their null mask"""
+    block = rast.read_block(row_start, row_end)
+    if rast.mtype == 'CELL':
+        return block, block == CELL_NULL
+    return block, np.isnan(block)
+
+
+def iter_zone_values(zones, rasters, zcats, block_rows=256):
+    """Read the zones and the raster maps block by block in the current
+    region and yield the number of cells of each zone in the block and,
+    for each raster map, the zone indexes and the values of its non-null
+    cells
+
+    The zone index of a cell is the position of its category in the
+    sorted array of the zone categories zcats, the cells of other
+    categories are ignored.
+    """
+    nzones = len(zcats)
+    nrows = Region().rows
+    zmap = RasterRow(zones)
+    zmap.open('r')
+    rmaps = [RasterRow(*raster.split('@', 1)) for raster in rasters]
+    for rmap in rmaps:
+        rmap.open('r')
+    try:
+        for row in range(0, nrows, block_rows):
+            grass.percent(row, nrows, 2)
+            row_end = min(row + block_rows, nrows)
+            block, nulls = read_block(zmap, row, row_end)
+            inzone = ~nulls
+            zvals = block[inzone]
+            zidx = np.searchsorted(zcats, zvals)
+            known = zidx < nzones
+            known[known] = zcats[zidx[known]] == zvals[known]
+            if not known.all():
+                inzone[inzone] = known
+                zidx = zidx[known]
+            size = np.bincount(zidx, minlength=nzones)
+            values = []
+            for rmap in rmaps:
+                block, nulls = read_block(rmap, row, row_end)
+                valid = ~nulls[inzone]
+                values.append((zidx[valid],
+                               block[inzone][valid].astype(np.float64)))
+            yield size, values
+        grass.percent(1, 1, 1)
+    finally:
+        zmap.close()
+        for rmap in rmaps:
+            rmap.close()
+
+
+def zonal_stats(zones, rasters, zcats):
+    """Return the zone size and a dictionary with the univariate
+    statistics of each raster map, as arrays with shape
+    (number of rasters, number of zones), computed in a single pass
+    """
+    nrast = len(rasters)
+    nzones = len(zcats)
+    size = np.zeros(nzones, dtype=np.int64)
+    number = np.zeros((nrast, nzones), dtype=np.int64)
+    total = np.zeros((nrast, nzones))
+    sumsq = np.zeros((nrast, nzones))
+    minimum = np.full((nrast, nzones), np.inf)
+    maximum = np.full((nrast, nzones), -np.inf)
+    for bsize, values in iter_zone_values(zones, rasters, zcats):
+        size += bsize
+        for i, (zidx, vals) in enumerate(values):
+            number[i] += np.bincount(zidx, minlength=nzones)
+            total[i] += np.bincount(zidx, weights=vals, minlength=nzones)
+            sumsq[i] += np.bincount(zidx, weights=vals * vals,
+                                    minlength=nzones)
+            np.minimum.at(minimum[i], zidx, vals)
+            np.maximum.at(maximum[i], zidx, vals)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        empty = number == 0
+        minimum[empty] = maximum[empty] = total[empty] = np.nan
+        average = total / number
+        variance = (sumsq - total * total / number) / number
+        variance[variance < GRASS_EPSILON] = 0.
+        stddev = np.sqrt(variance)
+        coeff_var = stddev / average * 100.
+
+    return size, {'number': number, 'null_cells': size - number,
+                  'minimum': minimum, 'maximum': maximum,
+                  'range': maximum - minimum, 'average': average,
+                  'stddev': stddev, 'variance': variance,
+                  'coeff_var': coeff_var, 'sum': total}
+
+
+def zonal_quantiles(zones, raster, zcats, percentile):
+    """Return a dictionary with the exact quartiles, median and percentile
+    of the raster map for each zone, computed as r.univar does by sorting
+    the values of the zones
+
+    All the non-null values of the zones are kept in memory.
+    """
+    nzones = len(zcats)
+    zidx, vals = [], []
+    for size, values in iter_zone_values(zones, [raster], zcats):
+        zidx.append(values[0][0])
+        vals.append(values[0][1])
+    zidx = np.concatenate(zidx)
+    vals = np.concatenate(vals)
+    # sort the values by zone and value
+    vals = vals[np.lexsort((vals, zidx))]
+    number = np.bincount(zidx, minlength=nzones)
+    start = np.cumsum(number) - number
+    full = number > 0
+
+    def pick(pos):
+        result = np.full(nzones, np.nan)
+        result[full] = vals[start[full] + pos[full]]
+        return result
+
+    # the positions are computed and truncated as in r.univar
+    quantiles = {}
+    quantiles['first_quartile'] = pick((number * 0.25 - 0.5).astype(int))
+    quantiles['third_quartile'] = pick((number * 0.75 - 0.5).astype(int))
+    quantiles['percentile'] = pick((number * 1e-2 * percentile -
+                                    0.5).astype(int))
+    half = number // 2
+    median = pick(half)
+    even = full & (number % 2 == 0)
+    median[even] = (vals[start[even] + half[even] - 1] +
+                    vals[start[even] + half[even]]) / 2.
+    quantiles['median'] = median
+    return quantiles
+
+
 def main():
-    global tmp, sqltmp, tmpname, nuldev, vector, rastertmp
+    global tmp, sqltmp, tmpname, vector, rastertmp
     rastertmp = False
     # setup temporary files
     tmp = grass.tempfile()
@@ -96,8 +236,6 @@ def main():
     # we need a random name
     tmpname = grass.basename(tmp)
 
-    nuldev = open(os.devnull, 'w')
-
     rasters = options['raster'].split(',')
     colprefixes = options['column_prefix'].split(',')
     vector = options['map']
@@ -210,56 +348,53 @@ def main():
     # replaced by user choiche
     #basecols = ['n', 'min', 'max', 'range', 'mean', 'stddev', 'variance', 'cf_var', 'sum']
 
-    for i in range(len(rasters)):
-        raster = rasters[i]
-        colprefix = colprefixes[i]
+    # by default perccol variable is used only for "variables" variable
+    perccol = "percentile"
+    perc = None
+    for b in basecols:
+        if b.startswith('p'):
+            perc = b
+    if perc:
+        # namespace is limited in DBF but the % value is important
+        if dbfdriver:
+            perccol = "per" + percentile
+        else:
+            perccol = "percentile_" + percentile
+        percindex = basecols.index(perc)
+        basecols[percindex] = perccol
+
+    # name of the methods, perccol is the percentile
+    variables = ['number', 'null_cells', 'minimum', 'maximum', 'range',
+                 'average', 'stddev', 'variance', 'coeff_var', 'sum',
+                 'first_quartile', 'median', 'third_quartile', perccol]
+    # these methods require to sort the values of each zone
+    extracols = ['first_quartile', 'median', 'third_quartile', perccol]
+
+    # the columns of all the raster maps are checked and added at once
+    vcolumns = grass.vector_columns(vector, layer).keys()
+    addcols = []
+    # list of tuples (raster index, method, column name)
+    columns = []
+    for r in range(len(rasters)):
+        colprefix = colprefixes[r]
         # we need at least three chars to distinguish [mea]n from [med]ian
         # so colprefix can't be longer than 6 chars with DBF driver
         if dbfdriver:
             colprefix = colprefix[:6]
-            variables_dbf = {}
-
-        # by default perccol variable is used only for "variables" variable
-        perccol = "percentile"
-        perc = None
-        for b in basecols:
-            if b.startswith('p'):
-                perc = b
-        if perc:
-            # namespace is limited in DBF but the % value is important
-            if dbfdriver:
-                perccol = "per" + percentile
-            else:
-                perccol = "percentile_" + percentile
-            percindex = basecols.index(perc)
-            basecols[percindex] = perccol
-
-        # dictionary with name of methods and position in "r.univar -gt"  output
-        variables = {'number': 2, 'null_cells': 2, 'minimum': 4, 'maximum': 5, 'range': 6,
-                     'average': 7, 'stddev': 9, 'variance': 10, 'coeff_var': 11,
-                     'sum': 12, 'first_quartile': 14, 'median': 15,
-                     'third_quartile': 16, perccol: 17}
-        # this list is used to set the 'e' flag for r.univar
-        extracols = ['first_quartile', 'median', 'third_quartile', perccol]
-        addcols = []
-        colnames = []
-        extstat = ""
+
         for i in basecols:
             # this check the complete name of out input that should be truncated
-            for k in variables.keys():
+            for k in variables:
                 if i in k:
                     i = k
                     break
-            if i in extracols:
-                extstat = 'e'
             # check if column already present
             currcolumn = ("%s_%s" % (colprefix, i))
             if dbfdriver:
                 currcolumn = currcolumn[:10]
-                variables_dbf[currcolumn.replace("%s_" % colprefix, '')] = i
 
-            colnames.append(currcolumn)
-            if currcolumn in grass.vector_columns(vector, layer).keys():
+            columns.append((r, i, currcolumn))
+            if currcolumn in vcolumns:
                 if not flags['c']:
                     grass.fatal((_("Cannot create column <%s> (already present). ") % currcolumn) +
                                 _("Use -c flag to update values in this column."))
@@ -270,75 +405,77 @@ def main():
                     coltype = "DOUBLE PRECISION"
                 addcols.append(currcolumn + ' ' + coltype)
 
-        if addcols:
-            grass.verbose(_("Adding columns '%s'") % addcols)
-            try:
-                grass.run_command('v.db.addcolumn', map=vector, columns=addcols,
-                                  layer=layer)
-            except CalledModuleError:
-                grass.fatal(_("Adding columns failed. Exiting."))
-
-        # calculate statistics:
-        grass.message(_("Processing input data (%d categories)...") % number)
-
-        # get rid of any earlier attempts
-        grass.try_remove(sqltmp)
-
-        f = open(sqltmp, 'w')
-
-        # do the stats
-        p = grass.pipe_command('r.univar', flags='t' + extstat, map=raster,
-                               zones=rastertmp, percentile=percentile, sep=';')
-
-        first_line = 1
-
-        f.write("{0}\n".format(grass.db_begin_transaction(fi['driver'])))
-        for line in p.stdout:
-            if first_line:
-                first_line = 0
-                continue
-
-            vars = decode(line).rstrip('\r\n').split(';')
-
-            f.write("UPDATE %s SET" % fi['table'])
-            first_var = 1
-            for colname in colnames:
-                variable = colname.replace("%s_" % colprefix, '', 1)
-                if dbfdriver:
-                    variable = variables_dbf[variable]
-                i = variables[variable]
-                value = vars[i]
-                # convert nan, +nan, -nan, inf, +inf, -inf, Infinity, +Infinity,
-                # -Infinity to NULL
-                if value.lower().endswith('nan') or 'inf' in value.lower():
-                    value = 'NULL'
-                if not first_var:
-                    f.write(" , ")
-                else:
-                    first_var = 0
-                f.write(" %s=%s" % (colname, value))
-
-            f.write(" WHERE %s=%s;\n" % (fi['key'], vars[0]))
-        f.write("{0}\n".format(grass.db_commit_transaction(fi['driver'])))
-        p.wait()
-        f.close()
-
-        grass.message(_("Updating the database ..."))
-        exitcode = 0
+    if addcols:
+        grass.verbose(_("Adding columns '%s'") % addcols)
         try:
-            grass.run_command('db.execute', input=sqltmp,
-                              database=fi['database'], driver=fi['driver'])
-            grass.verbose((_("Statistics calculated from raster map <{raster}>"
-                             " and uploaded to attribute table"
-                             " of vector map <{vector}>."
-                             ).format(raster=raster, vector=vector)))
+            grass.run_command('v.db.addcolumn', map=vector, columns=addcols,
+                              layer=layer)
         except CalledModuleError:
-            grass.warning(
-                _("Failed to upload statistics to attribute table of vector map <%s>.") %
-                vector)
-            exitcode = 1
+            grass.fatal(_("Adding columns failed. Exiting."))
+
+    # calculate statistics:
+    grass.message(_("Processing input data (%d categories)...") % number)
+
+    # the zones are the categories of the vector map, indexed by their
+    # position in the sorted array of the categories
+    zcats = np.unique(np.array([int(cat) for cat in cats], dtype=np.int64))
+
+    # all the raster maps are read in a single pass
+    size, stats = zonal_stats(rastertmp, rasters, zcats)
+
+    # the quantiles are computed one raster map at a time, to keep
+    # in memory only the values of one map
+    if [method for r, method, column in columns if method in extracols]:
+        for method in extracols:
+            stats[method] = np.empty((len(rasters), len(zcats)))
+        for r, raster in enumerate(rasters):
+            grass.verbose(_("Computing quantiles of raster map <%s>") % raster)
+            quantiles = zonal_quantiles(rastertmp, raster, zcats,
+                                        float(percentile))
+            quantiles[perccol] = quantiles.pop('percentile')
+            for method in extracols:
+                stats[method][r] = quantiles[method]
+
+    # get rid of any earlier attempts
+    grass.try_remove(sqltmp)
+
+    # all the columns are updated in a single transaction
+    f = open(sqltmp, 'w')
+    f.write("{0}\n".format(grass.db_begin_transaction(fi['driver'])))
+    for z in np.flatnonzero(size):
+        f.write("UPDATE %s SET " % fi['table'])
+        values = []
+        for r, method, colname in columns:
+            value = stats[method][r, z]
+            # convert nan and infinity to NULL
+            if not np.isfinite(value):
+                value = 'NULL'
+            elif method in ('number', 'null_cells'):
+                value = '%d' % value
+            else:
+                value = '%.15g' % value
+            values.append("%s=%s" % (colname, value))
+        f.write(" , ".join(values))
+        f.write(" WHERE %s=%d;\n" % (fi['key'], zcats[z]))
+    f.write("{0}\n".format(grass.db_commit_transaction(fi['driver'])))
+    f.close()
+
+    grass.message(_("Updating the database ..."))
+    exitcode = 0
+    try:
+        grass.run_command('db.execute', input=sqltmp,
+                          database=fi['database'], driver=fi['driver'])
+        grass.verbose((_("Statistics calculated from raster maps <{raster}>"
+                         " and uploaded to attribute table"
+                         " of vector map <{vector}>."
+                         ).format(raster=','.join(rasters), vector=vector)))
+    except CalledModuleError:
+        grass.warning(
+            _("Failed to upload statistics to attribute table of vector map <%s>.") %
+            vector)
+        exitcode = 1
 
-            sys.exit(exitcode)
+        sys.exit(exitcode)
 
 if __name__ == "__main__":
     options, flags = grass.parser()
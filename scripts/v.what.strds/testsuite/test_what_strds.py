@@ -67,5 +67,30 @@ class TestWhatStrds(TestCase):
 """
         self.assertMultiLineEqual(output, decode(db_sel.outputs.stdout))
 
+    def test_where(self):
+        self.assertModule("v.what.strds", input="points", strds="A",
+                          output="what_strds", where="cat = 2",
+                          overwrite=True)
+        db_sel = SimpleModule("v.db.select", map="what_strds")
+        self.assertModule(db_sel)
+        output = """cat|A_2001_01_01|A_2001_04_01|A_2001_07_01|A_2001_10_01
+1||||
+2|100|200|300|400
+3||||
+"""
+        self.assertMultiLineEqual(output, decode(db_sel.outputs.stdout))
+
+    def test_update_overwrite(self):
+        self.runModule("g.copy", vector="points,points_update",
+                       overwrite=True)
+        self.assertModule("v.what.strds", input="points_update", strds="A",
+                          flags="u")
+        self.assertModuleFail("v.what.strds", input="points_update",
+                              strds="A", flags="u")
+        self.assertModule("v.what.strds", input="points_update", strds="A",
+                          flags="u", overwrite=True)
+        self.runModule("g.remove", flags="f", type="vector",
+                       name="points_update")
+
 if __name__ == '__main__':
     test()
@@ -49,9 +49,15 @@
 #% description: Instead of creating a new vector map update the attribute table with value(s)
 #%end
 
+from collections import OrderedDict
+
+import numpy as np
+
 import grass.script as grass
 from grass.exceptions import CalledModuleError
 
+CELL_NULL = np.iinfo(np.int32).min
+
 ############################################################################
 
 
@@ -90,13 +96,227 @@ class Sample(object):
 ############################################################################
 
 
+def read_points(pymap, where=None):
+    """Return the categories, rows and columns of the points of a vector map
+
+    Only the points inside the current region and, if a where condition
+    is given, with matching attributes are returned, sorted by row. The
+    last returned array is True for the categories shared by more points,
+    their values are set to NULL as v.what.rast does.
+    """
+    from grass.pygrass.gis.region import Region
+
+    cats = []
+    coords = []
+    nocat = 0
+    for point in pymap.viter('points'):
+        if point.cat is None:
+            nocat += 1
+            continue
+        cats.append(point.cat)
+        coords.append((point.x, point.y))
+    cats = np.array(cats, dtype=np.int64)
+    coords = np.array(coords, dtype=np.float64).reshape(-1, 2)
+    if nocat:
+        grass.warning(_("%d points without category were skipped") % nocat)
+
+    if where:
+        table = pymap.table
+        sql = "SELECT %s FROM %s WHERE %s" % (table.key, table.name, where)
+        selected = [row[0] for row in table.execute(sql).fetchall()]
+        keep = np.isin(cats, np.array(selected, dtype=np.int64))
+        cats = cats[keep]
+        coords = coords[keep]
+
+    region = Region()
+    rows = np.floor((region.north - coords[:, 1]) /
+                    region.nsres).astype(np.int64)
+    cols = np.floor((coords[:, 0] - region.west) /
+                    region.ewres).astype(np.int64)
+    inside = ((rows >= 0) & (rows < region.rows) &
+              (cols >= 0) & (cols < region.cols))
+    if not inside.all():
+        grass.warning(_("%d points outside current region were skipped") %
+                      np.count_nonzero(~inside))
+
+    # keep one point of each category
+    cats, first, counts = np.unique(cats[inside], return_index=True,
+                                    return_counts=True)
+    rows = rows[inside][first]
+    cols = cols[inside][first]
+    order = np.lexsort((cols, rows))
+    return cats[order], rows[order], cols[order], counts[order] > 1
+
+
+def sample_raster(name, rows, cols):
+    """Return the type of a raster map, its values at the given rows and
+    columns and the mask of the null values
+
+    Only the rows containing points are read, rows must be sorted.
+    """
+    from grass.pygrass.raster import RasterRow
+    from grass.pygrass.raster.raster_type import TYPE as RTYPE
+
+    rast = RasterRow(*name.split('@', 1))
+    rast.open('r')
+    try:
+        mtype = rast.mtype
+        values = np.empty(len(rows), dtype=RTYPE[mtype]['numpy'])
+        starts = np.flatnonzero(np.diff(rows)) + 1
+        row = None
+        for start, end in zip(np.concatenate(([0], starts)),
+                              np.concatenate((starts, [len(rows)]))):
+            if start == end:
+                break
+            row = rast.get_row(int(rows[start]), row)
+            values[start:end] = row[cols[start:end]]
+    finally:
+        rast.close()
+    if mtype == 'CELL':
+        nulls = values == CELL_NULL
+    else:
+        nulls = np.isnan(values)
+    return mtype, values, nulls
+
+
+def update_table(table, columns, cats, dupl, chunk=200):
+    """Write the sampled values in the SQLite attribute table
+
+    Each group of at most chunk columns is written with a single
+    executemany UPDATE, to respect the limit of SQL variables of SQLite,
+    and all the changes are committed once.
+    """
+    names = list(columns.keys())
+    keys = cats.tolist()
+    cur = table.conn.cursor()
+    for i in range(0, len(names), chunk):
+        group = names[i:i + chunk]
+        sql = "UPDATE %s SET %s WHERE %s=?" % (
+            table.name, ','.join(['%s=?' % name for name in group]),
+            table.key)
+        values = []
+        for name in group:
+            mtype, vals, nulls = columns[name]
+            values.append([None if null else val for val, null in
+                           zip(vals.tolist(), (nulls | dupl).tolist())])
+        values.append(keys)
+        cur.executemany(sql, list(zip(*values)))
+    table.conn.commit()
+    cur.close()
+
+def column_name(sample):
+    """Return the name of the column of a sample"""
+    name = "%s_%s" % (sample.strds_name, sample.printDay())
+    return name.replace('.', '_')
+
+
+def sample_what_rast(output, samples, where, overwrite, quiet):
+    """Sample the raster maps running v.db.addcolumn and v.what.rast for
+    each raster map, used for the drivers other than SQLite
+    """
+    import grass.temporal as tgis
+
+    perc_curr = 0
+    perc_tot = len(samples)
+    for sample in samples:
+        raster_names = sample.raster_names
+        # Call v.what.rast for each raster map
+
+        for name in raster_names:
+            coltype = "DOUBLE PRECISION"
+            # Get raster map type
+            raster_map = tgis.RasterDataset(name)
+            raster_map.load()
+            if raster_map.metadata.get_datatype() == "CELL":
+                coltype = "INT"
+            colname = column_name(sample)
+            column_string = "%s %s" % (colname, coltype)
+            try:
+                grass.run_command("v.db.addcolumn", map=output,
+                                  column=column_string,
+                                  overwrite=overwrite)
+            except CalledModuleError:
+                grass.fatal(_("Unable to add column %s to vector map "
+                              "<%s> ") % (column_string, output))
+            try:
+                grass.run_command("v.what.rast", map=output, raster=name,
+                                  column=colname, where=where,
+                                  quiet=quiet)
+            except CalledModuleError:
+                grass.fatal(_("Unable to run v.what.rast for vector map"
+                              " <%s> and raster map <%s>") %
+                            (output, str(raster_names)))
+
+        grass.percent(perc_curr, perc_tot, 1)
+        perc_curr += 1
+    grass.percent(1, 1, 1)
+
+
+def sample_bulk(output, samples, where, overwrite):
+    """Sample all the raster maps in a single pass with pygrass and write
+    the values with executemany, used for SQLite attribute tables
+    """
+    from grass.pygrass.vector import VectorTopo
+
+    pymap = VectorTopo(output)
+    try:
+        pymap.open('r')
+    except:
+        grass.fatal(_("Unable to open vector map <%s>") % output)
+
+    # Read the points once and sample all the raster maps at their locations
+    cats, rows, cols, dupl = read_points(pymap, where)
+    columns = OrderedDict()
+    perc_curr = 0
+    perc_tot = len(samples)
+    for sample in samples:
+        for name in sample.raster_names:
+            try:
+                columns[column_name(sample)] = sample_raster(name, rows,
+                                                             cols)
+            except Exception as e:
+                pymap.close()
+                grass.fatal(_("Unable to sample raster map <%s>\n%s") %
+                            (name, e))
+        grass.percent(perc_curr, perc_tot, 1)
+        perc_curr += 1
+    grass.percent(1, 1, 1)
+
+    table = pymap.table
+    existing = [name for name in columns if name in table.columns]
+    if existing and not overwrite:
+        pymap.close()
+        grass.fatal(_("Columns <%s> already exist in vector map <%s>, "
+                      "use --overwrite to update them") %
+                    (','.join(existing), output))
+    new_columns = [name for name in columns if name not in existing]
+    if new_columns:
+        coltypes = ["INT" if columns[name][0] == "CELL" else
+                    "DOUBLE PRECISION" for name in new_columns]
+        try:
+            table.columns.add(new_columns, coltypes)
+        except Exception as e:
+            pymap.close()
+            grass.fatal(_("Unable to add columns to vector map <%s>\n%s") %
+                        (output, e))
+
+    try:
+        update_table(table, columns, cats, dupl)
+    except Exception as e:
+        pymap.close()
+        grass.fatal(_("Unable to update the attribute table of vector map"
+                      " <%s>\n%s") % (output, e))
+    pymap.close()
+    grass.vector_history(output)
+
+############################################################################
+
+
 def main():
     # lazy imports
     import grass.temporal as tgis
     from grass.pygrass.utils import copy as gcopy
-    from grass.pygrass.messages import Messenger
-    from grass.pygrass.vector import Vector
-    
+
     # Get the options
     input = options["input"]
     output = options["output"]
@@ -114,13 +334,6 @@ def main():
     if where == "" or where == " " or where == "\n":
         where = None
 
-    overwrite = grass.overwrite()
-
-    quiet = True
-
-    if grass.verbosity() > 2:
-        quiet = False
-
     # Check the number of sample strds and the number of columns
     strds_names = strds.split(",")
 
@@ -195,69 +408,31 @@ def main():
                 s = Sample(start, end, mapname_list, name)
                 samples.append(s)
 
+    dbif.close()
+
     # Get the layer and database connections of the input vector
     if output:
         gcopy(input, output, 'vector')
     else:
         output = input
 
-    msgr = Messenger()
-    perc_curr = 0
-    perc_tot = len(samples)
-    pymap = Vector(output)
-    try:
-        pymap.open('r')
-    except:
-        dbif.close()
-        grass.fatal(_("Unable to create vector map <%s>" % output))
-
-    if len(pymap.dblinks) == 0:
+    if 1 not in grass.vector_db(output):
         try:
-            pymap.close()
             grass.run_command("v.db.addtable", map=output)
         except CalledModuleError:
-            dbif.close()
-            grass.fatal(_("Unable to add table <%s> to vector map <%s>" % output))
-    if pymap.is_open():
-        pymap.close()
-
-    for sample in samples:
-        raster_names = sample.raster_names
-        # Call v.what.rast for each raster map
+            grass.fatal(_("Unable to add table <%s> to vector map <%s>") %
+                        (output, output))
 
-        for name in raster_names:
-            coltype = "DOUBLE PRECISION"
-            # Get raster map type
-            raster_map = tgis.RasterDataset(name)
-            raster_map.load()
-            if raster_map.metadata.get_datatype() == "CELL":
-                coltype = "INT"
-            day = sample.printDay()
-            column_name = "%s_%s" % (sample.strds_name, day)
-            column_string = "%s %s" % (column_name, coltype)
-            column_string.replace('.', '_')
-            try:
-                grass.run_command("v.db.addcolumn", map=output,
-                                  column=column_string,
-                                  overwrite=overwrite)
-            except CalledModuleError:
-                dbif.close()
-                grass.fatal(_("Unable to add column %s to vector map "
-                              "<%s> ") % (column_string, output))
-            try:
-                grass.run_command("v.what.rast", map=output, raster=name,
-                                  column=column_name, where=where,
-                                  quiet=quiet)
-            except CalledModuleError:
-                dbif.close()
-                grass.fatal(_("Unable to run v.what.rast for vector map"
-                              " <%s> and raster map <%s>") %
-                            (output, str(raster_names)))
+    overwrite = grass.overwrite()
+    if grass.vector_db(output)[1]['driver'] == 'sqlite':
+        sample_bulk(output, samples, where, overwrite)
+    else:
+        quiet = True
+        if grass.verbosity() > 2:
+            quiet = False
+        sample_what_rast(output, samples, where, overwrite, quiet)
 
-        msgr.percent(perc_curr, perc_tot, 1)
-        perc_curr += 1
 
-    dbif.close()
 if __name__ == "__main__":
     options, flags = grass.parser()
     main()
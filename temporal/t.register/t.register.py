@@ -98,6 +98,15 @@
 #% guisection: Input
 #%end
 
+#%option
+#% key: nprocs
+#% type: integer
+#% description: Number of processes to read the map information in parallel
+#% required: no
+#% multiple: no
+#% answer: 1
+#%end
+
 #%flag
 #% key: i
 #% description: Create an interval (start and end time) in case an increment and the start time are provided
@@ -122,13 +131,15 @@ def main():
     unit = options["unit"]
     increment = options["increment"]
     interval = flags["i"]
+    nprocs = int(options["nprocs"])
 
     # Make sure the temporal database exists
     tgis.init()
     # Register maps
     tgis.register_maps_in_space_time_dataset(
         type=type, name=name, maps=maps, file=file, start=start, end=end,
-        unit=unit, increment=increment, dbif=None, interval=interval, fs=separator)
+        unit=unit, increment=increment, dbif=None, interval=interval,
+        fs=separator, nprocs=nprocs)
 
 
 ###############################################################################
@@ -115,6 +115,7 @@ def main():
 
     num_maps = len(maplist)
     update_dict = {}
+    removed_maps = {}
     count = 0
 
     statement = ""
@@ -131,9 +132,16 @@ def main():
         if map.is_in_db(dbif) == True:
             # Unregister from a single dataset
             if input:
+                # The content of the map is required for the
+                # incremental update of the space time dataset
+                map.select(dbif)
                 # Collect SQL statements
-                statement += sp.unregister_map(
+                map_statement = sp.unregister_map(
                     map=map, dbif=dbif, execute=False)
+                if map_statement:
+                    statement += map_statement
+                    if map.get_id() not in removed_maps:
+                        removed_maps[map.get_id()] = map
 
             # Unregister from temporal database
             else:
@@ -165,7 +173,8 @@ def main():
         grass.message(_("Unregister maps from the temporal database"))
 
     if input:
-        sp.update_from_registered_maps(dbif)
+        sp.update_from_registered_maps(dbif,
+                                       removed=list(removed_maps.values()))
         sp.update_command_string(dbif=dbif)
     elif len(update_dict) > 0:
         count = 0